@@ -0,0 +1,238 @@
+"""Record codecs for event logs.
+
+``json`` logs stay newline-delimited and header-less, so existing files and
+tools keep working.  Binary logs start every file (segment) with an 8-byte
+header - ``b"AIXL"``, format version, codec id, two reserved bytes - followed by
+``<u32 length> payload <u32 length>`` frames; the trailing length lets tail
+readers walk a log backwards.  The ``msgpack`` codec stores keypoint matrices
+(and any numpy array) as little-endian float32 extension blobs instead of
+nested float lists.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import struct
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+import numpy as np
+
+LOGGER = logging.getLogger(__name__)
+
+MAGIC = b"AIXL"
+VERSION = 1
+HEADER_SIZE = 8
+ARRAY_EXT = 1
+PACKED_KEYS = frozenset({"keypoints"})
+
+_LENGTH = struct.Struct("<I")
+_MSGPACK = None  # lazy-loaded msgpack module
+
+Frame = Tuple[int, Optional[bytes]]  # (end position in buffer, payload or None if corrupt)
+
+
+def _load_msgpack() -> Any:
+    global _MSGPACK
+    if _MSGPACK is None:
+        try:
+            import msgpack as msgpack_mod
+        except ImportError as exc:
+            raise RuntimeError("The msgpack codec needs the 'msgpack' package installed") from exc
+        _MSGPACK = msgpack_mod
+    return _MSGPACK
+
+
+class JsonCodec:
+    """Newline-delimited JSON (the historical format)."""
+
+    name = "json"
+    codec_id = 0
+    header = b""
+
+    def pack(self, record: Dict[str, Any]) -> bytes:
+        return json.dumps(record).encode("utf-8")
+
+    def encode(self, record: Dict[str, Any]) -> bytes:
+        return self.pack(record) + b"\n"
+
+    def decode(self, payload: bytes) -> Dict[str, Any]:
+        return json.loads(payload)
+
+    def frames(self, buffer: bytes) -> Tuple[List[Frame], int]:
+        frames: List[Frame] = []
+        start = 0
+        while True:
+            end = buffer.find(b"\n", start)
+            if end < 0:
+                return frames, start
+            line = buffer[start:end]
+            start = end + 1
+            if line.strip():
+                frames.append((start, line))
+
+    def last_payloads(self, fh: BinaryIO, start: int, end: int, count: int, block_size: int) -> List[bytes]:
+        pos = end
+        data = b""
+        while pos > start and data.count(b"\n") <= count:
+            step = min(block_size, pos - start)
+            pos -= step
+            fh.seek(pos)
+            data = fh.read(step) + data
+        lines = [line for line in data.split(b"\n") if line.strip()]
+        if pos > start:
+            lines = lines[1:]  # first line may be cut mid-record
+        return lines[-count:] if count else []
+
+
+class _FramedCodec:
+    """Length-prefixed (and suffixed) binary frames behind a codec header."""
+
+    name = ""
+    codec_id = 0
+
+    @property
+    def header(self) -> bytes:
+        return MAGIC + bytes((VERSION, self.codec_id, 0, 0))
+
+    def pack(self, record: Dict[str, Any]) -> bytes:
+        raise NotImplementedError
+
+    def decode(self, payload: bytes) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def encode(self, record: Dict[str, Any]) -> bytes:
+        payload = self.pack(record)
+        length = _LENGTH.pack(len(payload))
+        return length + payload + length
+
+    def frames(self, buffer: bytes) -> Tuple[List[Frame], int]:
+        frames: List[Frame] = []
+        pos = 0
+        size = len(buffer)
+        while pos + 2 * _LENGTH.size <= size:
+            (length,) = _LENGTH.unpack_from(buffer, pos)
+            end = pos + 2 * _LENGTH.size + length
+            if end > size:
+                break
+            (trailer,) = _LENGTH.unpack_from(buffer, end - _LENGTH.size)
+            payload = buffer[pos + _LENGTH.size : end - _LENGTH.size]
+            frames.append((end, payload if trailer == length else None))
+            pos = end
+        return frames, pos
+
+    def last_payloads(self, fh: BinaryIO, start: int, end: int, count: int, block_size: int) -> List[bytes]:
+        payloads: List[bytes] = []
+        window_start, window = end, b""
+
+        def cover(low: int) -> None:
+            nonlocal window_start, window
+            if low < window_start:
+                window_start = max(start, min(low, window_start - block_size))
+                fh.seek(window_start)
+                window = fh.read(end - window_start)
+
+        pos = end
+        while len(payloads) < count and pos - 2 * _LENGTH.size >= start:
+            cover(pos - _LENGTH.size)
+            (length,) = _LENGTH.unpack_from(window, pos - _LENGTH.size - window_start)
+            frame_start = pos - 2 * _LENGTH.size - length
+            if frame_start < start:
+                LOGGER.debug("Corrupt frame trailer before byte %d", pos)
+                break
+            cover(frame_start)
+            body = frame_start + _LENGTH.size - window_start
+            payloads.append(window[body : body + length])
+            pos = frame_start
+        payloads.reverse()
+        return payloads
+
+
+def _pack_array(value: Any) -> Any:
+    try:
+        array = np.ascontiguousarray(value, dtype="<f4")
+    except (TypeError, ValueError):
+        return value
+    if array.dtype == object or array.ndim == 0:
+        return value
+    shape = struct.pack(f"<B{array.ndim}I", array.ndim, *array.shape)
+    return _load_msgpack().ExtType(ARRAY_EXT, shape + array.tobytes())
+
+
+def _unpack_array(code: int, data: bytes) -> Any:
+    if code != ARRAY_EXT:
+        return _load_msgpack().ExtType(code, data)
+    ndim = data[0]
+    shape = struct.unpack_from(f"<{ndim}I", data, 1)
+    array = np.frombuffer(data, dtype="<f4", offset=1 + 4 * ndim).reshape(shape)
+    return array.tolist()
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        return _pack_array(value)
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot serialise {type(value).__name__}")
+
+
+class MsgpackCodec(_FramedCodec):
+    """msgpack payloads; keypoints and numpy arrays travel as packed float32."""
+
+    name = "msgpack"
+    codec_id = 1
+
+    def __init__(self) -> None:
+        self._msgpack = _load_msgpack()
+
+    def pack(self, record: Dict[str, Any]) -> bytes:
+        packed = PACKED_KEYS.intersection(record)
+        if packed:
+            record = dict(record)
+            for key in packed:
+                record[key] = _pack_array(record[key])
+        return self._msgpack.packb(record, default=_default, use_bin_type=True)
+
+    def decode(self, payload: bytes) -> Dict[str, Any]:
+        try:
+            return self._msgpack.unpackb(payload, ext_hook=_unpack_array, raw=False, strict_map_key=False)
+        except (ValueError, TypeError, struct.error, self._msgpack.UnpackException) as exc:
+            raise ValueError(f"Invalid msgpack record: {exc}") from exc
+
+
+Codec = Any  # JsonCodec | MsgpackCodec
+_CODECS = {"json": JsonCodec, "msgpack": MsgpackCodec}
+_BY_ID = {JsonCodec.codec_id: "json", MsgpackCodec.codec_id: "msgpack"}
+
+
+def get_codec(name: str) -> Codec:
+    try:
+        factory = _CODECS[name.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown event codec {name!r}; expected one of {sorted(_CODECS)}") from None
+    return factory()
+
+
+def codec_by_id(codec_id: int) -> Codec:
+    name = _BY_ID.get(codec_id)
+    if name is None:
+        raise ValueError(f"Unknown event codec id {codec_id}")
+    return get_codec(name)
+
+
+def codec_from_header(prefix: bytes) -> Optional[Codec]:
+    """Codec announced by the first bytes of a log file.
+
+    Returns ``None`` while fewer than ``HEADER_SIZE`` bytes exist and the prefix
+    could still become a header; anything else is treated as JSON.
+    """
+    if prefix[: len(MAGIC)] != MAGIC[: len(prefix)]:
+        return JsonCodec()
+    if len(prefix) < HEADER_SIZE:
+        return None
+    if prefix[4] != VERSION or prefix[5] not in _BY_ID:
+        raise ValueError(f"Unsupported event log header {prefix[:HEADER_SIZE]!r}")
+    return codec_by_id(prefix[5])
+
+
+__all__ = ["HEADER_SIZE", "JsonCodec", "MsgpackCodec", "codec_by_id", "codec_from_header", "get_codec"]
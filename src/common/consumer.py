@@ -0,0 +1,187 @@
+"""Named event-log consumers that resume from a checkpointed byte offset.
+
+Each consumer ``name`` of a log keeps its position in a sidecar file
+``<log dir>/.offsets/<log name>.<name>.json``.  Checkpoints are written (atomic
+rename) every ``commit_every`` records, every ``commit_interval`` seconds, and
+whenever the consumer catches up with the writer; they are ``fsync``-ed
+according to ``fsync``:
+
+* ``"always"``   - every checkpoint is durable before processing continues,
+* ``"interval"`` - at most one fsync per ``fsync_interval`` seconds (default),
+* ``"never"``    - leave flushing to the OS.
+
+Delivery is at-least-once: a record counts as processed once the caller asks
+for the next one, so a crash replays at most the uncommitted tail.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from .segments import manifest_path
+from .tail import LogTailer
+
+LOGGER = logging.getLogger(__name__)
+
+FSYNC_POLICIES = ("always", "interval", "never")
+
+
+class OffsetStore:
+    """Sidecar checkpoint of one consumer's position in one log."""
+
+    def __init__(self, log_path: Union[Path, str], name: str, *, directory: Optional[Path] = None) -> None:
+        log_path = Path(log_path)
+        self.directory = Path(directory) if directory else log_path.parent / ".offsets"
+        self.path = self.directory / f"{log_path.name}.{name}.json"
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            LOGGER.warning("Ignoring unreadable checkpoint %s: %s", self.path, exc)
+            return None
+        return data if isinstance(data, dict) else None
+
+    def save(self, checkpoint: Dict[str, Any], *, sync: bool) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        temp = self.path.with_suffix(".tmp")
+        with temp.open("w", encoding="utf-8") as fh:
+            json.dump(checkpoint, fh)
+            if sync:
+                fh.flush()
+                os.fsync(fh.fileno())
+        os.replace(temp, self.path)
+        if sync:
+            dir_fd = os.open(self.directory, os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+
+class DurableConsumer:
+    """``LogTailer`` that checkpoints its offset under a consumer name."""
+
+    def __init__(
+        self,
+        path: Union[Path, str],
+        name: str,
+        *,
+        checkpoint_dir: Optional[Path] = None,
+        commit_every: int = 100,
+        commit_interval: float = 1.0,
+        fsync: str = "interval",
+        fsync_interval: float = 5.0,
+        poll_interval: float = 1.0,
+    ) -> None:
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy {fsync!r}; expected one of {FSYNC_POLICIES}")
+        self.path = Path(path)
+        self.name = name
+        self.commit_every = max(1, commit_every)
+        self.commit_interval = commit_interval
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.store = OffsetStore(self.path, name, directory=checkpoint_dir)
+        self.tailer = LogTailer(self.path, offset=self._resume_offset(), poll_interval=poll_interval)
+        self.committed = self.tailer.offset
+        self._uncommitted = 0
+        self._last_commit = time.monotonic()
+        self._last_sync = time.monotonic()
+        self._batch_size = 0
+
+    def _resume_offset(self) -> int:
+        checkpoint = self.store.load()
+        if not checkpoint:
+            return 0
+        offset = int(checkpoint.get("offset", 0))
+        if manifest_path(self.path).exists():
+            # Segmented logs roll the active file; logical offsets stay valid.
+            LOGGER.info("Consumer %s resuming %s at offset %d", self.name, self.path, offset)
+            return offset
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return 0
+        inode = checkpoint.get("inode")
+        if inode is not None and list(inode) != [stat.st_dev, stat.st_ino]:
+            LOGGER.info("%s was replaced since consumer %s checkpointed; starting over", self.path, self.name)
+            return 0
+        LOGGER.info("Consumer %s resuming %s at byte %d", self.name, self.path, offset)
+        return offset
+
+    @property
+    def offset(self) -> int:
+        return self.tailer.offset
+
+    def commit(self, *, sync: Optional[bool] = None) -> None:
+        """Persist the current offset (fsync per policy unless ``sync`` is given)."""
+        now = time.monotonic()
+        if sync is None:
+            sync = self.fsync == "always" or (
+                self.fsync == "interval" and now - self._last_sync >= self.fsync_interval
+            )
+        file_id = self.tailer.file_id
+        self.store.save(
+            {
+                "consumer": self.name,
+                "offset": self.tailer.offset,
+                "inode": list(file_id) if file_id else None,
+                "updated": time.time(),
+            },
+            sync=sync,
+        )
+        self.committed = self.tailer.offset
+        self._uncommitted = 0
+        self._last_commit = now
+        if sync:
+            self._last_sync = now
+
+    def _mark_processed(self, count: int = 1) -> None:
+        self._uncommitted += count
+        if (
+            self._uncommitted >= self.commit_every
+            or time.monotonic() - self._last_commit >= self.commit_interval
+        ):
+            self.commit()
+
+    def _idle(self) -> None:
+        if self.tailer.offset != self.committed:
+            self.commit()
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        while True:
+            record = self.tailer.next_record()
+            if record is None:
+                self._idle()
+                self.tailer.wait()
+                continue
+            yield record
+            self._mark_processed()
+
+    def read_available(self) -> List[Dict[str, Any]]:
+        """Batch API: records from the previous call count as processed."""
+        if self._batch_size:
+            self._mark_processed(self._batch_size)
+        records = self.tailer.read_available()
+        self._batch_size = len(records)
+        if not records:
+            self._idle()
+        return records
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self.tailer.wait(timeout)
+
+    def close(self) -> None:
+        self.commit(sync=self.fsync != "never")
+        self.tailer.close()
+
+
+__all__ = ["DurableConsumer", "OffsetStore"]
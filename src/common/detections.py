@@ -0,0 +1,326 @@
+"""Columnar detection results shared by detectors, trackers and pose events.
+
+A ``DetectionBatch`` holds one frame's detections as parallel numpy arrays;
+per-detection dicts are only built by ``to_dicts()`` where events leave the
+process (event bus, JSON caches).  A ``MultiCameraBatch`` packs one frame from
+each of several cameras into a single ``DetectionBatch`` plus row offsets, so
+a batched inference result can be tracked without splitting it into copies.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+_CORE_KEYS = frozenset({"bbox", "confidence", "class_id", "class", "keypoints", "track_id", "first_seen", "embedding"})
+
+
+@dataclass
+class DetectionBatch:
+    """Detections of one frame.
+
+    ``boxes`` are ``(N, 4)`` float32 xyxy, ``scores`` ``(N,)`` float32.
+    ``class_ids`` (indices into ``class_names``) is ``None`` for class-less
+    outputs such as poses, ``keypoints`` is ``(N, K, 3)`` (x, y, conf) and
+    ``embeddings`` ``(N, D)``.  ``track_ids`` stays ``None`` until a tracker
+    runs; afterwards ``-1`` marks untracked rows.  ``first_seen`` is NaN where
+    unknown (``to_dicts`` falls back to ``timestamp``).  ``extras`` carries
+    sparse per-row fields such as ``pose_events``.
+    """
+
+    boxes: np.ndarray
+    scores: np.ndarray
+    class_ids: Optional[np.ndarray] = None
+    keypoints: Optional[np.ndarray] = None
+    embeddings: Optional[np.ndarray] = None
+    track_ids: Optional[np.ndarray] = None
+    first_seen: Optional[np.ndarray] = None
+    class_names: Sequence[str] = ()
+    timestamp: Optional[float] = None
+    extras: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.boxes = np.asarray(self.boxes, dtype=np.float32).reshape(-1, 4)
+        self.scores = np.asarray(self.scores, dtype=np.float32).reshape(-1)
+        if self.class_ids is not None:
+            self.class_ids = np.asarray(self.class_ids, dtype=np.int32).reshape(-1)
+        if self.keypoints is not None:
+            keypoints = np.asarray(self.keypoints, dtype=np.float32)
+            self.keypoints = keypoints.reshape(len(self.boxes), -1, 3)
+        if self.embeddings is not None:
+            self.embeddings = np.asarray(self.embeddings, dtype=np.float32).reshape(len(self.boxes), -1)
+        if self.track_ids is not None:
+            self.track_ids = np.asarray(self.track_ids, dtype=np.int64).reshape(-1)
+        if self.first_seen is None:
+            self.first_seen = np.full(len(self.boxes), np.nan)
+        else:
+            self.first_seen = np.asarray(self.first_seen, dtype=np.float64).reshape(-1)
+
+    @classmethod
+    def empty(
+        cls,
+        *,
+        class_names: Sequence[str] = (),
+        with_classes: bool = True,
+        num_keypoints: int = 0,
+        timestamp: Optional[float] = None,
+    ) -> "DetectionBatch":
+        return cls(
+            boxes=np.empty((0, 4), dtype=np.float32),
+            scores=np.empty(0, dtype=np.float32),
+            class_ids=np.empty(0, dtype=np.int32) if with_classes else None,
+            keypoints=np.empty((0, num_keypoints, 3), dtype=np.float32) if num_keypoints else None,
+            class_names=class_names,
+            timestamp=timestamp,
+        )
+
+    def __len__(self) -> int:
+        return len(self.boxes)
+
+    def class_name(self, row: int) -> Optional[str]:
+        if self.class_ids is None:
+            return None
+        class_id = int(self.class_ids[row])
+        return self.class_names[class_id] if 0 <= class_id < len(self.class_names) else str(class_id)
+
+    def class_mask(self, names: Iterable[str]) -> np.ndarray:
+        """Rows whose class name (case-insensitive) is in ``names``."""
+        if self.class_ids is None or not len(self):
+            return np.zeros(len(self), dtype=bool)
+        wanted = {name.lower() for name in names}
+        lookup = np.array([str(name).lower() in wanted for name in self.class_names] + [False])
+        ids = np.where((self.class_ids >= 0) & (self.class_ids < len(self.class_names)), self.class_ids, -1)
+        return lookup[ids]
+
+    def take(self, rows: Any) -> "DetectionBatch":
+        """Subset by index array or boolean mask (``extras`` are re-keyed)."""
+        rows = np.arange(len(self))[rows] if np.asarray(rows).dtype == bool else np.asarray(rows, dtype=np.int64)
+
+        def pick(array: Optional[np.ndarray]) -> Optional[np.ndarray]:
+            return None if array is None else array[rows]
+
+        extras = {new: self.extras[int(old)] for new, old in enumerate(rows) if int(old) in self.extras}
+        return DetectionBatch(
+            boxes=self.boxes[rows],
+            scores=self.scores[rows],
+            class_ids=pick(self.class_ids),
+            keypoints=pick(self.keypoints),
+            embeddings=pick(self.embeddings),
+            track_ids=pick(self.track_ids),
+            first_seen=pick(self.first_seen),
+            class_names=self.class_names,
+            timestamp=self.timestamp,
+            extras=extras,
+        )
+
+    @classmethod
+    def concat(cls, batches: Sequence["DetectionBatch"]) -> "DetectionBatch":
+        if not batches:
+            return cls.empty()
+        # Empty batches add no rows and may lack optional columns (an empty
+        # pose result has no keypoints), which would drop them for everyone.
+        filled = [batch for batch in batches if len(batch)] or [batches[0]]
+        if len(filled) == 1:
+            return filled[0]
+        batches = filled
+        first = batches[0]
+
+        def join(name: str) -> Optional[np.ndarray]:
+            arrays = [getattr(batch, name) for batch in batches]
+            if any(array is None for array in arrays):
+                return None
+            return np.concatenate(arrays)
+
+        extras: Dict[int, Dict[str, Any]] = {}
+        offset = 0
+        for batch in batches:
+            extras.update({offset + row: values for row, values in batch.extras.items()})
+            offset += len(batch)
+        return cls(
+            boxes=np.concatenate([batch.boxes for batch in batches]),
+            scores=np.concatenate([batch.scores for batch in batches]),
+            class_ids=join("class_ids"),
+            keypoints=join("keypoints"),
+            embeddings=join("embeddings"),
+            track_ids=join("track_ids"),
+            first_seen=join("first_seen"),
+            class_names=first.class_names,
+            timestamp=first.timestamp,
+            extras=extras,
+        )
+
+    def segment(self, start: int, stop: int) -> "DetectionBatch":
+        """Rows ``start:stop`` as views of this batch's arrays.
+
+        In-place writes (``first_seen[...] = ...``) reach the parent batch;
+        reassigned columns such as ``track_ids`` do not.
+        """
+
+        def part(array: Optional[np.ndarray]) -> Optional[np.ndarray]:
+            return None if array is None else array[start:stop]
+
+        extras = {row - start: values for row, values in self.extras.items() if start <= row < stop}
+        return DetectionBatch(
+            boxes=self.boxes[start:stop],
+            scores=self.scores[start:stop],
+            class_ids=part(self.class_ids),
+            keypoints=part(self.keypoints),
+            embeddings=part(self.embeddings),
+            track_ids=part(self.track_ids),
+            first_seen=part(self.first_seen),
+            class_names=self.class_names,
+            timestamp=self.timestamp,
+            extras=extras,
+        )
+
+    def row_extras(self, row: int) -> Dict[str, Any]:
+        """Mutable extra fields for ``row`` (created on first use)."""
+        return self.extras.setdefault(row, {})
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Per-detection dicts in the historical event layout."""
+        boxes = self.boxes.tolist()
+        scores = self.scores.tolist()
+        keypoints = self.keypoints.tolist() if self.keypoints is not None else None
+        embeddings = self.embeddings.tolist() if self.embeddings is not None else None
+        track_ids = self.track_ids.tolist() if self.track_ids is not None else None
+        first_seen = self.first_seen.tolist() if self.first_seen is not None else [float("nan")] * len(boxes)
+        detections: List[Dict[str, Any]] = []
+        for row in range(len(boxes)):
+            det: Dict[str, Any] = {"bbox": boxes[row], "confidence": scores[row]}
+            if self.class_ids is not None:
+                det["class_id"] = int(self.class_ids[row])
+                det["class"] = self.class_name(row)
+            if keypoints is not None:
+                det["keypoints"] = keypoints[row]
+            if embeddings is not None:
+                det["embedding"] = embeddings[row]
+            if track_ids is not None:
+                det["track_id"] = track_ids[row] if track_ids[row] >= 0 else None
+            seen = first_seen[row]
+            if seen == seen:  # not NaN
+                det["first_seen"] = seen
+            elif self.timestamp is not None:
+                det["first_seen"] = self.timestamp
+            if row in self.extras:
+                det.update(self.extras[row])
+            detections.append(det)
+        return detections
+
+    @classmethod
+    def from_dicts(
+        cls,
+        detections: Sequence[Dict[str, Any]],
+        *,
+        class_names: Sequence[str] = (),
+        timestamp: Optional[float] = None,
+    ) -> "DetectionBatch":
+        """Inverse of ``to_dicts``; unknown keys land in ``extras``."""
+        names = list(class_names)
+        count = len(detections)
+        boxes = np.zeros((count, 4), dtype=np.float32)
+        scores = np.zeros(count, dtype=np.float32)
+        with_classes = any("class" in det or "class_id" in det for det in detections) or (not count and bool(names))
+        class_ids = np.zeros(count, dtype=np.int32) if with_classes else None
+        with_keypoints = count > 0 and all(det.get("keypoints") is not None for det in detections)
+        with_embeddings = count > 0 and all(det.get("embedding") is not None for det in detections)
+        tracked = any("track_id" in det for det in detections)
+        track_ids = np.full(count, -1, dtype=np.int64) if tracked else None
+        first_seen = np.full(count, np.nan)
+        # Columns only some rows carry stay per-row extras.
+        core = _CORE_KEYS - {
+            key for key, columnar in (("keypoints", with_keypoints), ("embedding", with_embeddings)) if not columnar
+        }
+        extras: Dict[int, Dict[str, Any]] = {}
+        for row, det in enumerate(detections):
+            bbox = det.get("bbox")
+            if bbox is not None and len(bbox) == 4:
+                boxes[row] = bbox
+            scores[row] = float(det.get("confidence", 0.0))
+            if class_ids is not None:
+                label = det.get("class")
+                if label is not None:
+                    label = str(label)
+                    if label not in names:
+                        names.append(label)
+                    class_ids[row] = names.index(label)
+                else:
+                    class_ids[row] = int(det.get("class_id", -1))
+            if track_ids is not None and det.get("track_id") is not None:
+                track_ids[row] = int(det["track_id"])
+            if det.get("first_seen") is not None:
+                first_seen[row] = float(det["first_seen"])
+            rest = {key: value for key, value in det.items() if key not in core}
+            if rest:
+                extras[row] = rest
+        return cls(
+            boxes=boxes,
+            scores=scores,
+            class_ids=class_ids,
+            keypoints=(
+                np.stack([np.asarray(det["keypoints"], dtype=np.float32) for det in detections])
+                if with_keypoints
+                else None
+            ),
+            embeddings=(
+                np.stack([np.asarray(det["embedding"], dtype=np.float32) for det in detections])
+                if with_embeddings
+                else None
+            ),
+            track_ids=track_ids,
+            first_seen=first_seen,
+            class_names=tuple(names),
+            timestamp=timestamp,
+            extras=extras,
+        )
+
+
+@dataclass
+class MultiCameraBatch:
+    """One frame per camera, packed back to back in ``batch``.
+
+    Camera ``camera_ids[i]`` owns rows ``offsets[i]:offsets[i + 1]`` and its
+    frame was taken at ``timestamps[i]``.  Camera ids must be unique: two
+    frames of one camera go in separate batches so they are tracked in order.
+    """
+
+    batch: DetectionBatch
+    camera_ids: List[Any]
+    offsets: np.ndarray
+    timestamps: List[Optional[float]]
+
+    def __post_init__(self) -> None:
+        self.offsets = np.asarray(self.offsets, dtype=np.int64).reshape(-1)
+        if len(self.offsets) != len(self.camera_ids) + 1 or len(self.timestamps) != len(self.camera_ids):
+            raise ValueError("need one offset pair and one timestamp per camera")
+        if len(set(self.camera_ids)) != len(self.camera_ids):
+            raise ValueError("camera ids must be unique within a MultiCameraBatch")
+        if self.offsets[0] != 0 or self.offsets[-1] != len(self.batch) or np.any(np.diff(self.offsets) < 0):
+            raise ValueError("offsets must rise from 0 to len(batch)")
+
+    @classmethod
+    def from_batches(cls, camera_ids: Sequence[Any], batches: Sequence[DetectionBatch]) -> "MultiCameraBatch":
+        if len(camera_ids) != len(batches):
+            raise ValueError("need one batch per camera")
+        offsets = np.zeros(len(batches) + 1, dtype=np.int64)
+        np.cumsum([len(batch) for batch in batches], out=offsets[1:])
+        return cls(
+            batch=DetectionBatch.concat(list(batches)) if batches else DetectionBatch.empty(),
+            camera_ids=list(camera_ids),
+            offsets=offsets,
+            timestamps=[batch.timestamp for batch in batches],
+        )
+
+    def __len__(self) -> int:
+        return len(self.camera_ids)
+
+    def segment(self, index: int) -> DetectionBatch:
+        """Camera ``index``'s rows as views (see ``DetectionBatch.segment``)."""
+        segment = self.batch.segment(int(self.offsets[index]), int(self.offsets[index + 1]))
+        segment.timestamp = self.timestamps[index]
+        return segment
+
+
+__all__ = ["DetectionBatch", "MultiCameraBatch"]
@@ -1,13 +1,32 @@
 from __future__ import annotations
 
+import atexit
 import json
+import os
 import queue
 import threading
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Iterator, Union
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
 
+from .codec import HEADER_SIZE, codec_from_header, get_codec
 from .config import ensure_dir
+from .segments import SegmentWriter
+
+DEFAULT_SEGMENT_BYTES = 64 * 1024 * 1024
+DEFAULT_RETENTION_BYTES = 1024 * 1024 * 1024
+DEFAULT_FLUSH_BYTES = 64 * 1024
+FANOUT_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+
+def _env_number(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+def _setting(value: Optional[float], name: str, default: float) -> float:
+    return float(value) if value is not None else _env_number(name, default)
 
 
 @dataclass
@@ -16,10 +35,90 @@ class Event:
     payload: Dict[str, Any]
 
 
+class Subscription:
+    """Bounded in-process queue of events published on one bus.
+
+    When the queue is full ``policy`` decides: ``drop_oldest`` evicts the oldest
+    queued event, ``drop_newest`` discards the new one, and ``block`` applies
+    backpressure to the publisher for up to ``block_timeout`` seconds (``None``
+    waits forever) before discarding.  ``dropped`` counts discarded events.
+    """
+
+    def __init__(
+        self,
+        bus: "FileEventBus",
+        *,
+        maxsize: int = 1024,
+        policy: str = "drop_oldest",
+        block_timeout: Optional[float] = None,
+    ) -> None:
+        if policy not in FANOUT_POLICIES:
+            raise ValueError(f"Unknown fan-out policy {policy!r}; expected one of {FANOUT_POLICIES}")
+        if maxsize <= 0:
+            raise ValueError("Subscriptions must be bounded (maxsize > 0)")
+        self._bus = bus
+        self._queue: "queue.Queue[Event]" = queue.Queue(maxsize)
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.dropped = 0
+
+    def offer(self, event: Event) -> None:
+        if self.policy == "block":
+            try:
+                self._queue.put(event, timeout=self.block_timeout)
+            except queue.Full:
+                self.dropped += 1
+            return
+        while True:
+            try:
+                self._queue.put_nowait(event)
+                return
+            except queue.Full:
+                if self.policy == "drop_newest":
+                    self.dropped += 1
+                    return
+            try:
+                self._queue.get_nowait()
+                self.dropped += 1
+            except queue.Empty:
+                pass
+
+    def get(self, timeout: Optional[float] = None) -> Event:
+        """Next event; raises ``queue.Empty`` once ``timeout`` expires."""
+        return self._queue.get(timeout=timeout)
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    def __iter__(self) -> Iterator[Event]:
+        while True:
+            yield self._queue.get()
+
+    def close(self) -> None:
+        self._bus.unsubscribe(self)
+
+
 class FileEventBus:
-    """Minimal local event bus backed by newline-delimited JSON.
+    """Minimal local event bus backed by an append-only log.
 
     Not for production but keeps services loosely coupled in demo profile.
+    The log is split into segments that roll by size (``segment_bytes``) or age
+    (``segment_seconds``); sealed segments beyond ``retention_bytes`` or older
+    than ``retention_seconds`` are deleted.  ``0`` disables a limit and unset
+    arguments fall back to the ``EVENT_BUS_*`` environment variables.
+
+    With ``buffered=True`` the log stays open and records are written in
+    batches once ``flush_bytes`` accumulate or ``flush_interval`` seconds pass;
+    call ``flush()``/``close()`` (or use the bus as a context manager) to push
+    the tail out.  ``last.json`` is rewritten at most once per ``last_interval``.
+
+    Records are newline-delimited JSON unless ``codec`` (or ``EVENT_BUS_CODEC``)
+    selects the framed binary ``msgpack`` format; the codec is recorded in each
+    file header and readers pick it up automatically.
+
+    In-process delivery is opt-in: ``subscribe()`` registers a bounded
+    ``Subscription``, and ``fanout=True`` creates the default one behind
+    ``consume()``.  A publish-only bus keeps no per-event state in memory.
     """
 
     def __init__(
@@ -28,27 +127,182 @@ class FileEventBus:
         filename: str = "events.log",
         *,
         write_last: bool = True,
+        segment_bytes: Optional[int] = None,
+        segment_seconds: Optional[float] = None,
+        retention_bytes: Optional[int] = None,
+        retention_seconds: Optional[float] = None,
+        buffered: Optional[bool] = None,
+        flush_bytes: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        last_interval: Optional[float] = None,
+        fanout: bool = False,
+        fanout_maxsize: int = 1024,
+        fanout_policy: str = "drop_oldest",
+        codec: Optional[str] = None,
     ) -> None:
         directory = ensure_dir(Path(path))
         self.path = directory.joinpath(filename)
         self.last_event_path = directory.joinpath("last.json") if write_last else None
+        segments = SegmentWriter(
+            self.path,
+            segment_bytes=int(_setting(segment_bytes, "EVENT_BUS_SEGMENT_BYTES", DEFAULT_SEGMENT_BYTES)),
+            segment_seconds=_setting(segment_seconds, "EVENT_BUS_SEGMENT_SECONDS", 0),
+            retention_bytes=int(_setting(retention_bytes, "EVENT_BUS_RETENTION_BYTES", DEFAULT_RETENTION_BYTES)),
+            retention_seconds=_setting(retention_seconds, "EVENT_BUS_RETENTION_SECONDS", 0),
+        )
+        self._segments = segments if segments.enabled else None
+        self.codec = get_codec(codec or os.getenv("EVENT_BUS_CODEC") or "json")
+        self._checked_file: Optional[Tuple[int, int]] = None
+        if buffered is None:
+            buffered = os.getenv("EVENT_BUS_BUFFERED", "0").lower() in {"1", "true", "yes"}
+        self.buffered = buffered
+        self.flush_bytes = int(_setting(flush_bytes, "EVENT_BUS_FLUSH_BYTES", DEFAULT_FLUSH_BYTES))
+        self.flush_interval = _setting(flush_interval, "EVENT_BUS_FLUSH_INTERVAL", 0.2)
+        self.last_interval = _setting(last_interval, "EVENT_BUS_LAST_INTERVAL", 1.0 if buffered else 0.0)
         self._lock = threading.Lock()
-        self._queue: "queue.Queue[Event]" = queue.Queue()
+        self._subscribers: Tuple[Subscription, ...] = ()
+        self._default: Optional[Subscription] = (
+            self.subscribe(maxsize=fanout_maxsize, policy=fanout_policy) if fanout else None
+        )
+        self._fh: Optional[BinaryIO] = None
+        self._pending: List[bytes] = []
+        self._pending_bytes = 0
+        self._last_record: Optional[Dict[str, Any]] = None
+        self._last_written = 0.0
+        self._closed = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+    def subscribe(
+        self,
+        *,
+        maxsize: int = 1024,
+        policy: str = "drop_oldest",
+        block_timeout: Optional[float] = None,
+    ) -> Subscription:
+        subscription = Subscription(self, maxsize=maxsize, policy=policy, block_timeout=block_timeout)
+        with self._lock:
+            self._subscribers = self._subscribers + (subscription,)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers = tuple(sub for sub in self._subscribers if sub is not subscription)
 
     def publish(self, event: Event) -> None:
-        self._queue.put(event)
+        for subscription in self._subscribers:
+            subscription.offer(event)
+        record = {"type": event.type, **event.payload}
+        line = self.codec.encode(record)
         with self._lock:
-            record = {"type": event.type, **event.payload}
-            with self.path.open("a", encoding="utf-8") as fh:
-                fh.write(json.dumps(record) + "\n")
-            if self.last_event_path is not None:
-                with self.last_event_path.open("w", encoding="utf-8") as fh:
-                    json.dump(record, fh, indent=2)
+            if self.buffered:
+                self._pending.append(line)
+                self._pending_bytes += len(line)
+                if self._flusher is None:
+                    self._start_flusher()
+                if self._pending_bytes >= self.flush_bytes:
+                    self._write_pending()
+            else:
+                if self._segments is not None:
+                    self._segments.maybe_roll()
+                with self._open_log() as fh:
+                    fh.write(line)
+            self._last_record = record
+            self._write_last(force=False)
+
+    def flush(self) -> None:
+        """Write buffered records and the latest ``last.json`` snapshot."""
+        with self._lock:
+            self._write_pending()
+            self._write_last(force=True)
+
+    def close(self) -> None:
+        self._closed.set()
+        atexit.unregister(self.close)
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join(timeout=max(1.0, self.flush_interval * 2))
+        self.flush()
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+    def __enter__(self) -> "FileEventBus":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
 
     def consume(self) -> Iterator[Event]:
-        while True:
-            event = self._queue.get()
-            yield event
+        if self._default is None:
+            raise RuntimeError("In-process consume() needs FileEventBus(..., fanout=True) or subscribe()")
+        return iter(self._default)
+
+    # -- writer internals (call with ``_lock`` held) -------------------
+    def _start_flusher(self) -> None:
+        self._flusher = threading.Thread(target=self._flush_loop, name=f"bus-flush-{self.path.name}", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    def _flush_loop(self) -> None:
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
+
+    def _writer(self) -> BinaryIO:
+        if self._fh is not None and self._segments is not None:
+            # Rolled (by us or another writer): stop appending to the sealed file.
+            try:
+                current = self.path.stat()
+                opened = os.fstat(self._fh.fileno())
+                stale = (current.st_dev, current.st_ino) != (opened.st_dev, opened.st_ino)
+            except FileNotFoundError:
+                stale = True
+            if stale:
+                self._fh.close()
+                self._fh = None
+        if self._fh is None:
+            self._fh = self._open_log()
+        return self._fh
+
+    def _open_log(self) -> BinaryIO:
+        fh = self.path.open("a+b")
+        stat = os.fstat(fh.fileno())
+        file_id = (stat.st_dev, stat.st_ino)
+        if stat.st_size == 0:
+            fh.write(self.codec.header)
+        elif file_id != self._checked_file:
+            found = codec_from_header(os.pread(fh.fileno(), HEADER_SIZE, 0))
+            if found is not None and found.name != self.codec.name:
+                fh.close()
+                if self._segments is None or not self._segments.maybe_roll(force=True):
+                    raise RuntimeError(
+                        f"{self.path} holds {found.name} records; switch the codec back or move the log aside"
+                    )
+                return self._open_log()
+        self._checked_file = file_id
+        return fh
+
+    def _write_pending(self) -> None:
+        if not self._pending:
+            return
+        if self._segments is not None:
+            self._segments.maybe_roll()
+        fh = self._writer()
+        fh.write(b"".join(self._pending))
+        fh.flush()
+        self._pending.clear()
+        self._pending_bytes = 0
+
+    def _write_last(self, *, force: bool) -> None:
+        if self.last_event_path is None or self._last_record is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_written < self.last_interval:
+            return
+        temp = self.last_event_path.with_suffix(".tmp")
+        temp.write_text(json.dumps(self._last_record), encoding="utf-8")
+        os.replace(temp, self.last_event_path)
+        self._last_record = None
+        self._last_written = now
 
 
-__all__ = ["Event", "FileEventBus"]
+__all__ = ["Event", "FileEventBus", "Subscription"]
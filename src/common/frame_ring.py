@@ -0,0 +1,199 @@
+"""Shared-memory ring of raw BGR frames for ingest -> detector hand-off.
+
+The ring lives in a single POSIX shared-memory block:
+
+* a fixed header (magic, slot count, slot capacity),
+* one metadata row per slot (sequence counter, frame index, timestamp, shape),
+* ``slots`` fixed-size payload areas holding raw ``uint8`` pixels.
+
+Writers bump a slot's sequence to an odd value before copying pixels and to the
+next even value afterwards (a seqlock).  Frame records published on the bus carry
+``ring``/``slot``/``generation``; readers copy the slot and re-check the sequence,
+so a slot that was overwritten while being read is reported as stale instead of
+returning torn pixels.
+"""
+
+from __future__ import annotations
+
+import logging
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+LOGGER = logging.getLogger(__name__)
+
+MAGIC = b"AIXRING1"
+_HEADER = np.dtype([("magic", "S8"), ("slots", "<u4"), ("slot_bytes", "<u8"), ("reserved", "<u4")])
+_SLOT_META = np.dtype(
+    [
+        ("sequence", "<u8"),
+        ("frame_index", "<i8"),
+        ("timestamp", "<f8"),
+        ("height", "<u4"),
+        ("width", "<u4"),
+        ("channels", "<u4"),
+        ("reserved", "<u4"),
+    ]
+)
+_ALIGN = 64
+
+
+def _aligned(size: int) -> int:
+    return (size + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing block without handing ownership to this process."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # type: ignore[call-arg]
+    except TypeError:  # Python < 3.13 has no ``track`` flag
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+        except Exception:  # pragma: no cover - tracker implementation detail
+            pass
+        return shm
+
+
+class FrameRing:
+    """Fixed-slot frame ring backed by ``multiprocessing.shared_memory``."""
+
+    def __init__(self, shm: shared_memory.SharedMemory, *, owner: bool) -> None:
+        self._shm = shm
+        self.owner = owner
+        header = np.ndarray((1,), dtype=_HEADER, buffer=shm.buf)[0]
+        if bytes(header["magic"]) != MAGIC:
+            raise RuntimeError(f"Shared memory block {shm.name} is not a frame ring")
+        self.slots = int(header["slots"])
+        self.slot_bytes = int(header["slot_bytes"])
+        meta_offset = _aligned(_HEADER.itemsize)
+        self._meta = np.ndarray((self.slots,), dtype=_SLOT_META, buffer=shm.buf, offset=meta_offset)
+        data_offset = _aligned(meta_offset + _SLOT_META.itemsize * self.slots)
+        self._data = np.ndarray(
+            (self.slots, self.slot_bytes), dtype=np.uint8, buffer=shm.buf, offset=data_offset
+        )
+        self._cursor = 0
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @classmethod
+    def create(
+        cls,
+        name: str,
+        *,
+        slots: int = 8,
+        max_shape: Tuple[int, int, int] = (1080, 1920, 3),
+    ) -> "FrameRing":
+        if slots <= 0:
+            raise ValueError("Frame ring needs at least one slot")
+        slot_bytes = _aligned(int(np.prod(max_shape)))
+        meta_offset = _aligned(_HEADER.itemsize)
+        data_offset = _aligned(meta_offset + _SLOT_META.itemsize * slots)
+        size = data_offset + slot_bytes * slots
+        try:
+            stale = _attach(name)
+        except FileNotFoundError:
+            pass
+        else:  # leftover from a crashed ingest; start fresh
+            stale.close()
+            stale.unlink()
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = np.ndarray((1,), dtype=_HEADER, buffer=shm.buf)
+        header[0] = (MAGIC, slots, slot_bytes, 0)
+        meta = np.ndarray((slots,), dtype=_SLOT_META, buffer=shm.buf, offset=meta_offset)
+        meta[:] = np.zeros(slots, dtype=_SLOT_META)
+        del header, meta
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "FrameRing":
+        return cls(_attach(name), owner=False)
+
+    def fits(self, image: np.ndarray) -> bool:
+        return image.dtype == np.uint8 and image.nbytes <= self.slot_bytes
+
+    def write(self, image: np.ndarray, *, frame_index: int, timestamp: float) -> Dict[str, Any]:
+        """Copy ``image`` into the next slot and return the frame-record fields."""
+        if not self.fits(image):
+            raise ValueError(f"Frame {image.shape} does not fit ring slot of {self.slot_bytes} bytes")
+        slot = self._cursor
+        self._cursor = (self._cursor + 1) % self.slots
+        meta = self._meta[slot]
+        sequence = int(meta["sequence"])
+        meta["sequence"] = sequence + 1 if sequence % 2 == 0 else sequence + 2
+        height, width = image.shape[:2]
+        channels = image.shape[2] if image.ndim == 3 else 1
+        target = self._data[slot, : image.nbytes].reshape(image.shape)
+        np.copyto(target, image)
+        meta["frame_index"] = frame_index
+        meta["timestamp"] = timestamp
+        meta["height"] = height
+        meta["width"] = width
+        meta["channels"] = channels
+        generation = int(meta["sequence"]) + 1
+        meta["sequence"] = generation
+        return {"ring": self.name, "slot": slot, "generation": generation}
+
+    def read(self, slot: int, generation: int) -> Optional[np.ndarray]:
+        """Return a private copy of ``slot`` or ``None`` if it was recycled."""
+        if not 0 <= slot < self.slots:
+            return None
+        meta = self._meta[slot]
+        if int(meta["sequence"]) != generation:
+            return None
+        height, width, channels = int(meta["height"]), int(meta["width"]), int(meta["channels"])
+        nbytes = height * width * channels
+        shape = (height, width, channels) if channels > 1 else (height, width)
+        image = self._data[slot, :nbytes].reshape(shape).copy()
+        if int(meta["sequence"]) != generation:
+            return None
+        return image
+
+    def close(self) -> None:
+        self._meta = None  # type: ignore[assignment]
+        self._data = None  # type: ignore[assignment]
+        try:
+            self._shm.close()
+        except BufferError:  # pragma: no cover - outstanding views
+            LOGGER.debug("Frame ring %s still has live views", self.name)
+            return
+        if self.owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class FrameRingReader:
+    """Resolves frame records against any number of rings, attaching lazily."""
+
+    def __init__(self) -> None:
+        self._rings: Dict[str, FrameRing] = {}
+
+    def read(self, record: Dict[str, Any]) -> Optional[np.ndarray]:
+        name = record.get("ring")
+        if not name:
+            return None
+        ring = self._rings.get(str(name))
+        if ring is None:
+            try:
+                ring = FrameRing.attach(str(name))
+            except (FileNotFoundError, RuntimeError) as exc:
+                LOGGER.warning("Unable to attach frame ring %s: %s", name, exc)
+                return None
+            self._rings[str(name)] = ring
+        try:
+            return ring.read(int(record.get("slot", -1)), int(record.get("generation", -1)))
+        except (TypeError, ValueError):
+            return None
+
+    def close(self) -> None:
+        for ring in self._rings.values():
+            ring.close()
+        self._rings.clear()
+
+
+__all__ = ["FrameRing", "FrameRingReader"]
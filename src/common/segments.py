@@ -0,0 +1,195 @@
+"""Segment bookkeeping for rolling event logs.
+
+A segmented log keeps appending to its usual path (``events.log``), which is the
+*active* segment.  Rolling renames it to ``events.log.<base offset>`` and starts
+a fresh active file.  ``events.log.manifest.json`` records every sealed segment
+(file name, logical base offset, size, first/last timestamp) plus the base
+offset of the active segment, so a logical offset (bytes since the log was
+first created) maps to exactly one file.  Writers roll under an exclusive
+``flock`` on ``events.log.lock``; readers resolve offsets under a shared lock.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+
+def manifest_path(log_path: Path) -> Path:
+    return log_path.with_name(log_path.name + ".manifest.json")
+
+
+def lock_path(log_path: Path) -> Path:
+    return log_path.with_name(log_path.name + ".lock")
+
+
+@contextmanager
+def segment_lock(log_path: Path, *, exclusive: bool) -> Iterator[None]:
+    path = lock_path(log_path)
+    try:
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    except OSError:  # read-only mount: nobody can be rolling this log
+        yield
+        return
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        yield
+    finally:
+        os.close(fd)
+
+
+@dataclass
+class Segment:
+    file: str
+    base_offset: int
+    bytes: int
+    first_ts: float
+    last_ts: float
+
+    @property
+    def end_offset(self) -> int:
+        return self.base_offset + self.bytes
+
+
+@dataclass
+class SegmentManifest:
+    active_base: int = 0
+    active_created: float = field(default_factory=time.time)
+    segments: List[Segment] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, log_path: Path) -> Optional["SegmentManifest"]:
+        try:
+            data = json.loads(manifest_path(log_path).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            LOGGER.warning("Unreadable segment manifest for %s: %s", log_path, exc)
+            return None
+        active = data.get("active", {})
+        return cls(
+            active_base=int(active.get("base_offset", 0)),
+            active_created=float(active.get("created", time.time())),
+            segments=[Segment(**entry) for entry in data.get("segments", [])],
+        )
+
+    def save(self, log_path: Path) -> None:
+        target = manifest_path(log_path)
+        temp = target.with_name(target.name + ".tmp")
+        payload: Dict[str, Any] = {
+            "active": {"base_offset": self.active_base, "created": self.active_created},
+            "segments": [asdict(segment) for segment in self.segments],
+        }
+        temp.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        os.replace(temp, target)
+
+    def locate(self, log_path: Path, offset: int) -> Tuple[Path, int, bool]:
+        """Map a logical offset to ``(file, base_offset, sealed)``.
+
+        Offsets that fell behind retention are moved to the oldest retained byte.
+        """
+        if offset >= self.active_base or not self.segments:
+            return log_path, self.active_base, False
+        for segment in self.segments:
+            if offset < segment.end_offset:
+                return log_path.with_name(segment.file), segment.base_offset, True
+        return log_path, self.active_base, False
+
+    @property
+    def start_offset(self) -> int:
+        return self.segments[0].base_offset if self.segments else self.active_base
+
+
+class SegmentWriter:
+    """Rolls the active segment by size/age and applies retention."""
+
+    def __init__(
+        self,
+        log_path: Path,
+        *,
+        segment_bytes: int = 0,
+        segment_seconds: float = 0.0,
+        retention_bytes: int = 0,
+        retention_seconds: float = 0.0,
+    ) -> None:
+        self.log_path = log_path
+        self.segment_bytes = segment_bytes
+        self.segment_seconds = segment_seconds
+        self.retention_bytes = retention_bytes
+        self.retention_seconds = retention_seconds
+        self.manifest = SegmentManifest.load(log_path) or SegmentManifest()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.segment_bytes or self.segment_seconds)
+
+    def _due(self, size: int, now: float) -> bool:
+        if size <= 0:
+            return False
+        if self.segment_bytes and size >= self.segment_bytes:
+            return True
+        return bool(self.segment_seconds and now - self.manifest.active_created >= self.segment_seconds)
+
+    def maybe_roll(self, now: Optional[float] = None, *, force: bool = False) -> bool:
+        """Seal the active segment if it is due (or non-empty with ``force``)."""
+        now = time.time() if now is None else now
+        try:
+            size = self.log_path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if not (force and size > 0) and not self._due(size, now):
+            return False
+        with segment_lock(self.log_path, exclusive=True):
+            # Another writer may have rolled while we waited for the lock.
+            self.manifest = SegmentManifest.load(self.log_path) or self.manifest
+            try:
+                size = self.log_path.stat().st_size
+            except FileNotFoundError:
+                return False
+            if not (force and size > 0) and not self._due(size, now):
+                return False
+            base = self.manifest.active_base
+            sealed = Segment(
+                file=f"{self.log_path.name}.{base:020d}",
+                base_offset=base,
+                bytes=size,
+                first_ts=self.manifest.active_created,
+                last_ts=now,
+            )
+            os.replace(self.log_path, self.log_path.with_name(sealed.file))
+            self.manifest.segments.append(sealed)
+            self.manifest.active_base = sealed.end_offset
+            self.manifest.active_created = now
+            self._apply_retention(now)
+            self.manifest.save(self.log_path)
+        LOGGER.info("Rolled %s at offset %d", self.log_path, sealed.end_offset)
+        return True
+
+    def _apply_retention(self, now: float) -> None:
+        segments = self.manifest.segments
+        total = sum(segment.bytes for segment in segments)
+        while segments:
+            oldest = segments[0]
+            too_big = bool(self.retention_bytes) and total > self.retention_bytes
+            too_old = bool(self.retention_seconds) and now - oldest.last_ts > self.retention_seconds
+            if not (too_big or too_old):
+                break
+            try:
+                self.log_path.with_name(oldest.file).unlink()
+            except FileNotFoundError:
+                pass
+            total -= oldest.bytes
+            segments.pop(0)
+            LOGGER.info("Retention removed %s", oldest.file)
+
+
+__all__ = ["Segment", "SegmentManifest", "SegmentWriter", "manifest_path", "segment_lock"]
@@ -0,0 +1,267 @@
+"""Unix-domain datagram pub/sub for services on one host.
+
+Every topic is a directory under ``EVENT_BUS_SOCKET_DIR`` (default
+``artifacts/bus``); each subscriber binds ``<topic>/<name>.sock`` and a publisher
+sends one datagram per event to every socket it finds there.  Datagrams carry a
+one-byte codec id followed by the record, so JSON and msgpack publishers can
+share a topic.  Nothing touches the disk on the hot path; an optional
+``FileEventBus`` tee keeps the usual log for audit, the exporter and the UI.
+
+Delivery is at-most-once.  Publishers wait up to ``send_timeout`` for a full
+subscriber queue and then drop (``dropped`` counts them), skipping the wait for
+a subscriber that stalled until it catches up again.  Subscribers drain their
+socket on a reader thread into a bounded buffer that evicts the oldest records.
+"""
+
+from __future__ import annotations
+
+import errno
+import logging
+import os
+import socket
+import struct
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Set, Union
+
+from .codec import Codec, codec_by_id, get_codec
+from .event_bus import Event, FileEventBus
+
+LOGGER = logging.getLogger(__name__)
+
+MAX_DATAGRAM = 256 * 1024
+
+
+def socket_dir(directory: Optional[Union[Path, str]] = None) -> Path:
+    return Path(directory or os.getenv("EVENT_BUS_SOCKET_DIR") or "artifacts/bus")
+
+
+class SocketSubscriber:
+    """Receives one topic on ``<socket dir>/<topic>/<name>.sock``.
+
+    Offers the same reading API as ``LogTailer``/``DurableConsumer``:
+    ``read_available()``, ``next_record()``, ``wait()``, iteration and ``close()``.
+    """
+
+    def __init__(
+        self,
+        topic: str,
+        name: str,
+        *,
+        directory: Optional[Union[Path, str]] = None,
+        maxsize: int = 10_000,
+        poll_interval: float = 1.0,
+    ) -> None:
+        self.topic = topic
+        self.name = name
+        self.poll_interval = poll_interval
+        topic_dir = socket_dir(directory) / topic
+        topic_dir.mkdir(parents=True, exist_ok=True)
+        self.path = topic_dir / f"{name}.sock"
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        try:
+            self.path.unlink()  # left behind by a previous run of this consumer
+        except FileNotFoundError:
+            pass
+        self._sock.bind(str(self.path))
+        self._sock.settimeout(0.25)
+        self._datagrams: Deque[bytes] = deque(maxlen=maxsize)
+        self._ready = threading.Condition()
+        self._closed = threading.Event()
+        self._codecs: Dict[int, Codec] = {}
+        self.dropped = 0
+        self._reader = threading.Thread(target=self._receive, name=f"bus-{topic}-{name}", daemon=True)
+        self._reader.start()
+
+    def _receive(self) -> None:
+        while not self._closed.is_set():
+            try:
+                data = self._sock.recv(MAX_DATAGRAM)
+            except socket.timeout:
+                continue
+            except OSError:
+                if self._closed.is_set():
+                    return
+                raise
+            if self._closed.is_set():
+                return
+            with self._ready:
+                if len(self._datagrams) == self._datagrams.maxlen:
+                    self.dropped += 1
+                self._datagrams.append(data)
+                self._ready.notify_all()
+
+    def _decode(self, data: bytes) -> Optional[Dict[str, Any]]:
+        codec = self._codecs.get(data[0]) if data else None
+        try:
+            if codec is None:
+                codec = self._codecs[data[0]] = codec_by_id(data[0])
+            return codec.decode(data[1:])
+        except (IndexError, ValueError) as exc:
+            LOGGER.warning("Skipping malformed datagram on %s: %s", self.topic, exc)
+            return None
+
+    @property
+    def backlog(self) -> int:
+        """Datagrams received but not yet handed out."""
+        with self._ready:
+            return len(self._datagrams)
+
+    def read_available(self) -> List[Dict[str, Any]]:
+        with self._ready:
+            batch = list(self._datagrams)
+            self._datagrams.clear()
+        return [record for record in map(self._decode, batch) if record is not None]
+
+    def next_record(self) -> Optional[Dict[str, Any]]:
+        while True:
+            with self._ready:
+                if not self._datagrams:
+                    return None
+                data = self._datagrams.popleft()
+            record = self._decode(data)
+            if record is not None:
+                return record
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        timeout = self.poll_interval if timeout is None else timeout
+        with self._ready:
+            if not self._datagrams:
+                self._ready.wait(timeout)
+            return bool(self._datagrams)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        while True:
+            record = self.next_record()
+            if record is None:
+                self.wait()
+                continue
+            yield record
+
+    def close(self) -> None:
+        self._closed.set()
+        try:
+            self._sock.sendto(b"", str(self.path))  # wake the reader thread
+        except OSError:
+            pass
+        self._reader.join(timeout=1.0)
+        self._sock.close()
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SocketEventBus:
+    """Publishes events to every subscriber of ``topic``.
+
+    ``publish``/``consume``/``flush``/``close`` mirror ``FileEventBus``; pass
+    ``tee`` to also append every event to a file log.
+    """
+
+    def __init__(
+        self,
+        topic: str,
+        *,
+        directory: Optional[Union[Path, str]] = None,
+        codec: Optional[str] = None,
+        send_timeout: float = 0.05,
+        tee: Optional[FileEventBus] = None,
+    ) -> None:
+        self.topic = topic
+        self.directory = socket_dir(directory)
+        self.topic_dir = self.directory / topic
+        self.topic_dir.mkdir(parents=True, exist_ok=True)
+        self.codec = get_codec(codec or os.getenv("EVENT_BUS_CODEC") or "json")
+        self._prefix = bytes((self.codec.codec_id,))
+        self.tee = tee
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        seconds = int(send_timeout)
+        self._sock.setsockopt(
+            socket.SOL_SOCKET,
+            socket.SO_SNDTIMEO,
+            struct.pack("ll", seconds, int((send_timeout - seconds) * 1_000_000)),
+        )
+        self._lock = threading.Lock()
+        self._peers: List[str] = []
+        self._stalled: Set[str] = set()
+        self._scanned: Optional[int] = None
+        self.dropped = 0
+
+    def _refresh_peers(self) -> None:
+        try:
+            mtime = self.topic_dir.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._peers = []
+            return
+        if mtime == self._scanned:
+            return
+        self._scanned = mtime
+        self._peers = sorted(str(path) for path in self.topic_dir.glob("*.sock"))
+        self._stalled.intersection_update(self._peers)
+
+    def publish(self, event: Event) -> None:
+        record = {"type": event.type, **event.payload}
+        data = self._prefix + self.codec.pack(record)
+        if self.tee is not None:
+            self.tee.publish(event)
+        with self._lock:
+            self._refresh_peers()
+            for peer in self._peers:
+                self._send(peer, data)
+
+    def _send(self, peer: str, data: bytes) -> None:
+        flags = socket.MSG_DONTWAIT if peer in self._stalled else 0
+        try:
+            self._sock.sendto(data, flags, peer)
+        except BlockingIOError:
+            self.dropped += 1
+            if peer not in self._stalled:
+                LOGGER.warning("Subscriber %s is not keeping up; dropping until it drains", peer)
+                self._stalled.add(peer)
+            return
+        except (ConnectionRefusedError, FileNotFoundError):
+            # Nobody is bound any more (consumer crashed): forget the socket.
+            try:
+                os.unlink(peer)
+            except FileNotFoundError:
+                pass
+            self._scanned = None
+            return
+        except OSError as exc:
+            if exc.errno != errno.EMSGSIZE:
+                raise
+            self.dropped += 1
+            LOGGER.warning("Event of %d bytes is too large for a datagram on %s", len(data), self.topic)
+            return
+        self._stalled.discard(peer)
+
+    def subscribe(self, name: str, *, maxsize: int = 10_000) -> SocketSubscriber:
+        return SocketSubscriber(self.topic, name, directory=self.directory, maxsize=maxsize)
+
+    def consume(self) -> Iterator[Event]:
+        subscriber = self.subscribe(f"consume-{socket.gethostname()}-{os.getpid()}-{id(self):x}")
+        try:
+            for record in subscriber:
+                yield Event(type=str(record.pop("type", "unknown")), payload=record)
+        finally:
+            subscriber.close()
+
+    def flush(self) -> None:
+        if self.tee is not None:
+            self.tee.flush()
+
+    def close(self) -> None:
+        if self.tee is not None:
+            self.tee.close()
+        self._sock.close()
+
+    def __enter__(self) -> "SocketEventBus":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+__all__ = ["SocketEventBus", "SocketSubscriber", "socket_dir"]
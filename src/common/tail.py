@@ -0,0 +1,397 @@
+"""Follow append-only event logs without polling loops.
+
+``LogTailer`` keeps one open handle and a byte offset per log, wakes up on
+inotify notifications for the log's directory (falling back to a short sleep on
+platforms without inotify), and survives truncation and rotation: when the path
+is replaced, the old handle is drained to EOF before the new file is opened.
+
+Records are framed and decoded by the codec announced in each file's header
+(see ``common.codec``); header-less files are newline-delimited JSON.
+
+Logs rolled by ``SegmentWriter`` carry a manifest; their offsets are logical
+(bytes since the first segment), so a tailer walks sealed segments in order and
+then follows the active file without ever restarting from zero.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple, Union
+
+from .codec import HEADER_SIZE, Codec, codec_from_header
+from .segments import SegmentManifest, manifest_path, segment_lock
+
+LOGGER = logging.getLogger(__name__)
+
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_EVENT_HEADER = struct.Struct("iIII")
+
+_LIBC: Any = None
+_NO_LOCK = contextlib.nullcontext()
+
+
+def _libc() -> Any:
+    global _LIBC
+    if _LIBC is None:
+        try:
+            lib = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            lib.inotify_init1  # noqa: B018 - probe for the symbol
+            _LIBC = lib
+        except (OSError, AttributeError):
+            _LIBC = False
+    return _LIBC
+
+
+class _DirectoryWatch:
+    """inotify watch on one directory, filtered to names starting with ``prefix``."""
+
+    def __init__(self, directory: Path, prefix: str) -> None:
+        self.prefix = prefix.encode()
+        self.fd = -1
+        libc = _libc()
+        if not libc:
+            return
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            return
+        wd = libc.inotify_add_watch(fd, os.fsencode(str(directory)), _WATCH_MASK)
+        if wd < 0:
+            os.close(fd)
+            return
+        self.fd = fd
+
+    @property
+    def active(self) -> bool:
+        return self.fd >= 0
+
+    def wait(self, timeout: float) -> bool:
+        """Block until a matching event arrives or ``timeout`` elapses."""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            try:
+                readable, _, _ = select.select([self.fd], [], [], remaining)
+            except InterruptedError:  # pragma: no cover - signal during select
+                continue
+            if not readable:
+                return False
+            if self._drain():
+                return True
+
+    def _drain(self) -> bool:
+        matched = False
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return matched
+            except OSError as exc:  # pragma: no cover - fd closed underneath us
+                if exc.errno == errno.EBADF:
+                    return True
+                raise
+            pos = 0
+            while pos + _EVENT_HEADER.size <= len(data):
+                _, _, _, name_len = _EVENT_HEADER.unpack_from(data, pos)
+                name = data[pos + _EVENT_HEADER.size : pos + _EVENT_HEADER.size + name_len].rstrip(b"\0")
+                if name.startswith(self.prefix):
+                    matched = True
+                pos += _EVENT_HEADER.size + name_len
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def _detect(fh: Any) -> Optional[Codec]:
+    return codec_from_header(os.pread(fh.fileno(), HEADER_SIZE, 0))
+
+
+class LogTailer:
+    """Iterates records appended to an event log.
+
+    ``offset`` is the byte position just past the last record handed out, so a
+    caller can persist it and later resume with ``LogTailer(path, offset=...)``.
+    """
+
+    def __init__(
+        self,
+        path: Union[Path, str],
+        *,
+        offset: int = 0,
+        poll_interval: float = 1.0,
+        fallback_interval: float = 0.1,
+        codec: Optional[Codec] = None,
+        chunk_size: int = 256 * 1024,
+    ) -> None:
+        self.path = Path(path)
+        self.offset = offset
+        self.poll_interval = poll_interval
+        self.fallback_interval = fallback_interval
+        self.codec = codec
+        self._codec = codec
+        self.chunk_size = chunk_size
+        self._fh: Optional[Any] = None
+        self._inode: Optional[Tuple[int, int]] = None
+        self._buffer = b""
+        self._read_pos = offset
+        self._base = 0
+        self._sealed = False
+        self._pending: Deque[Tuple[int, Dict[str, Any]]] = deque()
+        self._watch: Optional[_DirectoryWatch] = None
+
+    # -- file handling -------------------------------------------------
+    def _segmented(self) -> bool:
+        return manifest_path(self.path).exists()
+
+    def _locate(self) -> Tuple[Path, int, bool]:
+        manifest = SegmentManifest.load(self.path)
+        if manifest is None:
+            return self.path, 0, False
+        if self._read_pos < manifest.start_offset:
+            LOGGER.warning(
+                "%s offset %d was removed by retention; resuming at %d",
+                self.path,
+                self._read_pos,
+                manifest.start_offset,
+            )
+            self._read_pos = self.offset = manifest.start_offset
+            self._buffer = b""
+        return manifest.locate(self.path, self._read_pos)
+
+    def _open(self) -> bool:
+        with segment_lock(self.path, exclusive=False) if self._segmented() else _NO_LOCK:
+            target, base, sealed = self._locate()
+            try:
+                fh = target.open("rb")
+            except FileNotFoundError:
+                return False
+        codec = self.codec or _detect(fh)
+        if codec is None:  # header not fully written yet
+            fh.close()
+            return False
+        self._codec = codec
+        stat = os.fstat(fh.fileno())
+        if stat.st_size < self._read_pos - base:
+            LOGGER.info("%s is shorter than offset %d; restarting from %d", self.path, self._read_pos, base)
+            self._read_pos = self.offset = base
+            self._buffer = b""
+        skip = len(codec.header) - (self._read_pos - base)
+        if skip > 0 and not self._buffer:
+            self._read_pos += skip
+            self.offset = max(self.offset, self._read_pos)
+        fh.seek(self._read_pos - base)
+        self._fh = fh
+        self._base = base
+        self._sealed = sealed
+        self._inode = (stat.st_dev, stat.st_ino)
+        return True
+
+    def _close_file(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+        self._fh = None
+        self._inode = None
+
+    def _reset(self) -> None:
+        self._close_file()
+        self._buffer = b""
+        self._read_pos = 0
+        self._base = 0
+        self.offset = 0
+
+    def _replaced(self) -> bool:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return False
+        return (stat.st_dev, stat.st_ino) != self._inode
+
+    def _read_chunks(self) -> None:
+        assert self._fh is not None
+        size = os.fstat(self._fh.fileno()).st_size
+        if size < self._read_pos - self._base:
+            LOGGER.info("%s was truncated; restarting from 0", self.path)
+            self._fh.seek(0)
+            self._buffer = b""
+            self._read_pos = self._base
+            self._pending.clear()
+        while True:
+            chunk = self._fh.read(self.chunk_size)
+            if not chunk:
+                return
+            self._read_pos += len(chunk)
+            self._buffer += chunk
+            self._split()
+
+    def _split(self) -> None:
+        assert self._codec is not None
+        consumed_base = self._read_pos - len(self._buffer)
+        frames, consumed = self._codec.frames(self._buffer)
+        for end, payload in frames:
+            if payload is None:
+                LOGGER.warning("Skipping corrupt frame in %s ending at %d", self.path, consumed_base + end)
+                continue
+            try:
+                record = self._codec.decode(payload)
+            except ValueError:
+                LOGGER.warning("Skipping malformed entry in %s: %r", self.path, payload[:200])
+                continue
+            self._pending.append((consumed_base + end, record))
+        self._buffer = self._buffer[consumed:]
+
+    def _ensure_watch(self) -> bool:
+        if self._watch is None:
+            if not self.path.parent.exists():
+                return False
+            self._watch = _DirectoryWatch(self.path.parent, self.path.name)
+        return True
+
+    def _fill(self) -> None:
+        self._ensure_watch()
+        if self._fh is None and not self._open():
+            return
+        while True:
+            self._read_chunks()
+            if self._sealed:  # sealed segments never grow; move on to the next one
+                self._close_file()
+            elif self._replaced():
+                self._read_chunks()  # anything appended before the rename
+                if self._segmented():
+                    self._close_file()
+                else:
+                    LOGGER.info("%s was rotated; following the new file", self.path)
+                    self._reset()
+            else:
+                return
+            if not self._open():
+                return
+
+    # -- public API ----------------------------------------------------
+    @property
+    def file_id(self) -> Optional[Tuple[int, int]]:
+        """``(st_dev, st_ino)`` of the file currently being followed."""
+        return self._inode
+
+    @property
+    def backlog(self) -> int:
+        """Records already read from the log but not yet handed out."""
+        return len(self._pending)
+
+    def read_available(self) -> List[Dict[str, Any]]:
+        """Return every complete record written since the last call."""
+        if not self._pending:
+            self._fill()
+        records = [record for _, record in self._pending]
+        if self._pending:
+            self.offset = self._pending[-1][0]
+        self._pending.clear()
+        return records
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Sleep until the log directory reports a change (or ``timeout``)."""
+        timeout = self.poll_interval if timeout is None else timeout
+        if not self._ensure_watch():
+            time.sleep(timeout)
+            return False
+        assert self._watch is not None
+        if not self._watch.active:
+            time.sleep(min(timeout, self.fallback_interval))
+            return False
+        return self._watch.wait(timeout)
+
+    def next_record(self) -> Optional[Dict[str, Any]]:
+        """Return the next record without blocking, or ``None`` if caught up."""
+        if not self._pending:
+            self._fill()
+        if not self._pending:
+            return None
+        end, record = self._pending.popleft()
+        self.offset = end
+        return record
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        while True:
+            record = self.next_record()
+            if record is None:
+                self.wait()
+                continue
+            yield record
+
+    def close(self) -> None:
+        self._close_file()
+        if self._watch is not None:
+            self._watch.close()
+            self._watch = None
+
+
+def _last_payloads(path: Path, count: int, block_size: int) -> Tuple[Optional[Codec], List[bytes]]:
+    try:
+        fh = path.open("rb")
+    except FileNotFoundError:
+        return None, []
+    with fh:
+        codec = _detect(fh)
+        if codec is None or count <= 0:
+            return codec, []
+        end = fh.seek(0, os.SEEK_END)
+        return codec, codec.last_payloads(fh, len(codec.header), end, count, block_size)
+
+
+def read_last_records(
+    path: Union[Path, str],
+    count: int,
+    *,
+    block_size: int = 64 * 1024,
+) -> List[Any]:
+    """Decode the newest ``count`` records of a log, oldest first.
+
+    Reads backwards from the end of the active file (and earlier segments when
+    it holds fewer than ``count`` records), so the cost does not depend on how
+    large the log has grown.
+    """
+    path = Path(path)
+    files = [path]
+    manifest = SegmentManifest.load(path)
+    if manifest is not None:
+        files += [path.with_name(segment.file) for segment in reversed(manifest.segments)]
+    batches: List[Tuple[Codec, List[bytes]]] = []
+    found = 0
+    for target in files:
+        if found >= count:
+            break
+        codec, payloads = _last_payloads(target, count - found, block_size)
+        if codec is not None and payloads:
+            batches.append((codec, payloads))
+            found += len(payloads)
+    records = []
+    for codec, payloads in reversed(batches):
+        for payload in payloads:
+            try:
+                records.append(codec.decode(payload))
+            except ValueError:
+                LOGGER.debug("Skipping malformed entry in %s", path)
+    return records
+
+
+__all__ = ["LogTailer", "read_last_records"]
@@ -0,0 +1,67 @@
+"""Pick the event-bus transport for a service from ``EVENT_BUS_TRANSPORT``.
+
+``file`` (default) keeps the append-only logs; ``socket`` publishes over Unix
+domain sockets (``common.socket_bus``), one topic per log file, and still
+tees to the log (the exporter, healthcheck and UI read it) unless
+``EVENT_BUS_TEE=0``.  Socket consumers do not checkpoint:
+whatever is published while a consumer is down is not replayed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+from pathlib import Path
+from typing import Any, Union
+
+from .consumer import DurableConsumer
+from .event_bus import FileEventBus
+from .socket_bus import SocketEventBus, SocketSubscriber
+from .tail import LogTailer
+
+TRANSPORTS = ("file", "socket")
+
+
+def bus_transport() -> str:
+    transport = os.getenv("EVENT_BUS_TRANSPORT", "file").lower()
+    if transport not in TRANSPORTS:
+        raise ValueError(f"Unknown EVENT_BUS_TRANSPORT {transport!r}; expected one of {TRANSPORTS}")
+    return transport
+
+
+def _tee_enabled() -> bool:
+    return os.getenv("EVENT_BUS_TEE", "1").lower() not in {"0", "false", "no"}
+
+
+def log_topic(log_path: Union[Path, str]) -> str:
+    """Socket topic for one log file: ``<dir>-<file>`` plus a hash of its resolved path.
+
+    The hash keeps logs sharing a directory or a directory basename apart;
+    the readable prefix is capped so socket paths stay short.
+    """
+    log_path = Path(log_path)
+    digest = hashlib.sha1(str(log_path.resolve()).encode("utf-8")).hexdigest()[:12]
+    prefix = re.sub(r"[^A-Za-z0-9_.-]", "_", f"{log_path.parent.name}-{log_path.name}")[:40]
+    return f"{prefix}-{digest}"
+
+
+def build_event_bus(path: Union[Path, str], filename: str = "events.log", **kwargs: Any) -> Any:
+    """``FileEventBus`` or ``SocketEventBus`` for the log ``<path>/<filename>``."""
+    if bus_transport() == "file":
+        return FileEventBus(path, filename, **kwargs)
+    tee = FileEventBus(path, filename, **kwargs) if _tee_enabled() else None
+    return SocketEventBus(log_topic(Path(path) / filename), tee=tee, codec=kwargs.get("codec"))
+
+
+def build_event_consumer(log_path: Union[Path, str], name: str, *, durable: bool = True, **kwargs: Any) -> Any:
+    """Reader for the log at ``log_path`` (``DurableConsumer``/``LogTailer``/``SocketSubscriber``)."""
+    log_path = Path(log_path)
+    if bus_transport() == "socket":
+        return SocketSubscriber(log_topic(log_path), name)
+    if durable:
+        return DurableConsumer(log_path, name, **kwargs)
+    return LogTailer(log_path, **kwargs)
+
+
+__all__ = ["build_event_bus", "build_event_consumer", "bus_transport", "log_topic"]
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 import os
 import time
 from pathlib import Path
@@ -8,6 +7,8 @@ from typing import Dict
 
 from prometheus_client import Counter, Gauge, start_http_server
 
+from common.tail import read_last_records
+
 INGEST_FPS = Gauge("ingest_fps", "Ingest frames per second", ["camera"])
 DETECT_LATENCY = Gauge("detect_latency_ms", "Detector latency by use case", ["usecase"])
 DETECT_LATENCY_BY_MODEL = Gauge(
@@ -28,9 +29,7 @@ def count_events(path: Path) -> Dict[str, int]:
     pose_counts: Dict[str, int] = {}
     if not path.exists():
         return pose_counts
-    lines = path.read_text(encoding="utf-8").splitlines()
-    for line in lines[-50:]:
-        event = json.loads(line)
+    for event in read_last_records(path, 50):
         event_type = event.get("type", "unknown")
         EVENT_COUNT.labels(type=event_type).inc()
         if event_type in {"pose", "pose_velocity"}:
@@ -45,29 +44,52 @@ def count_events(path: Path) -> Dict[str, int]:
     return pose_counts
 
 
-def read_latest_frame_index(path: Path, key: str) -> int:
+def read_latest_frame_index(path: Path, key: str, window: int = 50) -> int:
     if not path.exists():
         return 0
     try:
-        lines = path.read_text(encoding="utf-8").splitlines()
+        records = read_last_records(path, window)
     except OSError:
         return 0
-    for line in reversed(lines):
-        if not line.strip():
-            continue
-        try:
-            payload = json.loads(line)
-        except json.JSONDecodeError:
-            continue
+    for payload in reversed(records):
         value = payload.get(key)
         if isinstance(value, int):
             return value
     return 0
 
 
+def read_dropped_frames(path: Path, window: int = 500) -> Dict[str, int]:
+    """Latest cumulative ``dropped_frames`` per camera from the frames log."""
+    totals: Dict[str, int] = {}
+    if not path.exists():
+        return totals
+    try:
+        records = read_last_records(path, window)
+    except OSError:
+        return totals
+    for payload in reversed(records):
+        camera = payload.get("camera_id")
+        value = payload.get("dropped_frames")
+        if camera is None or not isinstance(value, int) or camera in totals:
+            continue
+        totals[camera] = value
+    return totals
+
+
+def update_drop_counter(totals: Dict[str, int], seen: Dict[str, int]) -> None:
+    """Advance DROP_FRAMES by the growth of each camera's cumulative count."""
+    for camera, total in totals.items():
+        previous = seen.get(camera, 0)
+        delta = total - previous if total >= previous else total  # ingest restarted
+        if delta > 0:
+            DROP_FRAMES.inc(delta)
+        seen[camera] = total
+
+
 def main() -> None:
     port = int(os.getenv("PROMETHEUS_SCRAPE_PORT", "9100"))
     start_http_server(port)
+    dropped_seen: Dict[str, int] = {}
     while True:
         INGEST_FPS.labels(camera="CAM01").set(25)
         DETECT_LATENCY.labels(usecase="trespassing_on_track").set(8.0)
@@ -79,6 +101,7 @@ def main() -> None:
         frames_idx = read_latest_frame_index(Path("artifacts/ingest/frames.log"), "frame_index")
         processed_idx = read_latest_frame_index(Path("artifacts/detections/events.log"), "frame_index")
         FRAME_QUEUE_DEPTH.set(max(0, frames_idx - processed_idx))
+        update_drop_counter(read_dropped_frames(Path("artifacts/ingest/frames.log")), dropped_seen)
         time.sleep(5)
 
 
@@ -1,10 +1,9 @@
 from __future__ import annotations
 
-import json
 import sys
-from pathlib import Path
 
 from src.common.config import ensure_dir
+from src.common.tail import read_last_records
 
 
 def main() -> None:
@@ -13,10 +12,10 @@ def main() -> None:
     if not events.exists():
         print("no events yet", file=sys.stderr)
         sys.exit(1)
-    *_, last = events.read_text(encoding="utf-8").strip().splitlines()
-    if not last:
+    records = read_last_records(events, 1)
+    if not records:
         sys.exit(1)
-    data = json.loads(last)
+    data = records[-1]
     if "frame_index" not in data:
         sys.exit(1)
     print("ok")
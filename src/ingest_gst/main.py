@@ -3,13 +3,19 @@ from __future__ import annotations
 import argparse
 import logging
 import os
+import queue
+import re
+import threading
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
 
 from src.common.config import load_yaml
-from src.common.event_bus import Event, FileEventBus
+from src.common.event_bus import Event
+from src.common.frame_ring import FrameRing
+from src.common.transport import build_event_bus
 
-from .pipeline import capture_rtsp, capture_webcam, synthetic_frames
+from .pipeline import Frame
+from .workers import CameraWorker
 
 logging.basicConfig(level=logging.INFO, format="[%(asctime)s] %(levelname)s %(message)s")
 LOGGER = logging.getLogger("ingest")
@@ -23,68 +29,131 @@ def normalize_source(source: str) -> str:
     return source
 
 
-def resolve_camera(
+def resolve_cameras(
     camera_config: Path | None,
     source: str | None,
     *,
     camera_id: str,
     camera_name: str | None,
     fps_limit: int | None,
-) -> Dict[str, Any]:
+) -> List[Dict[str, Any]]:
     if source:
-        return {
-            "id": camera_id,
-            "name": camera_name or camera_id,
-            "rtsp_url": normalize_source(source),
-            "fps_limit": fps_limit or 25,
-        }
+        return [
+            {
+                "id": camera_id,
+                "name": camera_name or camera_id,
+                "rtsp_url": normalize_source(source),
+                "fps_limit": fps_limit or 25,
+            }
+        ]
     if camera_config is None:
         raise RuntimeError("Provide --source or --camera-config.")
     config = load_yaml(camera_config) or {}
-    cameras = config.get("cameras") or []
-    if not cameras:
+    entries = config.get("cameras") or []
+    if not entries:
         raise RuntimeError(f"No cameras found in {camera_config}")
-    camera = dict(cameras[0])
-    camera.setdefault("id", camera_id)
-    if camera_name:
-        camera["name"] = camera_name
-    if fps_limit is not None:
-        camera["fps_limit"] = fps_limit
-    return camera
+    cameras: List[Dict[str, Any]] = []
+    for position, entry in enumerate(entries, start=1):
+        camera = dict(entry)
+        camera.setdefault("id", camera_id if len(entries) == 1 else f"CAM{position:02d}")
+        if camera_name and len(entries) == 1:
+            camera["name"] = camera_name
+        if fps_limit is not None:
+            camera["fps_limit"] = fps_limit
+        cameras.append(camera)
+    ids = [str(camera["id"]) for camera in cameras]
+    if len(set(ids)) != len(ids):
+        raise RuntimeError(f"Duplicate camera ids in {camera_config}: {ids}")
+    return cameras
 
 
-def run(camera: Dict[str, Any], output_dir: Path, *, log_path: Path | None = None, persist_frames: bool = False) -> None:
+def parse_shape(value: str) -> Tuple[int, int, int]:
+    """Parse ``HxW`` or ``HxWxC`` into a frame shape tuple."""
+    parts = [int(part) for part in value.lower().split("x") if part]
+    if len(parts) == 2:
+        parts.append(3)
+    if len(parts) != 3 or min(parts) <= 0:
+        raise ValueError(f"Invalid frame shape: {value}")
+    return parts[0], parts[1], parts[2]
+
+
+def ring_name(camera_id: str) -> str:
+    return "aixavier_" + re.sub(r"[^A-Za-z0-9_]", "_", camera_id)
+
+
+def open_frame_ring(
+    camera_id: str, *, slots: int, max_shape: Tuple[int, int, int]
+) -> Optional[FrameRing]:
+    try:
+        ring = FrameRing.create(ring_name(camera_id), slots=slots, max_shape=max_shape)
+    except (OSError, ValueError) as exc:
+        LOGGER.warning("Shared-memory frame ring unavailable (%s); using frame files.", exc)
+        return None
+    LOGGER.info("Publishing frames for %s via shared memory ring %s (%d slots)", camera_id, ring.name, slots)
+    return ring
+
+
+def run(
+    cameras: List[Dict[str, Any]],
+    output_dir: Path,
+    *,
+    log_path: Path | None = None,
+    persist_frames: bool = False,
+    transport: str = "shm",
+    ring_slots: int = 8,
+    ring_max_shape: Tuple[int, int, int] = (1080, 1920, 3),
+    queue_size: int = 64,
+) -> None:
     output_dir.mkdir(parents=True, exist_ok=True)
-    fps_limit = int(camera.get("fps_limit", 25))
-    rtsp_url = camera.get("rtsp_url")
     bus_path = log_path or (output_dir / "frames.log")
     bus_path.parent.mkdir(parents=True, exist_ok=True)
-    bus = FileEventBus(bus_path.parent, filename=bus_path.name)
-    LOGGER.info("Starting ingest stream", extra={"camera": camera.get("id")})
-    if not rtsp_url or rtsp_url.startswith("demo://"):
-        generator = synthetic_frames(output_dir, fps=fps_limit, persist=persist_frames)
-    elif rtsp_url.startswith("webcam://"):
-        try:
-            index = int(rtsp_url.split("://", 1)[1])
-        except ValueError as exc:  # pragma: no cover - invalid string
-            raise RuntimeError(f"Invalid webcam URL: {rtsp_url}") from exc
-        generator = capture_webcam(index, output_dir, fps_limit, persist=persist_frames)
-    else:
-        generator = capture_rtsp(rtsp_url, output_dir, fps_limit, persist=persist_frames)
-    for frame in generator:
-        bus.publish(
-            Event(
-                type="frame",
-                payload={
-                    "camera_id": camera.get("id", "CAM01"),
-                    "frame_index": frame.index,
-                    "timestamp": frame.timestamp,
-                    "path": str(frame.path),
-                    "persist": frame.persist,
-                },
-            )
-        )
-        LOGGER.debug("Captured frame %s", frame.index)
+    bus = build_event_bus(bus_path.parent, filename=bus_path.name)
+    stop = threading.Event()
+    camera_rings: List[Optional[FrameRing]] = []
+    for camera in cameras:
+        ring = None
+        if transport == "shm" and not persist_frames:
+            ring = open_frame_ring(str(camera.get("id", "CAM01")), slots=ring_slots, max_shape=ring_max_shape)
+        camera_rings.append(ring)
+    rings = [ring for ring in camera_rings if ring is not None]
+    if rings:
+        # Workers write a ring slot before queueing its record; a longer queue
+        # would publish records whose slots were already overwritten.
+        queue_size = min(queue_size, ring_slots)
+    frames: "queue.Queue[Tuple[Dict[str, Any], Frame]]" = queue.Queue(maxsize=queue_size)
+    workers: List[CameraWorker] = []
+    for camera, ring in zip(cameras, camera_rings):
+        camera_id = str(camera.get("id", "CAM01"))
+        camera_dir = output_dir / camera_id if len(cameras) > 1 else output_dir
+        workers.append(CameraWorker(camera, camera_dir, frames, stop, persist=persist_frames, ring=ring))
+    LOGGER.info("Starting ingest for %d camera(s): %s", len(workers), ", ".join(w.camera_id for w in workers))
+    for worker in workers:
+        worker.start()
+    try:
+        while any(worker.is_alive() for worker in workers):
+            try:
+                camera, frame = frames.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            payload: Dict[str, Any] = {
+                "camera_id": camera.get("id", "CAM01"),
+                "frame_index": frame.index,
+                "timestamp": frame.timestamp,
+                "persist": frame.persist,
+                "dropped_frames": frame.dropped,
+            }
+            if frame.ring is not None:
+                payload.update(frame.ring)
+            else:
+                payload["path"] = str(frame.path)
+            bus.publish(Event(type="frame", payload=payload))
+            LOGGER.debug("Captured frame %s from %s", frame.index, payload["camera_id"])
+    finally:
+        stop.set()
+        for worker in workers:
+            worker.join(timeout=2.0)
+        for ring in rings:
+            ring.close()
 
 
 def main() -> None:
@@ -92,7 +161,10 @@ def main() -> None:
     parser.add_argument(
         "--camera-config",
         default=os.getenv("CAMERA_CONFIG", "configs/cameras.yaml"),
-        help="Path to cameras YAML (defaults to $CAMERA_CONFIG or configs/cameras.yaml when --source not provided).",
+        help=(
+            "Path to cameras YAML; every listed camera is captured on its own thread "
+            "(defaults to $CAMERA_CONFIG or configs/cameras.yaml when --source not provided)."
+        ),
     )
     parser.add_argument(
         "--source",
@@ -101,7 +173,7 @@ def main() -> None:
     parser.add_argument(
         "--camera-id",
         default=os.getenv("CAMERA_ID", "CAM01"),
-        help="Camera ID used when emitting frames (default: %(default)s).",
+        help="Camera ID used when emitting frames from --source or a single-camera config (default: %(default)s).",
     )
     parser.add_argument(
         "--camera-name",
@@ -110,7 +182,7 @@ def main() -> None:
     parser.add_argument(
         "--fps",
         type=int,
-        help="FPS cap override applied to the selected source.",
+        help="FPS cap override applied to every camera.",
     )
     parser.add_argument(
         "--output",
@@ -133,10 +205,27 @@ def main() -> None:
         action="store_true",
         help="Persist captured frames on disk (off by default; files are deleted after consumption).",
     )
+    parser.add_argument(
+        "--transport",
+        choices=("shm", "file"),
+        default=os.getenv("INGEST_FRAME_TRANSPORT", "shm"),
+        help="Frame hand-off: shared-memory ring or JPEG files (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--ring-slots",
+        type=int,
+        default=int(os.getenv("INGEST_RING_SLOTS", "8")),
+        help="Number of frame slots in the shared-memory ring (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--ring-max-shape",
+        default=os.getenv("INGEST_RING_MAX_SHAPE", "1080x1920x3"),
+        help="Largest frame (HxWxC) a ring slot holds; bigger frames fall back to files.",
+    )
     args = parser.parse_args()
 
     camera_cfg = Path(args.camera_config).resolve() if args.camera_config and not args.source else None
-    camera = resolve_camera(
+    cameras = resolve_cameras(
         camera_cfg,
         args.source,
         camera_id=args.camera_id,
@@ -145,10 +234,13 @@ def main() -> None:
     )
     log_path = Path(args.log_path).resolve() if args.log_path else None
     run(
-        camera,
+        cameras,
         Path(args.output).resolve(),
         log_path=log_path,
         persist_frames=bool(args.save_frames),
+        transport=args.transport,
+        ring_slots=args.ring_slots,
+        ring_max_shape=parse_shape(args.ring_max_shape),
     )
 
 
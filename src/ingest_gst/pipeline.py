@@ -1,28 +1,57 @@
 from __future__ import annotations
 
+import threading
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterator
+from typing import Any, Dict, Iterator, Optional, Tuple
 
 import cv2
 import numpy as np
 
 from src.common.config import ensure_dir
+from src.common.frame_ring import FrameRing
 
 
 @dataclass
 class Frame:
     index: int
     timestamp: float
-    path: Path
+    path: Optional[Path] = None
     persist: bool = False
+    ring: Optional[Dict[str, Any]] = None
+    dropped: int = 0
 
 
-def synthetic_frames(output_dir: Path, fps: int = 25, persist: bool = False) -> Iterator[Frame]:
+def emit_frame(
+    image: np.ndarray,
+    index: int,
+    timestamp: float,
+    output_dir: Path,
+    *,
+    persist: bool = False,
+    ring: Optional[FrameRing] = None,
+) -> Frame:
+    """Hand a decoded frame to consumers via the shared ring, or JPEG on disk."""
+    if ring is not None and not persist and ring.fits(image):
+        slot = ring.write(image, frame_index=index, timestamp=timestamp)
+        return Frame(index=index, timestamp=timestamp, ring=slot)
+    path = output_dir / f"frame_{index:06d}.jpg"
+    cv2.imwrite(str(path), image)
+    return Frame(index=index, timestamp=timestamp, path=path, persist=persist)
+
+
+def synthetic_frames(
+    output_dir: Path,
+    fps: int = 25,
+    persist: bool = False,
+    ring: Optional[FrameRing] = None,
+    *,
+    start_index: int = 0,
+) -> Iterator[Frame]:
     """Generate alternating color frames for demo mode."""
     ensure_dir(output_dir)
-    frame_idx = 0
+    frame_idx = start_index
     colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255)]
     base = np.zeros((1080, 1920, 3), dtype=np.uint8)
     while True:
@@ -39,60 +68,158 @@ def synthetic_frames(output_dir: Path, fps: int = 25, persist: bool = False) ->
             4,
         )
         ts = time.time()
-        path = output_dir / f"frame_{frame_idx:06d}.jpg"
-        cv2.imwrite(str(path), frame)
-        yield Frame(index=frame_idx, timestamp=ts, path=path, persist=persist)
+        yield emit_frame(frame, frame_idx, ts, output_dir, persist=persist, ring=ring)
         frame_idx += 1
         time.sleep(1.0 / fps)
 
 
-def capture_rtsp(rtsp_url: str, output_dir: Path, fps_limit: int = 25, persist: bool = False) -> Iterator[Frame]:
+class LatestFrameGrabber(threading.Thread):
+    """Drains a capture on its own thread and keeps only the newest frame.
+
+    Every packet is ``grab()``-ed so OpenCV's internal buffer never backs up, but
+    ``retrieve()`` (the decode/convert step) only runs when the publisher is due a
+    frame at ``fps_limit``.  Grabbed-but-not-retrieved frames and retrieved frames
+    overwritten before the publisher took them are counted in ``dropped``.
+    Non-live sources (video files) are paced to ``fps_limit`` instead of dropped.
+    """
+
+    def __init__(
+        self,
+        cap: Any,
+        *,
+        label: str,
+        fps_limit: int = 25,
+        max_read_failures: int = 10,
+        live: bool = True,
+    ) -> None:
+        super().__init__(name=f"grab-{label}", daemon=True)
+        self.cap = cap
+        self.label = label
+        self.period = 1.0 / fps_limit if fps_limit else 0.0
+        self.max_read_failures = max_read_failures
+        self.live = live
+        self.dropped = 0
+        self.error: Optional[str] = None
+        self._cond = threading.Condition()
+        self._latest: Optional[Tuple[np.ndarray, float]] = None
+        self._halt = threading.Event()
+
+    def run(self) -> None:
+        failures = 0
+        next_due = 0.0
+        try:
+            while not self._halt.is_set():
+                if not self.live and next_due > time.time():
+                    self._halt.wait(next_due - time.time())
+                    continue
+                if not self.cap.grab():
+                    failures += 1
+                    if failures >= self.max_read_failures:
+                        self.error = f"Lost {self.label} after {failures} failed reads"
+                        break
+                    time.sleep(0.5)
+                    continue
+                failures = 0
+                now = time.time()
+                if now < next_due:
+                    self.dropped += 1
+                    continue
+                ok, image = self.cap.retrieve()
+                if not ok or image is None:
+                    continue
+                next_due += self.period
+                if next_due < now:
+                    next_due = now + self.period
+                with self._cond:
+                    if self._latest is not None:
+                        self.dropped += 1
+                    self._latest = (image, now)
+                    self._cond.notify()
+        finally:
+            self.cap.release()
+            with self._cond:
+                self._cond.notify_all()
+
+    def get(self, timeout: float = 1.0) -> Optional[Tuple[np.ndarray, float]]:
+        """Return the newest unread frame, waiting up to ``timeout`` seconds."""
+        with self._cond:
+            if self._latest is None and self.is_alive():
+                self._cond.wait(timeout)
+            latest, self._latest = self._latest, None
+        if latest is None and not self.is_alive():
+            raise RuntimeError(self.error or f"Capture {self.label} stopped")
+        return latest
+
+    def stop(self) -> None:
+        self._halt.set()
+
+
+def _capture(
+    cap: Any,
+    label: str,
+    output_dir: Path,
+    fps_limit: int,
+    persist: bool,
+    ring: Optional[FrameRing],
+    start_index: int,
+    max_read_failures: int,
+    live: bool = True,
+) -> Iterator[Frame]:
+    grabber = LatestFrameGrabber(
+        cap, label=label, fps_limit=fps_limit, max_read_failures=max_read_failures, live=live
+    )
+    grabber.start()
+    frame_idx = start_index
+    try:
+        while True:
+            latest = grabber.get()
+            if latest is None:
+                continue
+            image, ts = latest
+            frame = emit_frame(image, frame_idx, ts, output_dir, persist=persist, ring=ring)
+            frame.dropped = grabber.dropped
+            yield frame
+            frame_idx += 1
+    finally:
+        grabber.stop()
+
+
+def capture_rtsp(
+    rtsp_url: str,
+    output_dir: Path,
+    fps_limit: int = 25,
+    persist: bool = False,
+    ring: Optional[FrameRing] = None,
+    *,
+    start_index: int = 0,
+    max_read_failures: int = 10,
+) -> Iterator[Frame]:
     """Capture frames from RTSP using OpenCV."""
     ensure_dir(output_dir)
     cap = cv2.VideoCapture(rtsp_url)
     if not cap.isOpened():
         raise RuntimeError(f"Unable to open stream {rtsp_url}")
-    frame_idx = 0
-    last_ts = time.time()
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            time.sleep(1)
-            continue
-        ts = time.time()
-        if fps_limit:
-            dt = ts - last_ts
-            sleep_for = max(0, (1.0 / fps_limit) - dt)
-            if sleep_for > 0:
-                time.sleep(sleep_for)
-        path = output_dir / f"frame_{frame_idx:06d}.jpg"
-        cv2.imwrite(str(path), frame)
-        yield Frame(index=frame_idx, timestamp=ts, path=path, persist=persist)
-        frame_idx += 1
-        last_ts = ts
+    live = "://" in rtsp_url  # rtsp://, http://, ... ; bare paths are recorded files
+    return _capture(
+        cap, f"stream {rtsp_url}", output_dir, fps_limit, persist, ring, start_index, max_read_failures, live
+    )
 
 
-def capture_webcam(device_index: int, output_dir: Path, fps_limit: int = 25, persist: bool = False) -> Iterator[Frame]:
+def capture_webcam(
+    device_index: int,
+    output_dir: Path,
+    fps_limit: int = 25,
+    persist: bool = False,
+    ring: Optional[FrameRing] = None,
+    *,
+    start_index: int = 0,
+    max_read_failures: int = 10,
+) -> Iterator[Frame]:
     """Capture frames from a local webcam using OpenCV."""
     ensure_dir(output_dir)
     cap = cv2.VideoCapture(device_index)
     if not cap.isOpened():
         raise RuntimeError(f"Unable to open webcam index {device_index}")
-    frame_idx = 0
-    last_ts = time.time()
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            time.sleep(0.5)
-            continue
-        ts = time.time()
-        if fps_limit:
-            dt = ts - last_ts
-            sleep_for = max(0, (1.0 / fps_limit) - dt)
-            if sleep_for > 0:
-                time.sleep(sleep_for)
-        path = output_dir / f"frame_{frame_idx:06d}.jpg"
-        cv2.imwrite(str(path), frame)
-        yield Frame(index=frame_idx, timestamp=ts, path=path, persist=persist)
-        frame_idx += 1
-        last_ts = ts
+    return _capture(
+        cap, f"webcam {device_index}", output_dir, fps_limit, persist, ring, start_index, max_read_failures
+    )
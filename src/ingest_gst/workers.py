@@ -0,0 +1,101 @@
+"""Per-camera capture threads feeding one multiplexed frame queue."""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from src.common.frame_ring import FrameRing
+
+from .pipeline import Frame, capture_rtsp, capture_webcam, synthetic_frames
+
+LOGGER = logging.getLogger("ingest")
+
+
+def open_source(
+    camera: Dict[str, Any],
+    output_dir: Path,
+    *,
+    persist: bool = False,
+    ring: Optional[FrameRing] = None,
+    start_index: int = 0,
+) -> Iterator[Frame]:
+    fps_limit = int(camera.get("fps_limit", 25))
+    rtsp_url = camera.get("rtsp_url")
+    if not rtsp_url or rtsp_url.startswith("demo://"):
+        return synthetic_frames(output_dir, fps=fps_limit, persist=persist, ring=ring, start_index=start_index)
+    if rtsp_url.startswith("webcam://"):
+        try:
+            index = int(rtsp_url.split("://", 1)[1])
+        except ValueError as exc:  # pragma: no cover - invalid string
+            raise RuntimeError(f"Invalid webcam URL: {rtsp_url}") from exc
+        return capture_webcam(index, output_dir, fps_limit, persist=persist, ring=ring, start_index=start_index)
+    return capture_rtsp(rtsp_url, output_dir, fps_limit, persist=persist, ring=ring, start_index=start_index)
+
+
+class CameraWorker(threading.Thread):
+    """Owns one camera: opens it, reconnects with backoff, and queues frames."""
+
+    def __init__(
+        self,
+        camera: Dict[str, Any],
+        output_dir: Path,
+        frames: "queue.Queue[Tuple[Dict[str, Any], Frame]]",
+        stop: threading.Event,
+        *,
+        persist: bool = False,
+        ring: Optional[FrameRing] = None,
+        backoff_initial: float = 1.0,
+        backoff_max: float = 30.0,
+    ) -> None:
+        self.camera = camera
+        self.camera_id = str(camera.get("id", "CAM01"))
+        super().__init__(name=f"ingest-{self.camera_id}", daemon=True)
+        self.output_dir = output_dir
+        self.frames = frames
+        self.stop_event = stop
+        self.persist = persist
+        self.ring = ring
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.next_index = 0
+        self.reconnects = 0
+        self.dropped = 0
+
+    def run(self) -> None:
+        delay = self.backoff_initial
+        while not self.stop_event.is_set():
+            session_base = self.dropped
+            try:
+                source = open_source(
+                    self.camera,
+                    self.output_dir,
+                    persist=self.persist,
+                    ring=self.ring,
+                    start_index=self.next_index,
+                )
+                for frame in source:
+                    self.next_index = frame.index + 1
+                    self.dropped = session_base + frame.dropped
+                    frame.dropped = self.dropped
+                    delay = self.backoff_initial
+                    self.frames.put((self.camera, frame))
+                    if self.stop_event.is_set():
+                        break
+                else:
+                    LOGGER.warning("Camera %s source ended", self.camera_id)
+            except RuntimeError as exc:
+                LOGGER.warning("Camera %s unavailable: %s", self.camera_id, exc)
+            if self.stop_event.is_set():
+                break
+            self.reconnects += 1
+            LOGGER.info("Reconnecting camera %s in %.1fs", self.camera_id, delay)
+            if self.stop_event.wait(delay):
+                break
+            delay = min(delay * 2.0, self.backoff_max)
+
+
+__all__ = ["CameraWorker", "open_source"]
@@ -9,7 +9,8 @@ from pathlib import Path
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 
-from common.event_bus import Event, FileEventBus
+from common.event_bus import Event
+from common.transport import build_event_bus, build_event_consumer
 from .store import EmbeddingStore
 from common.config import load_yaml
 
@@ -20,7 +21,7 @@ app = FastAPI(title="FRS Service")
 store = EmbeddingStore(Path("artifacts/privacy/embeddings.json"))
 audit_path = Path("artifacts/privacy/frs_audit.log")
 audit_path.parent.mkdir(parents=True, exist_ok=True)
-tracker_bus = FileEventBus(Path("artifacts/tracker"))
+tracker_bus = build_event_bus(Path("artifacts/tracker"))
 frs_config = load_yaml("configs/frs/config.yaml")
 try:
     threshold = float(str(frs_config.get("threshold", "0.47")).strip("{}"))
@@ -55,35 +56,29 @@ def enroll(request: EnrollRequest) -> dict:
 
 
 async def frs_worker() -> None:
-    source = Path("artifacts/detections/events.log")
-    offset = 0
+    consumer = build_event_consumer(Path("artifacts/detections/events.log"), "privacy-frs")
     while True:
-        if not source.exists():
-            await asyncio.sleep(1)
+        events = consumer.read_available()
+        if not events:
+            await asyncio.to_thread(consumer.wait)
             continue
-        with source.open("r", encoding="utf-8") as fh:
-            fh.seek(offset)
-            for line in fh:
-                offset = fh.tell()
-                if not line.strip():
-                    continue
-                event = json.loads(line)
-                if event.get("type") != "embedding":
-                    continue
-                embedding = event.get("embedding")
-                match = store.match(embedding, threshold)
-                if match:
-                    tracker_bus.publish(
-                        Event(
-                            type="frs",
-                            payload={
-                                "camera_id": event.get("camera_id"),
-                                "identity": match["identity"],
-                                "score": match["score"],
-                            },
-                        )
+        for event in events:
+            if event.get("type") != "embedding":
+                continue
+            embedding = event.get("embedding")
+            match = store.match(embedding, threshold)
+            if match:
+                tracker_bus.publish(
+                    Event(
+                        type="frs",
+                        payload={
+                            "camera_id": event.get("camera_id"),
+                            "identity": match["identity"],
+                            "score": match["score"],
+                        },
                     )
-        await asyncio.sleep(0.5)
+                )
+        await asyncio.sleep(0)
 
 
 @app.on_event("startup")
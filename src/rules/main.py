@@ -1,12 +1,11 @@
 from __future__ import annotations
 
-import json
 import logging
-import time
 from pathlib import Path
 
 from common.config import env_or_default
-from common.event_bus import Event, FileEventBus
+from common.event_bus import Event
+from common.transport import build_event_bus, build_event_consumer
 
 from .engine import RuleEngine
 
@@ -14,22 +13,6 @@ logging.basicConfig(level=logging.INFO, format="[%(asctime)s] %(levelname)s %(me
 LOGGER = logging.getLogger("rules")
 
 
-def stream_events(source: Path):
-    offset = 0
-    while True:
-        if not source.exists():
-            time.sleep(1)
-            continue
-        with source.open("r", encoding="utf-8") as fh:
-            fh.seek(offset)
-            for line in fh:
-                offset = fh.tell()
-                if not line.strip():
-                    continue
-                yield json.loads(line)
-        time.sleep(0.2)
-
-
 def main() -> None:
     configs_dir = Path(env_or_default("RULES_DIR", "configs/usecases"))
     profile_config = Path(env_or_default("PROFILE_CONFIG", "configs/profile_demo.yaml"))
@@ -37,8 +20,8 @@ def main() -> None:
     LOGGER.info("Loading rule engine with profile %s", profile_config.name)
     engine = RuleEngine(configs_dir)
     source_log = Path("artifacts/tracker/events.log")
-    sink = FileEventBus(Path("artifacts/events"))
-    for event in stream_events(source_log):
+    sink = build_event_bus(Path("artifacts/events"))
+    for event in build_event_consumer(source_log, "rules"):
         for triggered in engine.evaluate(event):
             LOGGER.info("Triggered %s", triggered.type)
             sink.publish(Event(type=triggered.type, payload=triggered.payload))
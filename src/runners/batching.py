@@ -0,0 +1,131 @@
+"""In-process micro-batching for detector inference.
+
+``BatchInferenceServer`` accepts frames from any number of cameras, waits up to
+``max_wait_ms`` after the first queued frame for more to arrive (never more
+than ``max_batch``), runs them through ``detector.detect_batch`` as one batch
+and resolves each caller's future with that frame's detections.  With
+``arrays=True`` it calls ``detect_arrays_batch`` and futures resolve to
+``DetectionBatch`` objects instead of dict lists.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+LOGGER = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class BatchInferenceServer:
+    """Batches ``submit()`` calls from many producers into ``detect_batch`` runs."""
+
+    def __init__(
+        self, detector: Any, *, max_batch: int = 8, max_wait_ms: float = 5.0, arrays: bool = False
+    ) -> None:
+        if max_batch < 1:
+            raise ValueError("max_batch must be >= 1")
+        self.detector = detector
+        self.arrays = arrays
+        self._detect = detector.detect_arrays_batch if arrays else detector.detect_batch
+        self.max_batch = int(max_batch)
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        self.busy_seconds = 0.0
+
+    def start(self) -> "BatchInferenceServer":
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._serve, name="batch-inference", daemon=True)
+                self._thread.start()
+        return self
+
+    def submit(self, image: np.ndarray) -> "Future[Any]":
+        if self._thread is None:
+            self.start()
+        future: "Future[Any]" = Future()
+        self._queue.put((image, future))
+        return future
+
+    def infer(self, image: np.ndarray, timeout: Optional[float] = None) -> Any:
+        return self.submit(image).result(timeout)
+
+    @property
+    def mean_batch(self) -> float:
+        return self.items / self.batches if self.batches else 0.0
+
+    def stop(self, timeout: Optional[float] = 1.0) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+
+    def __enter__(self) -> "BatchInferenceServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    # -- worker --------------------------------------------------------
+    def _gather(self, first: Tuple[np.ndarray, Future]) -> Tuple[List[Tuple[np.ndarray, Future]], bool]:
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _serve(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch, stopping = self._gather(item)
+            batch = [(image, future) for image, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            start = time.monotonic()
+            try:
+                results = self._detect([image for image, _ in batch])
+            except Exception as exc:  # surface the failure to every waiting caller
+                LOGGER.exception("Batched inference failed for %d frames", len(batch))
+                for _, future in batch:
+                    future.set_exception(exc)
+                continue
+            finally:
+                self.busy_seconds += time.monotonic() - start
+            self.batches += 1
+            self.items += len(batch)
+            for (_, future), detections in zip(batch, results):
+                future.set_result(detections if self.arrays else list(detections))
+        # Fail anything still queued so callers do not wait forever.
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not _STOP and item[1].set_running_or_notify_cancel():
+                item[1].set_exception(RuntimeError("Batch inference server stopped"))
+
+
+__all__ = ["BatchInferenceServer"]
@@ -9,17 +9,18 @@ from typing import Any, Dict, Iterable, List, Optional, Tuple
 import cv2
 import numpy as np
 
+from src.common.detections import DetectionBatch
 from .postprocess import (
     normalise_object_output,
     normalise_pose_output,
-    nms,
     xywh_to_xyxy,
 )
+from .nms import NMS_MODES, batched_nms, nms
+from .preprocess import PAD_VALUE, Preprocessor
+from .sessions import SharedSession, acquire_session
 
 LOGGER = logging.getLogger(__name__)
 
-_ORT = None  # lazy-loaded onnxruntime module
-
 
 def _sync_session_dims(session: Any, input_w: int, input_h: int) -> Tuple[int, int]:
     """Derive spatial dimensions from ONNX model if available."""
@@ -43,6 +44,15 @@ def _sync_session_dims(session: Any, input_w: int, input_h: int) -> Tuple[int, i
     return inferred_w, inferred_h
 
 
+def _session_batch_dim(session: Any) -> Optional[int]:
+    """Fixed batch size of the model input, or ``None`` when it is dynamic."""
+    try:
+        dim = session.get_inputs()[0].shape[0]
+    except (IndexError, AttributeError, TypeError):
+        return None
+    return int(dim) if isinstance(dim, int) and dim > 0 else None
+
+
 def letterbox(
     image: np.ndarray, new_shape: Tuple[int, int]
 ) -> Tuple[np.ndarray, float, Tuple[int, int]]:
@@ -55,46 +65,11 @@ def letterbox(
     )
     top = int((new_h - resized.shape[0]) / 2)
     left = int((new_w - resized.shape[1]) / 2)
-    canvas = np.full((new_h, new_w, 3), 114, dtype=np.uint8)
+    canvas = np.full((new_h, new_w, 3), PAD_VALUE, dtype=np.uint8)
     canvas[top : top + resized.shape[0], left : left + resized.shape[1]] = resized
     return canvas, scale, (left, top)
 
 
-def load_onnx_session(model_path: Path) -> Optional[Any]:
-    global _ORT
-    if _ORT is None:
-        try:  # pragma: no cover - optional dependency
-            import onnxruntime as ort_mod
-        except Exception:
-            ort_mod = None
-        _ORT = ort_mod
-
-    if _ORT is None:
-        LOGGER.warning(
-            "onnxruntime not available; falling back to heuristic detections."
-        )
-        return None
-    if not model_path.exists():
-        LOGGER.warning(
-            "ONNX model %s not found; falling back to heuristic detections.", model_path
-        )
-        return None
-    providers = (
-        ["CUDAExecutionProvider", "CPUExecutionProvider"]
-        if "CUDAExecutionProvider" in _ORT.get_available_providers()
-        else ["CPUExecutionProvider"]
-    )
-    try:
-        return _ORT.InferenceSession(str(model_path), providers=providers)
-    except Exception as exc:  # pragma: no cover - runtime specific
-        LOGGER.error(
-            "Failed to load ONNX model %s (%s); falling back to heuristic detections.",
-            model_path,
-            exc,
-        )
-        return None
-
-
 @dataclass
 class Detection:
     bbox: Tuple[float, float, float, float]
@@ -112,13 +87,48 @@ class PoseDetection:
 
 class BaseDetector:
     event_type: str = "object"
+    # Pose detectors can take people from the object runner's cache instead.
+    reuse_object_cache: bool = False
+    object_cache_max_age: float = 0.0
+    session: Optional[SharedSession] = None
+    input_name: str = "images"
+    input_w: int
+    input_h: int
 
     def __init__(self, config: Dict[str, Any]) -> None:
         self.config = config
+        self._pre: Optional[Preprocessor] = None
 
     def detect(self, image: np.ndarray) -> Iterable[Dict[str, Any]]:
         raise NotImplementedError
 
+    def detect_arrays(self, image: np.ndarray, person_detections: Optional[Any] = None) -> DetectionBatch:
+        """Columnar variant of ``detect``; dict-only detectors are converted.
+
+        ``person_detections`` is only used by detectors that run on people.
+        """
+        return DetectionBatch.from_dicts(list(self.detect(image)))
+
+    def _run(self, feed: np.ndarray) -> List[Any]:
+        """One ``session.run`` of ``feed`` through the model's only input."""
+        if self.session is None:
+            raise RuntimeError(f"{type(self).__name__} has no ONNX session loaded")
+        return self.session.run(None, {self.input_name: feed})
+
+    def close(self) -> None:
+        """Release the model session back to the shared registry."""
+        session = getattr(self, "session", None)
+        if session is not None and hasattr(session, "release"):
+            session.release()
+        self.session = None
+
+    def _preprocessor(self) -> Preprocessor:
+        """Reusable input buffers, rebuilt if the model input size changes."""
+        pre = self._pre
+        if pre is None or (pre.width, pre.height) != (self.input_w, self.input_h):
+            pre = self._pre = Preprocessor(self.input_w, self.input_h)
+        return pre
+
 
 class ObjectDetector(BaseDetector):
     event_type = "object"
@@ -130,9 +140,18 @@ class ObjectDetector(BaseDetector):
         self.conf_thres = float(config.get("confidence_threshold", 0.25))
         self.iou_thres = float(config.get("nms_iou_threshold", 0.5))
         self.max_det = int(config.get("max_detections", 300))
+        self.pre_nms_top_k = int(config.get("pre_nms_top_k", 1000)) or None
+        self.class_agnostic = bool(config.get("class_agnostic_nms", False))
+        self.nms_mode = str(config.get("nms_mode", "offset"))
+        if self.nms_mode not in NMS_MODES:
+            raise ValueError(f"Unknown nms_mode {self.nms_mode!r}; expected one of {NMS_MODES}")
         self.classes = config.get("classes") or []
+        self.batch_size = max(1, int(config.get("batch_size", 1)))
         onnx_path = config.get("onnx_path")
-        self.session = load_onnx_session(Path(onnx_path)) if onnx_path else None
+        self.session = (
+            acquire_session(Path(onnx_path), config.get("session")) if onnx_path else None
+        )
+        self.session_batch = _session_batch_dim(self.session) if self.session else None
         if self.session:
             self.input_name = self.session.get_inputs()[0].name
         else:
@@ -144,16 +163,56 @@ class ObjectDetector(BaseDetector):
         LOGGER.info("Object detector ready; ONNX=%s", bool(self.session))
 
     def detect(self, image: np.ndarray) -> Iterable[Dict[str, Any]]:
+        return self.detect_arrays(image).to_dicts()
+
+    def detect_arrays(self, image: np.ndarray, person_detections: Optional[Any] = None) -> DetectionBatch:
         self.frame_shape = image.shape[:2]
         if self.session:
             return self._detect_onnx(image)
-        return self._detect_heuristic(image)
+        return DetectionBatch.from_dicts(list(self._detect_heuristic(image)), class_names=self.classes)
 
-    def _detect_onnx(self, image: np.ndarray) -> Iterable[Dict[str, Any]]:
-        img, scale, pad = letterbox(image, (self.input_w, self.input_h))
-        blob = img.transpose(2, 0, 1).astype(np.float32) / 255.0
-        blob = np.expand_dims(blob, 0)
-        outputs = self.session.run(None, {self.input_name: blob})[0]
+    def detect_batch(self, images: List[np.ndarray]) -> List[List[Dict[str, Any]]]:
+        return [batch.to_dicts() for batch in self.detect_arrays_batch(images)]
+
+    def detect_arrays_batch(self, images: List[np.ndarray]) -> List[DetectionBatch]:
+        """Detect on several frames (any cameras) with one ``session.run`` per chunk.
+
+        Chunks follow the model's fixed batch dimension, or ``batch_size`` from
+        the config for dynamic-batch exports.
+        """
+        if not images:
+            return []
+        self.frame_shape = images[-1].shape[:2]
+        if not self.session:
+            return [
+                DetectionBatch.from_dicts(list(self._detect_heuristic(image)), class_names=self.classes)
+                for image in images
+            ]
+        step = self.session_batch or self.batch_size
+        pre = self._preprocessor()
+        results: List[DetectionBatch] = []
+        for start in range(0, len(images), step):
+            chunk = images[start : start + step]
+            rows = self.session_batch or len(chunk)
+            batch = pre.batch(rows, used=len(chunk))
+            letterboxes = []
+            for slot, image in enumerate(chunk):
+                _, scale, pad = pre.to_blob(image, out=batch[slot])
+                letterboxes.append((scale, pad))
+            outputs = np.asarray(self._run(batch)[0])
+            for slot, (scale, pad) in enumerate(letterboxes):
+                row = outputs[slot : slot + 1] if outputs.ndim == 3 else outputs
+                results.append(self._postprocess(row, scale, pad))
+        return results
+
+    def _detect_onnx(self, image: np.ndarray) -> DetectionBatch:
+        blob, scale, pad = self._preprocessor().to_blob(image)
+        outputs = self._run(blob)[0]
+        return self._postprocess(outputs, scale, pad)
+
+    def _postprocess(
+        self, outputs: Any, scale: float, pad: Tuple[int, int]
+    ) -> DetectionBatch:
         outputs = normalise_object_output(outputs)
         boxes = outputs[:, :4]
         scores = outputs[:, 4:]
@@ -162,35 +221,31 @@ class ObjectDetector(BaseDetector):
         mask = conf >= self.conf_thres
         boxes, conf, class_ids = boxes[mask], conf[mask], class_ids[mask]
         if boxes.size == 0:
-            return []
+            return DetectionBatch.empty(class_names=self.classes)
         boxes = xywh_to_xyxy(boxes)
         # Undo letterbox
         boxes -= np.array([pad[0], pad[1], pad[0], pad[1]])
         boxes /= scale
-        keep = nms(boxes, conf, self.iou_thres)
-        if self.max_det and len(keep) > self.max_det:
-            ranked = sorted(keep, key=lambda idx: conf[idx], reverse=True)[
-                : self.max_det
-            ]
-            keep = ranked
-        detections: List[Dict[str, Any]] = []
-        for idx in keep:
-            x1, y1, x2, y2 = boxes[idx]
-            class_id = int(class_ids[idx])
-            class_name = (
-                self.classes[class_id]
-                if class_id < len(self.classes)
-                else str(class_id)
+        if self.class_agnostic:
+            keep = nms(
+                boxes, conf, self.iou_thres, pre_top_k=self.pre_nms_top_k, max_det=self.max_det
             )
-            detections.append(
-                {
-                    "bbox": [float(x1), float(y1), float(x2), float(y2)],
-                    "confidence": float(conf[idx]),
-                    "class_id": class_id,
-                    "class": class_name,
-                }
+        else:
+            keep = batched_nms(
+                boxes,
+                conf,
+                class_ids,
+                self.iou_thres,
+                mode=self.nms_mode,
+                pre_top_k=self.pre_nms_top_k,
+                max_det=self.max_det,
             )
-        return detections
+        return DetectionBatch(
+            boxes=boxes[keep],
+            scores=conf[keep],
+            class_ids=class_ids[keep],
+            class_names=self.classes,
+        )
 
     def _detect_heuristic(self, image: np.ndarray) -> Iterable[Dict[str, Any]]:
         h, w = image.shape[:2]
@@ -221,8 +276,11 @@ class PoseDetector(BaseDetector):
         self.conf_thres = float(config.get("confidence_threshold", 0.25))
         self.iou_thres = float(config.get("nms_iou_threshold", 0.6))
         self.max_det = int(config.get("max_detections", 200))
+        self.pre_nms_top_k = int(config.get("pre_nms_top_k", 1000)) or None
         onnx_path = config.get("onnx_path")
-        self.session = load_onnx_session(Path(onnx_path)) if onnx_path else None
+        self.session = (
+            acquire_session(Path(onnx_path), config.get("session")) if onnx_path else None
+        )
         if self.session:
             self.input_name = self.session.get_inputs()[0].name
         else:
@@ -243,29 +301,78 @@ class PoseDetector(BaseDetector):
             self.person_padding_ratio = float(
                 person_cfg.get("crop_padding_ratio", 0.15)
             )
+            # Person boxes the object runner published for a frame captured
+            # within ``object_cache_max_age_ms`` replace our own YOLO pass.
+            self.reuse_object_cache = bool(person_cfg.get("reuse_object_cache", False))
+            self.object_cache_max_age = float(person_cfg.get("object_cache_max_age_ms", 150)) / 1000.0
         else:
             self.person_detector = None
             self.person_class_filter = set()
             self.person_min_conf = 0.0
             self.person_padding_ratio = 0.0
+            self.reuse_object_cache = False
+            self.object_cache_max_age = 0.0
+        self.person_cache_hits = 0
+        self.person_detector_runs = 0
+        # Person crops run through the pose model together: at most
+        # ``crop_batch_size`` per session.run, padded up to the next bucket so a
+        # dynamic-batch model only ever sees a handful of shapes.
+        self.crop_batch_size = max(1, int(config.get("crop_batch_size", 16)))
+        self.batch_buckets = sorted({int(b) for b in config.get("batch_buckets", [1, 2, 4, 8, 16]) if int(b) > 0})
+        self.session_batch = _session_batch_dim(self.session) if self.session else None
         LOGGER.info("Pose detector ready; ONNX=%s", bool(self.session))
 
-    def detect(self, image: np.ndarray) -> Iterable[Dict[str, Any]]:
-        if not self.session:
-            return self._detect_heuristic(image)
+    def close(self) -> None:
         if self.person_detector is not None:
+            self.person_detector.close()
+        super().close()
+
+    def detect(
+        self,
+        image: np.ndarray,
+        person_detections: Optional[Any] = None,
+    ) -> Iterable[Dict[str, Any]]:
+        return self.detect_arrays(image, person_detections).to_dicts()
+
+    def detect_arrays(
+        self,
+        image: np.ndarray,
+        person_detections: Optional[Any] = None,
+    ) -> DetectionBatch:
+        """Pose for ``image``.
+
+        ``person_detections`` are object detections already computed for this
+        frame (a ``DetectionBatch`` or dicts, e.g. from the object runner's
+        cache); when given, the person detector is skipped.
+        """
+        if not self.session:
+            return DetectionBatch.from_dicts(list(self._detect_heuristic(image)))
+        if person_detections is not None:
+            self.person_cache_hits += 1
+            person_boxes = self._filter_people(person_detections)
+        elif self.person_detector is not None:
+            self.person_detector_runs += 1
             person_boxes = self._person_boxes(image)
-            if person_boxes:
-                detections: List[Dict[str, Any]] = []
-                for bbox in person_boxes:
-                    detections.extend(self._detect_from_person(image, bbox))
-                if detections:
-                    return detections
+        else:
+            person_boxes = []
+        if len(person_boxes):
+            detections = self._detect_from_people(image, person_boxes)
+            if len(detections):
+                return detections
         return self._detect_full_frame(image)
 
-    def _person_boxes(self, image: np.ndarray) -> List[List[float]]:
+    def _person_boxes(self, image: np.ndarray) -> np.ndarray:
+        detector = self.person_detector
+        detect = getattr(detector, "detect_arrays", None) or detector.detect
+        return self._filter_people(detect(image))
+
+    def _filter_people(self, detections: Any) -> Any:
+        if isinstance(detections, DetectionBatch):
+            keep = detections.class_mask(self.person_class_filter)
+            keep &= detections.scores >= self.person_min_conf
+            return detections.boxes[keep]
         boxes: List[List[float]] = []
-        for det in self.person_detector.detect(image):
+        for det in detections:
             class_name = str(det.get("class", "")).lower()
             if class_name not in self.person_class_filter:
                 continue
@@ -321,16 +428,16 @@ class PoseDetector(BaseDetector):
         keypoints = np.stack((x_coord, y_coord, kp_scores), axis=-1)
         return boxes, pose_scores, keypoints
 
-    def _detect_full_frame(self, image: np.ndarray) -> Iterable[Dict[str, Any]]:
+    def _detect_full_frame(self, image: np.ndarray) -> DetectionBatch:
         blob, scale, pad = self._prepare_blob(image)
         boxes, scores, keypoints, boxes_are_xywh = self._run_forward(blob)
         return self._build_detections(
             boxes, scores, keypoints, boxes_are_xywh, pad, scale, offset=(0.0, 0.0)
         )
 
-    def _detect_from_person(
+    def _crop_person(
         self, image: np.ndarray, bbox: List[float]
-    ) -> List[Dict[str, Any]]:
+    ) -> Optional[Tuple[np.ndarray, Tuple[float, float]]]:
         h, w = image.shape[:2]
         x1, y1, x2, y2 = [int(round(v)) for v in bbox]
         pad_x = int((x2 - x1) * self.person_padding_ratio)
@@ -340,47 +447,88 @@ class PoseDetector(BaseDetector):
         x2 = min(w, x2 + pad_x)
         y2 = min(h, y2 + pad_y)
         if x2 <= x1 or y2 <= y1:
-            return []
+            return None
         crop = image[y1:y2, x1:x2]
         if crop.size == 0:
-            return []
-        blob, scale, pad = self._prepare_blob(crop)
-        boxes, scores, keypoints, boxes_are_xywh = self._run_forward(blob)
-        return self._build_detections(
-            boxes,
-            scores,
-            keypoints,
-            boxes_are_xywh,
-            pad,
-            scale,
-            offset=(float(x1), float(y1)),
-        )
+            return None
+        return crop, (float(x1), float(y1))
+
+    def _batch_plan(self, count: int) -> List[Tuple[int, int, int]]:
+        """Split ``count`` crops into ``(start, stop, padded batch)`` chunks."""
+        if self.session_batch is not None:
+            step = self.session_batch
+        else:
+            step = self.crop_batch_size
+        plan: List[Tuple[int, int, int]] = []
+        for start in range(0, count, step):
+            stop = min(start + step, count)
+            size = stop - start
+            if self.session_batch is not None:
+                size = self.session_batch
+            else:
+                size = next((b for b in self.batch_buckets if b >= size), size)
+            plan.append((start, stop, size))
+        return plan
+
+    def _detect_from_people(self, image: np.ndarray, person_boxes: Any) -> DetectionBatch:
+        crops = [c for c in (self._crop_person(image, b) for b in person_boxes) if c is not None]
+        detections: List[DetectionBatch] = []
+        pre = self._preprocessor()
+        for start, stop, size in self._batch_plan(len(crops)):
+            batch = pre.batch(size, used=stop - start)
+            metas: List[Tuple[float, Tuple[int, int], Tuple[float, float]]] = []
+            for slot, (crop, offset) in enumerate(crops[start:stop]):
+                _, scale, pad = pre.to_blob(crop, out=batch[slot])
+                metas.append((scale, pad, offset))
+            # Padding rows beyond len(metas) are dropped by zip.
+            for (scale, pad, offset), forward in zip(metas, self._forward_batch(batch)):
+                boxes, scores, keypoints, boxes_are_xywh = forward
+                detections.append(
+                    self._build_detections(
+                        boxes, scores, keypoints, boxes_are_xywh, pad, scale, offset=offset
+                    )
+                )
+        return DetectionBatch.concat(detections) if detections else DetectionBatch.empty(with_classes=False)
 
     def _prepare_blob(
         self, image: np.ndarray
     ) -> Tuple[np.ndarray, float, Tuple[int, int]]:
-        img, scale, pad = letterbox(image, (self.input_w, self.input_h))
-        blob = img.transpose(2, 0, 1).astype(np.float32) / 255.0
-        blob = np.expand_dims(blob, 0)
-        return blob, scale, pad
+        return self._preprocessor().to_blob(image)
 
     def _run_forward(
         self, blob: np.ndarray
     ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, bool]:
-        outputs = self.session.run(None, {self.input_name: blob})
+        return self._forward_batch(blob)[0]
+
+    def _forward_batch(
+        self, batch: np.ndarray
+    ) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray, bool]]:
+        """Run one ``session.run`` and split the outputs per batch row."""
+        outputs = self._run(batch)
+        rows = batch.shape[0]
         if isinstance(outputs, (list, tuple)) and len(outputs) == 2:
             boxes, scores, keypoints = self._decode_simcc(outputs[0], outputs[1])
-            boxes_are_xywh = False
-        else:
-            tensor = outputs[0] if isinstance(outputs, (list, tuple)) else outputs
-            tensor = normalise_pose_output(tensor)
-            boxes = tensor[:, :4]
-            scores = tensor[:, 4]
-            keypoints = tensor[:, 5:]
+            return [
+                (boxes[i : i + 1], scores[i : i + 1], keypoints[i : i + 1], False)
+                for i in range(min(rows, boxes.shape[0]))
+            ]
+        tensor = outputs[0] if isinstance(outputs, (list, tuple)) else outputs
+        tensor = np.asarray(tensor)
+        items = [tensor[i : i + 1] for i in range(rows)] if tensor.ndim == 3 else [tensor]
+        results = []
+        for item in items:
+            item = normalise_pose_output(item)
+            keypoints = item[:, 5:]
             num_points = keypoints.shape[1] // 3
-            keypoints = keypoints.reshape(keypoints.shape[0], num_points, 3)
-            boxes_are_xywh = True
-        return boxes, scores, keypoints, boxes_are_xywh
+            results.append(
+                (
+                    item[:, :4],
+                    item[:, 4],
+                    keypoints.reshape(keypoints.shape[0], num_points, 3),
+                    True,
+                )
+            )
+        return results
 
     def _build_detections(
         self,
@@ -391,11 +539,11 @@ class PoseDetector(BaseDetector):
         pad: Tuple[int, int],
         scale: float,
         offset: Tuple[float, float],
-    ) -> List[Dict[str, Any]]:
+    ) -> DetectionBatch:
         mask = scores >= self.conf_thres
         boxes, scores, keypoints = boxes[mask], scores[mask], keypoints[mask]
         if boxes.size == 0:
-            return []
+            return DetectionBatch.empty(with_classes=False)
         if keypoints.ndim != 3 or keypoints.shape[2] != 3:
             num_points = keypoints.shape[1] // 3
             keypoints = keypoints.reshape(keypoints.shape[0], num_points, 3)
@@ -411,24 +559,10 @@ class PoseDetector(BaseDetector):
         boxes[:, [1, 3]] += offset[1]
         keypoints[:, :, 0] += offset[0]
         keypoints[:, :, 1] += offset[1]
-        keep = nms(boxes, scores, self.iou_thres)
-        if self.max_det and len(keep) > self.max_det:
-            keep = sorted(keep, key=lambda idx: scores[idx], reverse=True)[
-                : self.max_det
-            ]
-        results: List[Dict[str, Any]] = []
-        for idx in keep:
-            pts = keypoints[idx]
-            kpt_list = [(float(x), float(y), float(c)) for x, y, c in pts]
-            x1, y1, x2, y2 = boxes[idx]
-            results.append(
-                {
-                    "bbox": [float(x1), float(y1), float(x2), float(y2)],
-                    "confidence": float(scores[idx]),
-                    "keypoints": kpt_list,
-                }
-            )
-        return results
+        keep = nms(
+            boxes, scores, self.iou_thres, pre_top_k=self.pre_nms_top_k, max_det=self.max_det
+        )
+        return DetectionBatch(boxes=boxes[keep], scores=scores[keep], keypoints=keypoints[keep])
 
     def _detect_heuristic(self, image: np.ndarray) -> Iterable[Dict[str, Any]]:
         h, w = image.shape[:2]
@@ -501,7 +635,9 @@ class FaceDetector(BaseDetector):
         self.input_h = int(config.get("input", {}).get("height", 640))
         self.conf_thres = float(config.get("confidence_threshold", 0.5))
         onnx_path = config.get("onnx_path")
-        self.session = load_onnx_session(Path(onnx_path)) if onnx_path else None
+        self.session = (
+            acquire_session(Path(onnx_path), config.get("session")) if onnx_path else None
+        )
         self.input_name = (
             self.session.get_inputs()[0].name if self.session else "images"
         )
@@ -535,7 +671,9 @@ class FaceRecognitionDetector(BaseDetector):
         self.input_h = int(config.get("input", {}).get("height", 112))
         self.conf_thres = float(config.get("confidence_threshold", 0.5))
         onnx_path = config.get("onnx_path")
-        self.session = load_onnx_session(Path(onnx_path)) if onnx_path else None
+        self.session = (
+            acquire_session(Path(onnx_path), config.get("session")) if onnx_path else None
+        )
         self.input_name = (
             self.session.get_inputs()[0].name if self.session else "images"
         )
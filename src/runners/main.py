@@ -3,9 +3,12 @@ from __future__ import annotations
 import json
 import logging
 import os
+import socket
 import time
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
 
 import cv2
 import numpy as np
@@ -13,11 +16,19 @@ import yaml
 
 from src.trackers import TrackerManager
 
-from src.common.event_bus import Event, FileEventBus
+from src.common.detections import DetectionBatch, MultiCameraBatch
+from src.common.event_bus import Event
+from src.common.frame_ring import FrameRingReader
+from src.common.socket_bus import SocketSubscriber
+from src.common.tail import LogTailer
+from src.common.transport import build_event_bus, build_event_consumer
+from .batching import BatchInferenceServer
 from .detectors import BaseDetector, build_detector
 from .pose_assoc import associate_pose_tracks
 from .renderer import draw_hud, draw_pose, draw_track_label
+from .pipeline import StagePipeline
 from .pose_events import PoseUseCaseMonitor
+from .scheduler import build_scheduler
 
 logging.basicConfig(level=logging.INFO, format="[%(asctime)s] %(levelname)s %(message)s")
 LOGGER = logging.getLogger("detector-runner")
@@ -34,6 +45,7 @@ OBJECT_TRACKERS = TrackerManager(
     low_thresh=float(os.getenv("TRACKER_LOW_THRESH", "0.1")),
     match_iou=float(os.getenv("TRACKER_MATCH_IOU", "0.3")),
     max_age=int(os.getenv("TRACKER_MAX_AGE", "30")),
+    motion=os.getenv("TRACKER_MOTION", "1").lower() in {"1", "true", "yes"},
 )
 POSE_TRACKERS = TrackerManager(
     algorithm=os.getenv("POSE_TRACKER_ALGO", "simple"),
@@ -43,27 +55,13 @@ POSE_TRACKERS = TrackerManager(
     max_age=int(os.getenv("POSE_TRACKER_MAX_AGE", "30")),
 )
 
+# (tracked batch, event dicts, pose track labels, fps estimate, pose HUD lines) for one frame.
+Analysed = Tuple[DetectionBatch, List[Dict[str, object]], Dict[int, str], float, List[str]]
 
-def stream_frames(path: Path) -> Iterable[Dict[str, object]]:
-    offset = 0
-    while True:
-        if not path.exists():
-            time.sleep(1)
-            continue
-        with path.open("r", encoding="utf-8") as fh:
-            fh.seek(offset)
-            while True:
-                line = fh.readline()
-                if not line:
-                    break
-                offset = fh.tell()
-                if not line.strip():
-                    continue
-                try:
-                    yield json.loads(line)
-                except json.JSONDecodeError:
-                    LOGGER.warning("Skipping malformed frame entry: %s", line)
-        time.sleep(0.1)
+
+def stream_frames(path: Path) -> Union[LogTailer, SocketSubscriber]:
+    name = f"runner-{socket.gethostname()}-{os.getpid()}"
+    return build_event_consumer(path, name, durable=False)
 
 
 def load_config() -> Dict[str, object]:
@@ -124,13 +122,36 @@ def load_object_cache(camera_id: str) -> List[Dict[str, object]]:
         return []
 
 
-def assign_pose_ids(camera_id: str, detections: List[Dict[str, object]]) -> List[Dict[str, object]]:
-    persons = [
-        det
-        for det in OBJECT_TRACKERS.latest_detections(camera_id)
-        if (det.get("class") or "").lower() == "person"
-    ]
-    return associate_pose_tracks(persons, detections)
+def cached_object_detections(
+    camera_id: str, timestamp: float, max_age: float
+) -> Optional[List[Dict[str, object]]]:
+    """Object runner detections for this frame, or ``None`` if missing/stale.
+
+    A cache entry matches when its frame was captured within ``max_age``
+    seconds of ``timestamp``; the same frame has age 0 and always matches.
+    Frame indices restart with ingest, so they are not compared.
+    """
+    path = CACHE_DIR / f"{camera_id}.json"
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    try:
+        age = abs(float(data.get("timestamp")) - timestamp)
+    except (TypeError, ValueError):
+        return None
+    if age > max_age:
+        return None
+    detections = data.get("detections")
+    return detections if isinstance(detections, list) else None
+
+
+def assign_pose_ids(camera_id: str, detections: DetectionBatch) -> DetectionBatch:
+    latest = OBJECT_TRACKERS.latest_detections(camera_id)
+    if isinstance(latest, DetectionBatch):
+        return associate_pose_tracks(latest.take(latest.class_mask({"person"})), detections)
+    people = [det for det in latest if (det.get("class") or "").lower() == "person"]
+    return associate_pose_tracks(people, detections)
 
 
 def cleanup_frame(path: str | Path | None, persist: bool) -> None:
@@ -144,6 +165,31 @@ def cleanup_frame(path: str | Path | None, persist: bool) -> None:
         LOGGER.debug("Failed to delete frame %s: %s", path, exc)
 
 
+def load_frame(frame: Dict[str, object], rings: FrameRingReader) -> Optional[np.ndarray]:
+    """Fetch pixels for a frame record from the shared ring or from disk."""
+    if frame.get("ring"):
+        image = rings.read(frame)
+        if image is None:
+            LOGGER.warning(
+                "Frame %s slot %s was recycled before it was read; skipping.",
+                frame.get("frame_index"),
+                frame.get("slot"),
+            )
+        return image
+    frame_path = frame.get("path")
+    if not frame_path:
+        LOGGER.warning("Frame path missing; skipping frame.")
+        return None
+    path_obj = Path(str(frame_path))
+    if not path_obj.exists():
+        LOGGER.warning("Frame path %s missing; skipping frame.", frame_path)
+        return None
+    image = cv2.imread(str(path_obj))
+    if image is None:
+        LOGGER.warning("Failed to read frame %s; skipping.", frame_path)
+    return image
+
+
 def run() -> None:
     config = load_config()
     detector = build_detector(config)
@@ -154,132 +200,321 @@ def run() -> None:
 
     publish_path = config.get("publish_path", "artifacts/detections/events.log")
     publish_dir = Path(publish_path)
-    bus = FileEventBus(publish_dir.parent, filename=publish_dir.name)
+    bus = build_event_bus(publish_dir.parent, filename=publish_dir.name)
     log_path = FRAMES_LOG
-    interval = int(config.get("interval", 1))
-    frame_skip = 0
+    scheduler = build_scheduler(config)
     render_enabled = SHOW_PREVIEW or bool(RECORD_PATH)
     writer: Optional[cv2.VideoWriter] = None
-
-    LOGGER.info("Starting detector %s; publishing to %s", detector.__class__.__name__, publish_path)
-
+    rings = FrameRingReader()
+    server: Optional[BatchInferenceServer] = None
+    batch_size = int(config.get("batch_size", 1))
+    if batch_size > 1 and hasattr(detector, "detect_batch"):
+        server = BatchInferenceServer(
+            detector,
+            max_batch=batch_size,
+            max_wait_ms=float(config.get("batch_max_wait_ms", 5.0)),
+            arrays=hasattr(detector, "detect_arrays_batch"),
+        ).start()
+        LOGGER.info("Batching inference across cameras (max_batch=%d)", batch_size)
+
+    LOGGER.info(
+        "Starting detector %s (frame interval %d); publishing to %s",
+        detector.__class__.__name__,
+        scheduler.base_interval,
+        publish_path,
+    )
+
+    last_frame: Dict[object, int] = {}
+
+    def frame_steps(camera_id: object, frame_index: object) -> int:
+        """Frames elapsed since this camera's previous analysed frame."""
+        if frame_index is None:
+            return 1
+        previous = last_frame.get(camera_id)
+        last_frame[camera_id] = int(frame_index)
+        return max(1, int(frame_index) - previous) if previous is not None else 1
+
+    def analyse(frame: Dict[str, object], batch: DetectionBatch, proc_time: float, tracked: bool = False) -> Analysed:
+        """Tracking and pose heuristics for one frame's detections.
+
+        ``tracked`` batches already went through ``track_cameras``.
+        """
+        timestamp = float(frame.get("timestamp", time.time()))
+        camera_id = str(frame.get("camera_id", "CAM01"))
+        fps_est = 1.0 / proc_time if proc_time > 0 else 0.0
+        latency_ms = proc_time * 1000.0
+        track_labels: Dict[int, str] = {}
+        pose_hud: List[str] = []
+        batch.timestamp = timestamp
+
+        if detector.event_type == "object" and not tracked:
+            batch = OBJECT_TRACKERS.update(camera_id, batch, steps=frame_steps(camera_id, frame.get("frame_index")))
+        elif detector.event_type == "pose":
+            batch = assign_pose_ids(camera_id, batch)
+            batch = POSE_TRACKERS.update(camera_id, batch, steps=frame_steps(camera_id, frame.get("frame_index")))
+            if pose_monitor is not None:
+                # The monitor is only touched here (the track thread in staged
+                # mode); emit() gets its labels and HUD lines via ``Analysed``.
+                pose_monitor.update_telemetry(frame.get("telemetry"))
+                pose_monitor.process(camera_id, batch, fps_est or pose_monitor.fps_hint)
+                track_labels = pose_monitor.track_labels()
+                if render_enabled:
+                    pose_hud = pose_monitor.hud_lines()
+
+        # Dicts are only built here, where detections leave the process.
+        detections = batch.to_dicts()
+        for det in detections:
+            det.setdefault("timestamp", timestamp)
+            det.setdefault("latency_ms", latency_ms)
+            det.setdefault("detector", detector.config.get("model", detector.__class__.__name__))
+        if detector.event_type == "object":
+            update_object_cache(camera_id, timestamp, detections)
+        return batch, detections, track_labels, fps_est, pose_hud
+
+    def track_cameras(frames: List[Dict[str, object]], batches: List[DetectionBatch]) -> List[DetectionBatch]:
+        """Object-track one frame from each of several cameras in one manager call."""
+        camera_ids = [str(frame.get("camera_id", "CAM01")) for frame in frames]
+        steps: Dict[str, int] = {}
+        for frame, camera_id, batch in zip(frames, camera_ids, batches):
+            batch.timestamp = float(frame.get("timestamp", time.time()))
+            steps[camera_id] = frame_steps(camera_id, frame.get("frame_index"))
+        multi = OBJECT_TRACKERS.update_cameras(MultiCameraBatch.from_batches(camera_ids, batches), steps=steps)
+        return [multi.segment(index) for index in range(len(multi))]
+
+    def analyse_many(entries: List[Tuple[Dict[str, object], DetectionBatch, float]]) -> List[Analysed]:
+        """``analyse`` for frames that finished inference together.
+
+        Object tracking runs once per run of frames from distinct cameras; a
+        camera showing up again starts a new run so its frames stay in order.
+        """
+        if detector.event_type != "object" or len(entries) < 2:
+            return [analyse(*entry) for entry in entries]
+        analysed: List[Analysed] = []
+        start = 0
+        while start < len(entries):
+            stop, cameras = start, set()
+            while stop < len(entries) and entries[stop][0].get("camera_id", "CAM01") not in cameras:
+                cameras.add(entries[stop][0].get("camera_id", "CAM01"))
+                stop += 1
+            group = entries[start:stop]
+            segments = track_cameras([frame for frame, _, _ in group], [batch for _, batch, _ in group])
+            analysed.extend(
+                analyse(frame, segment, proc_time, tracked=True)
+                for (frame, _, proc_time), segment in zip(group, segments)
+            )
+            start = stop
+        return analysed
+
+    def emit(frame: Dict[str, object], image: np.ndarray, analysed: Analysed) -> None:
+        """Render, publish and record one analysed frame."""
+        nonlocal writer
+        batch, detections, track_labels, fps_est, pose_hud = analysed
+        camera_id = frame.get("camera_id", "CAM01")
+        vis_frame = None
+        if render_enabled:
+            vis_frame = image.copy()
+            if detector.event_type == "pose" and batch.keypoints is not None:
+                for row, det in enumerate(detections):
+                    vis_frame = draw_pose(vis_frame, batch.keypoints[row], det["bbox"])
+                    track_label = track_labels.get(det.get("track_id"))
+                    if track_label:
+                        vis_frame = draw_track_label(vis_frame, det["bbox"], track_label)
+            hud_lines = [
+                f"FPS={fps_est:.1f} frame={frame.get('frame_index', '-')}",
+                f"detections={len(detections)} camera={camera_id}",
+            ]
+            vis_frame = draw_hud(vis_frame, hud_lines + pose_hud)
+
+        for idx, detection in enumerate(detections):
+            payload = build_event_payload(detector, frame, detection, idx)
+            bus.publish(Event(type=detector.event_type, payload=payload))
+
+            # Emit derived pose events (e.g., collapse/gesture/phone) as first-class events
+            if detector.event_type == "pose":
+                for evt in detection.get("pose_events", []) or []:
+                    derived = {
+                        **payload,
+                        **evt,
+                        "event_parent": "pose",
+                    }
+                    derived["type"] = evt.get("type", "pose.event")
+                    bus.publish(Event(type=derived.pop("type"), payload=derived))
+
+        # In staged mode this runs on the publish thread, so the preview
+        # window is created and pumped there (Esc stops the runner via the
+        # pipeline error).  Set ``pipeline.enabled: false`` where HighGUI
+        # must stay on the main thread (macOS).
+        if SHOW_PREVIEW and vis_frame is not None:
+            cv2.imshow(PREVIEW_WINDOW, vis_frame)
+            if cv2.waitKey(1) & 0xFF == 27:
+                raise KeyboardInterrupt
+
+        if RECORD_PATH and vis_frame is not None:
+            if writer is None:
+                fourcc = cv2.VideoWriter_fourcc(*"mp4v")
+                writer = cv2.VideoWriter(
+                    RECORD_PATH,
+                    fourcc,
+                    RECORD_FPS,
+                    (vis_frame.shape[1], vis_frame.shape[0]),
+                )
+                if not writer.isOpened():
+                    LOGGER.warning("Failed to open video writer at %s", RECORD_PATH)
+                    writer = None
+            if writer is not None:
+                writer.write(vis_frame)
+
+        cleanup_frame(frame.get("path"), bool(frame.get("persist", True)))
+
+    def handle(frame: Dict[str, object], image: np.ndarray, batch: DetectionBatch, proc_time: float) -> None:
+        emit(frame, image, analyse(frame, batch, proc_time))
+
+    def infer(frame: Dict[str, object], image: np.ndarray) -> DetectionBatch:
+        if getattr(detector, "reuse_object_cache", False):
+            people = cached_object_detections(
+                str(frame.get("camera_id", "CAM01")),
+                float(frame.get("timestamp", time.time())),
+                detector.object_cache_max_age,
+            )
+            return detector.detect_arrays(image, person_detections=people)
+        return detector.detect_arrays(image)
+
+    pending: Deque[Tuple[Dict[str, object], np.ndarray, Future, float]] = deque()
+    max_pending = 2 * server.max_batch if server is not None else 0
+    server_busy = 0.0
+
+    def finish_ready() -> None:
+        """Finish the oldest in-flight frame and every completed one behind it."""
+        nonlocal server_busy
+        assert server is not None  # only batched runs queue frames in ``pending``
+        ready = [pending.popleft()]
+        while pending and pending[0][2].done():
+            ready.append(pending.popleft())
+        entries = []
+        for frame, _, future, submitted in ready:
+            detections = future.result()
+            if not isinstance(detections, DetectionBatch):
+                detections = DetectionBatch.from_dicts(detections)
+            entries.append((frame, detections, time.time() - submitted))
+        start = time.time()
+        for (frame, image, _, _), analysed in zip(ready, analyse_many(entries)):
+            emit(frame, image, analysed)
+        # Inference runs on the server thread: charge its share, not the wait.
+        busy = server.busy_seconds
+        scheduler.record(time.time() - start + busy - server_busy)
+        server_busy = busy
+
+    # Staged mode: decode -> infer -> track -> publish, one thread each.
+    def decode_stage(frame: Dict[str, object]) -> Optional[Tuple[Dict[str, object], np.ndarray]]:
+        image = load_frame(frame, rings)
+        if image is None:
+            cleanup_frame(frame.get("path"), bool(frame.get("persist", True)))
+            return None
+        return frame, image
+
+    def infer_stage(
+        item: Tuple[Dict[str, object], np.ndarray],
+    ) -> Tuple[Dict[str, object], np.ndarray, Any, float]:
+        frame, image = item
+        start = time.time()
+        if server is not None:
+            return frame, image, server.submit(image), start
+        batch = infer(frame, image)
+        scheduler.record(time.time() - start)
+        return frame, image, batch, start
+
+    def track_stage(
+        items: List[Tuple[Dict[str, object], np.ndarray, Any, float]],
+    ) -> List[Tuple[Dict[str, object], np.ndarray, Analysed]]:
+        nonlocal server_busy
+        entries = []
+        for frame, _, result, start in items:
+            if isinstance(result, Future):
+                assert server is not None  # futures only come from the batch server
+                result = result.result()
+                busy = server.busy_seconds
+                scheduler.record(busy - server_busy)
+                server_busy = busy
+            if not isinstance(result, DetectionBatch):
+                result = DetectionBatch.from_dicts(result)
+            entries.append((frame, result, time.time() - start))
+        return [(frame, image, analysed) for (frame, image, _, _), analysed in zip(items, analyse_many(entries))]
+
+    def publish_stage(item: Tuple[Dict[str, object], np.ndarray, Analysed]) -> None:
+        emit(*item)
+
+    pipeline: Optional[StagePipeline] = None
+    pipeline_cfg = config.get("pipeline")
+    if isinstance(pipeline_cfg, dict) and pipeline_cfg.get("enabled"):
+        pipeline = StagePipeline(
+            [
+                ("decode", decode_stage),
+                ("infer", infer_stage),
+                ("track", track_stage, server.max_batch if server is not None else 1),
+                ("publish", publish_stage),
+            ],
+            queue_depth=int(pipeline_cfg.get("queue_depth", 4)),
+        ).start()
+        LOGGER.info("Running staged pipeline (queue depth %d)", pipeline.queue_depth)
+
+    frames = stream_frames(log_path)
     try:
-        for frame in stream_frames(log_path):
+        while True:
+            if pipeline is not None:
+                pipeline.check()
+            frame = frames.next_record()
+            if frame is None:
+                # Idle stream: deliver whatever is still in flight before blocking.
+                while pending:
+                    finish_ready()
+                frames.wait()
+                continue
             persist_frame = bool(frame.get("persist", True))
             frame_path = frame.get("path")
-            if pose_monitor is not None:
-                pose_monitor.update_telemetry(frame.get("telemetry"))
-            frame_skip = (frame_skip + 1) % interval
-            if frame_skip:
+            camera_id = str(frame.get("camera_id", "CAM01"))
+            backlog = getattr(frames, "backlog", 0) + (pipeline.pending if pipeline is not None else 0)
+            if not scheduler.admit(camera_id, frame.get("timestamp"), backlog=backlog):
                 cleanup_frame(frame_path, persist_frame)
                 continue
-            if not frame_path:
-                LOGGER.warning("Frame path missing; skipping frame.")
+            if pipeline is not None:
+                pipeline.submit(frame)
                 continue
-            path_obj = Path(frame_path)
-            if not path_obj.exists():
-                LOGGER.warning("Frame path %s missing; skipping frame.", frame_path)
-                cleanup_frame(frame_path, persist_frame)
-                continue
-            image = cv2.imread(str(path_obj))
+            image = load_frame(frame, rings)
             if image is None:
-                LOGGER.warning("Failed to read frame %s; skipping.", frame_path)
                 cleanup_frame(frame_path, persist_frame)
                 continue
 
-            start = time.time()
-            timestamp = float(frame.get("timestamp", time.time()))
-            camera_id = frame.get("camera_id", "CAM01")
-            detections = list(detector.detect(image))
-            proc_time = time.time() - start
-            fps_est = 1.0 / proc_time if proc_time > 0 else 0.0
-            latency_ms = proc_time * 1000.0
-            track_labels: Dict[int, str] = {}
-
-            for det in detections:
-                det.setdefault("first_seen", timestamp)
-                det.setdefault("timestamp", timestamp)
-                det.setdefault("latency_ms", latency_ms)
-                det.setdefault("detector", detector.config.get("model", detector.__class__.__name__))
-
-            if detector.event_type == "object":
-                detections = OBJECT_TRACKERS.update(camera_id, detections)
-                update_object_cache(camera_id, timestamp, detections)
-            elif detector.event_type == "pose":
-                detections = assign_pose_ids(camera_id, detections)
-                detections = POSE_TRACKERS.update(camera_id, detections)
-                if pose_monitor is not None:
-                    pose_monitor.process(camera_id, detections, fps_est or pose_monitor.fps_hint)
-                    track_labels = pose_monitor.track_labels()
-
-            vis_frame = None
-            if render_enabled:
-                vis_frame = image.copy()
-                if detector.event_type == "pose":
-                    for det in detections:
-                        keypoints = det.get("keypoints")
-                        if not keypoints:
-                            continue
-                        vis_frame = draw_pose(
-                            vis_frame,
-                            np.asarray(keypoints, dtype=np.float32),
-                            det.get("bbox"),
-                        )
-                        if pose_monitor is not None:
-                            track_label = track_labels.get(det.get("track_id"))
-                            if track_label:
-                                vis_frame = draw_track_label(vis_frame, det.get("bbox"), track_label)
-                hud_lines = [
-                    f"FPS={fps_est:.1f} frame={frame.get('frame_index', '-')}",
-                    f"detections={len(detections)} camera={camera_id}",
-                ]
-                if pose_monitor is not None and detector.event_type == "pose":
-                    hud_lines.extend(pose_monitor.hud_lines())
-                vis_frame = draw_hud(vis_frame, hud_lines)
-
-            for idx, detection in enumerate(detections):
-                payload = build_event_payload(detector, frame, detection, idx)
-                payload.setdefault("latency_ms", latency_ms)
-                payload.setdefault("detector", detector.config.get("model", detector.__class__.__name__))
-                bus.publish(Event(type=detector.event_type, payload=payload))
-
-                # Emit derived pose events (e.g., collapse/gesture/phone) as first-class events
-                if detector.event_type == "pose":
-                    for evt in detection.get("pose_events", []) or []:
-                        derived = {
-                            **payload,
-                            **evt,
-                            "event_parent": "pose",
-                        }
-                        derived["type"] = evt.get("type", "pose.event")
-                        bus.publish(Event(type=derived.pop("type"), payload=derived))
-
-            if SHOW_PREVIEW and vis_frame is not None:
-                cv2.imshow(PREVIEW_WINDOW, vis_frame)
-                if cv2.waitKey(1) & 0xFF == 27:
-                    raise KeyboardInterrupt
-
-            if RECORD_PATH and vis_frame is not None:
-                if writer is None:
-                    fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-                    writer = cv2.VideoWriter(
-                        RECORD_PATH,
-                        fourcc,
-                        RECORD_FPS,
-                        (vis_frame.shape[1], vis_frame.shape[0]),
-                    )
-                    if not writer.isOpened():
-                        LOGGER.warning("Failed to open video writer at %s", RECORD_PATH)
-                        writer = None
-                if writer is not None:
-                    writer.write(vis_frame)
-
-            cleanup_frame(frame_path, persist_frame)
+            if server is None:
+                start = time.time()
+                handle(frame, image, infer(frame, image), time.time() - start)
+                scheduler.record(time.time() - start)
+                continue
+            pending.append((frame, image, server.submit(image), time.time()))
+            while pending and (pending[0][2].done() or len(pending) >= max_pending):
+                finish_ready()
     finally:
-        if writer is not None:
-            writer.release()
-        if SHOW_PREVIEW:
-            cv2.destroyWindow(PREVIEW_WINDOW)
+        stopped = True
+        if pipeline is not None:
+            stopped = pipeline.close()
+            LOGGER.info("Pipeline stages: %s", pipeline.stats())
+        if detector.event_type == "object":
+            LOGGER.info("Tracker timings: %s", OBJECT_TRACKERS.stats())
+        elif detector.event_type == "pose":
+            LOGGER.info("Tracker timings: %s", POSE_TRACKERS.stats())
+        if not stopped:
+            # A stage thread may still be using the session, rings or writer;
+            # leave them to process exit rather than free them under it.
+            LOGGER.warning("Skipping runner cleanup: pipeline stages did not stop")
+        else:
+            if server is not None:
+                server.stop()
+            detector.close()
+            frames.close()
+            rings.close()
+            if writer is not None:
+                writer.release()
+            if SHOW_PREVIEW:
+                cv2.destroyWindow(PREVIEW_WINDOW)
 
 
 def main() -> None:
@@ -0,0 +1,138 @@
+"""Vectorised non-maximum suppression.
+
+All functions take ``xyxy`` boxes and return ``int64`` index arrays ordered by
+descending score.  ``pre_top_k`` trims candidates before any IoU work and
+``max_det`` stops suppression as soon as enough boxes are kept, which is what
+keeps NMS cheap at low confidence thresholds.  Up to ``matrix_limit``
+candidates the pairwise IoU matrix is built once and greedy suppression only
+walks boolean rows; larger sets fall back to shrinking the candidate order.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+from src.trackers.matching import iou_matrix
+
+MATRIX_LIMIT = 512
+NMS_MODES = ("offset", "per_class")
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+def _as_boxes(boxes: np.ndarray) -> np.ndarray:
+    boxes = np.asarray(boxes)
+    if boxes.dtype.kind != "f":
+        boxes = boxes.astype(np.float32)
+    return boxes.reshape(-1, 4)
+
+
+def _top_k(scores: np.ndarray, k: Optional[int]) -> np.ndarray:
+    """Indices of the ``k`` best scores, highest first (stable for ties)."""
+    if k and k < scores.size:
+        part = np.argpartition(-scores, k - 1)[:k]
+        return part[np.argsort(-scores[part], kind="stable")]
+    return np.argsort(-scores, kind="stable")
+
+
+def _greedy_matrix(boxes: np.ndarray, iou_thres: float, max_det: Optional[int]) -> np.ndarray:
+    suppress = iou_matrix(boxes, boxes) > iou_thres
+    removed = np.zeros(len(boxes), dtype=bool)
+    keep = []
+    for i in range(len(boxes)):
+        if removed[i]:
+            continue
+        keep.append(i)
+        if max_det and len(keep) >= max_det:
+            break
+        removed |= suppress[i]
+    return np.asarray(keep, dtype=np.int64)
+
+
+def _greedy_shrink(boxes: np.ndarray, iou_thres: float, max_det: Optional[int]) -> np.ndarray:
+    x1, y1, x2, y2 = boxes.T
+    areas = (x2 - x1) * (y2 - y1)
+    order = np.arange(len(boxes))
+    keep = []
+    while order.size:
+        i = order[0]
+        keep.append(i)
+        if max_det and len(keep) >= max_det:
+            break
+        rest = order[1:]
+        w = np.clip(np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest]), 0.0, None)
+        h = np.clip(np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest]), 0.0, None)
+        inter = w * h
+        order = rest[inter / (areas[i] + areas[rest] - inter + 1e-6) <= iou_thres]
+    return np.asarray(keep, dtype=np.int64)
+
+
+def nms(
+    boxes: np.ndarray,
+    scores: np.ndarray,
+    iou_thres: float,
+    *,
+    pre_top_k: Optional[int] = None,
+    max_det: Optional[int] = None,
+    matrix_limit: int = MATRIX_LIMIT,
+) -> np.ndarray:
+    """Class-agnostic greedy NMS."""
+    boxes = _as_boxes(boxes)
+    scores = np.asarray(scores).reshape(-1)
+    if not boxes.size:
+        return _EMPTY
+    order = _top_k(scores, pre_top_k)
+    candidates = boxes[order]
+    if len(order) <= matrix_limit:
+        kept = _greedy_matrix(candidates, iou_thres, max_det)
+    else:
+        kept = _greedy_shrink(candidates, iou_thres, max_det)
+    return order[kept].astype(np.int64, copy=False)
+
+
+def batched_nms(
+    boxes: np.ndarray,
+    scores: np.ndarray,
+    class_ids: np.ndarray,
+    iou_thres: float,
+    *,
+    mode: str = "offset",
+    pre_top_k: Optional[int] = None,
+    max_det: Optional[int] = None,
+    matrix_limit: int = MATRIX_LIMIT,
+) -> np.ndarray:
+    """Class-aware NMS: boxes only suppress boxes of the same class.
+
+    ``offset`` shifts every class into its own coordinate range and runs one
+    NMS pass; ``per_class`` runs NMS per class and merges by score (better when
+    a few classes dominate a very large candidate set).
+    """
+    if mode not in NMS_MODES:
+        raise ValueError(f"Unknown NMS mode {mode!r}; expected one of {NMS_MODES}")
+    boxes = _as_boxes(boxes)
+    scores = np.asarray(scores).reshape(-1)
+    class_ids = np.asarray(class_ids).reshape(-1)
+    if not boxes.size:
+        return _EMPTY
+    order = _top_k(scores, pre_top_k)
+    boxes, scores, class_ids = boxes[order], scores[order], class_ids[order]
+    if mode == "offset":
+        # float64 keeps IoUs exact once classes are pushed far apart.
+        span = float(boxes.max() - min(float(boxes.min()), 0.0)) + 1.0
+        shifted = boxes.astype(np.float64) + (class_ids.astype(np.float64) * span)[:, None]
+        keep = nms(shifted, scores, iou_thres, max_det=max_det, matrix_limit=matrix_limit)
+        return order[keep]
+    kept = [
+        members[nms(boxes[members], scores[members], iou_thres, max_det=max_det, matrix_limit=matrix_limit)]
+        for members in (np.flatnonzero(class_ids == cls) for cls in np.unique(class_ids))
+    ]
+    merged = np.concatenate(kept)
+    merged = merged[np.argsort(-scores[merged], kind="stable")]
+    if max_det:
+        merged = merged[:max_det]
+    return order[merged].astype(np.int64, copy=False)
+
+
+__all__ = ["MATRIX_LIMIT", "NMS_MODES", "batched_nms", "nms"]
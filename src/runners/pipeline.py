@@ -0,0 +1,166 @@
+"""Threaded stage pipeline for detector runners.
+
+Each stage runs on its own thread and hands results to the next one through a
+bounded queue, so frame decoding, inference, tracking and publishing overlap
+instead of running back to back.  Every stage has exactly one worker and all
+queues are FIFO, which keeps frames of the same camera in arrival order end to
+end.  A full queue blocks the stage in front of it (and finally ``submit``),
+so a slow stage throttles intake rather than buffering without bound.
+
+A stage given as ``(name, fn, max_batch)`` takes up to ``max_batch`` items
+that are already queued at once: ``fn`` receives a list and returns a list of
+results (``None`` entries are dropped).  The runner uses this to track frames
+from one batched inference run together.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class StagePipeline:
+    """Runs ``stages`` (``(name, fn)`` or ``(name, fn, max_batch)``) as a chain of worker threads.
+
+    ``fn`` receives the previous stage's result; returning ``None`` drops the
+    item.  The first exception raised by a stage is kept in ``error`` and
+    re-raised by ``submit()``/``check()``; later items are drained unprocessed.
+    """
+
+    def __init__(self, stages: Sequence[Tuple[Any, ...]], *, queue_depth: int = 4) -> None:
+        if not stages:
+            raise ValueError("pipeline needs at least one stage")
+        if queue_depth < 1:
+            raise ValueError("queue_depth must be >= 1")
+        self.stages: List[Tuple[str, Callable[[Any], Any]]] = [(stage[0], stage[1]) for stage in stages]
+        self.max_batch: Dict[str, Optional[int]] = {
+            stage[0]: int(stage[2]) if len(stage) > 2 else None for stage in stages
+        }
+        if any(size is not None and size < 1 for size in self.max_batch.values()):
+            raise ValueError("max_batch must be >= 1")
+        self.queue_depth = int(queue_depth)
+        self._queues: List["queue.Queue[Any]"] = [queue.Queue(maxsize=self.queue_depth) for _ in self.stages]
+        self._threads: List[threading.Thread] = []
+        self.error: Optional[BaseException] = None
+        self.processed: Dict[str, int] = {name: 0 for name, _ in self.stages}
+        self.busy_seconds: Dict[str, float] = {name: 0.0 for name, _ in self.stages}
+
+    def start(self) -> "StagePipeline":
+        if not self._threads:
+            for index, (name, _) in enumerate(self.stages):
+                thread = threading.Thread(target=self._work, args=(index,), name=f"stage-{name}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        return self
+
+    @property
+    def pending(self) -> int:
+        """Items waiting in the stage queues."""
+        return sum(q.qsize() for q in self._queues)
+
+    def check(self) -> None:
+        if self.error is not None:
+            raise self.error
+
+    def submit(self, item: Any) -> None:
+        """Queue ``item`` for the first stage, blocking while it is full."""
+        if not self._threads:
+            self.start()
+        while True:
+            self.check()
+            try:
+                self._queues[0].put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def close(self, timeout: Optional[float] = 5.0) -> bool:
+        """Finish queued items, then stop the workers.
+
+        Returns ``False`` if a worker is still running after ``timeout``; the
+        caller must then not release anything the stages may still touch.
+        """
+        if not self._threads:
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            self._queues[0].put(_STOP, timeout=timeout)
+        except queue.Full:
+            return False
+        for thread in self._threads:
+            thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        alive = [thread.name for thread in self._threads if thread.is_alive()]
+        if alive:
+            LOGGER.warning("Pipeline stages still running after %.1fs: %s", timeout, ", ".join(alive))
+            return False
+        self._threads = []
+        return True
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {
+                "processed": self.processed[name],
+                "busy_s": round(self.busy_seconds[name], 3),
+                "queued": self._queues[index].qsize(),
+            }
+            for index, (name, _) in enumerate(self.stages)
+        }
+
+    def __enter__(self) -> "StagePipeline":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _take(self, inbox: "queue.Queue[Any]", first: Any, limit: int) -> Tuple[List[Any], bool]:
+        """``first`` plus up to ``limit - 1`` queued items; flags a stop marker."""
+        items = [first]
+        while len(items) < limit:
+            try:
+                item = inbox.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return items, True
+            items.append(item)
+        return items, False
+
+    def _work(self, index: int) -> None:
+        name, fn = self.stages[index]
+        limit = self.max_batch[name]
+        inbox = self._queues[index]
+        outbox = self._queues[index + 1] if index + 1 < len(self._queues) else None
+        stopping = False
+        while not stopping:
+            item = inbox.get()
+            if item is _STOP:
+                break
+            if self.error is not None:
+                continue
+            items, stopping = ([item], False) if limit is None else self._take(inbox, item, limit)
+            start = time.monotonic()
+            try:
+                results = [fn(item)] if limit is None else fn(items)
+            except BaseException as exc:  # surfaced to the producer via check()
+                if not isinstance(exc, KeyboardInterrupt):
+                    LOGGER.exception("Pipeline stage %s failed", name)
+                self.error = exc
+                continue
+            finally:
+                self.busy_seconds[name] += time.monotonic() - start
+            self.processed[name] += len(items)
+            if outbox is not None:
+                for result in results:
+                    if result is not None:
+                        outbox.put(result)
+        if outbox is not None:
+            outbox.put(_STOP)
+
+__all__ = ["StagePipeline"]
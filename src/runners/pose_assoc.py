@@ -1,43 +1,71 @@
 from __future__ import annotations
 
-from typing import Iterable, List, Sequence
+from typing import Any, Iterable, Tuple
 
+import numpy as np
 
-def _bbox_iou(a: Sequence[float], b: Sequence[float]) -> float:
-    ax1, ay1, ax2, ay2 = a
-    bx1, by1, bx2, by2 = b
-    inter_w = max(0.0, min(ax2, bx2) - max(ax1, bx1))
-    inter_h = max(0.0, min(ay2, by2) - max(ay1, by1))
-    inter = inter_w * inter_h
-    if inter <= 0:
-        return 0.0
-    area_a = max(0.0, ax2 - ax1) * max(0.0, ay2 - ay1)
-    area_b = max(0.0, bx2 - bx1) * max(0.0, by2 - by1)
-    return inter / (area_a + area_b - inter + 1e-6)
+from src.trackers.matching import iou_matrix
+
+
+def _boxes(items: Any) -> Tuple[np.ndarray, np.ndarray]:
+    """xyxy boxes of a ``DetectionBatch`` or dicts, plus which rows have one."""
+    if hasattr(items, "boxes"):
+        return items.boxes, np.ones(len(items), dtype=bool)
+    boxes = np.zeros((len(items), 4), dtype=np.float32)
+    valid = np.zeros(len(items), dtype=bool)
+    for row, item in enumerate(items):
+        bbox = item.get("bbox")
+        if bbox and len(bbox) == 4:
+            boxes[row] = bbox
+            valid[row] = True
+    return boxes, valid
+
+
+def _track_info(persons: Any, row: int) -> Tuple[Any, Any]:
+    if hasattr(persons, "boxes"):
+        track_id = int(persons.track_ids[row]) if persons.track_ids is not None else -1
+        first_seen = float(persons.first_seen[row])
+        return (track_id if track_id >= 0 else None), (first_seen if first_seen == first_seen else None)
+    person = persons[row]
+    return person.get("track_id"), person.get("first_seen")
 
 
 def associate_pose_tracks(
-    persons: Iterable[dict],
-    poses: List[dict],
+    persons: Iterable[dict] | Any,
+    poses: Any,
     min_iou: float = 0.1,
-) -> List[dict]:
-    person_list = list(persons)
-    if not person_list:
+) -> Any:
+    """Give each pose the track id of its best-overlapping person.
+
+    ``persons`` and ``poses`` may each be a ``DetectionBatch`` or a list of
+    detection dicts; ``poses`` is updated in place and returned.
+    """
+    people: Any = persons if hasattr(persons, "boxes") else list(persons)
+    if not len(people) or not len(poses):
+        return poses
+    person_boxes, person_valid = _boxes(people)
+    pose_boxes, pose_valid = _boxes(poses)
+    iou = iou_matrix(pose_boxes, person_boxes)
+    iou[~pose_valid] = 0.0
+    iou[:, ~person_valid] = 0.0
+    best = iou.argmax(axis=1)
+    best_iou = iou[np.arange(len(best)), best]
+    matched = np.flatnonzero((best_iou > 0.0) & (best_iou >= min_iou))
+    if hasattr(poses, "boxes"):
+        if poses.track_ids is None:
+            poses.track_ids = np.full(len(poses), -1, dtype=np.int64)
+        for row in matched:
+            track_id, first_seen = _track_info(people, int(best[row]))
+            poses.track_ids[row] = -1 if track_id is None else int(track_id)
+            if first_seen is not None:
+                poses.first_seen[row] = first_seen
         return poses
-    for pose in poses:
-        best_iou, best_person = 0.0, None
-        for person in person_list:
-            bbox = person.get("bbox")
-            if not bbox or not pose.get("bbox"):
-                continue
-            score = _bbox_iou(bbox, pose["bbox"])
-            if score > best_iou:
-                best_iou = score
-                best_person = person
-        if best_person and best_iou >= min_iou:
-            pose["track_id"] = best_person.get("track_id")
-            if best_person.get("first_seen") is not None:
-                pose["first_seen"] = best_person["first_seen"]
+    for row in matched:
+        track_id, first_seen = _track_info(people, int(best[row]))
+        pose = poses[row]
+        pose["track_id"] = track_id
+        if first_seen is not None:
+            pose["first_seen"] = first_seen
     return poses
 
 
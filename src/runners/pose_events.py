@@ -4,7 +4,7 @@ import os
 import time
 from collections import deque
 from pathlib import Path
-from typing import Any, Deque, Dict, List, Optional
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
 
 import numpy as np
 import yaml
@@ -74,15 +74,31 @@ class PoseUseCaseMonitor:
         if "gps" in payload:
             self.telemetry.set_gps(payload["gps"])
 
-    def process(self, camera_id: str, detections: List[Dict[str, Any]], fps_hint: float | None = None) -> None:
-        fps = fps_hint or self.fps_hint
-        telemetry = self.telemetry.snapshot()
+    @staticmethod
+    def _tracked_poses(detections: Any) -> Iterator[Tuple[Any, int, np.ndarray]]:
+        """``(row key, track id, keypoints)`` for tracked poses of a batch or dict list."""
+        if hasattr(detections, "boxes"):
+            if detections.keypoints is None or detections.track_ids is None:
+                return
+            for row in np.flatnonzero(detections.track_ids >= 0).tolist():
+                yield row, int(detections.track_ids[row]), detections.keypoints[row]
+            return
         for det in detections:
             keypoints = det.get("keypoints")
             track_id = det.get("track_id")
             if keypoints is None or track_id is None:
                 continue
-            kp_array = np.asarray(keypoints, dtype=np.float32)
+            yield det, track_id, np.asarray(keypoints, dtype=np.float32)
+
+    def process(self, camera_id: str, detections: Any, fps_hint: float | None = None) -> None:
+        """Score every tracked pose; events land in each detection's ``pose_events``.
+
+        ``detections`` is a ``DetectionBatch`` (events go to its row extras) or
+        a list of detection dicts.
+        """
+        fps = fps_hint or self.fps_hint
+        telemetry = self.telemetry.snapshot()
+        for row, track_id, kp_array in self._tracked_poses(detections):
             features = self._update_track_state(track_id, kp_array, fps)
             events: List[Dict[str, Any]] = []
             latest = features[-1] if features else {}
@@ -134,7 +150,8 @@ class PoseUseCaseMonitor:
                 self._set_phone_active(track_id, False)
 
             if events:
-                det.setdefault("pose_events", []).extend(events)
+                target = detections.row_extras(row) if hasattr(detections, "boxes") else row
+                target.setdefault("pose_events", []).extend(events)
 
     def hud_lines(self) -> List[str]:
         counts = (
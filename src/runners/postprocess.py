@@ -58,28 +58,12 @@ def xywh_to_xyxy(box: "np.ndarray") -> "np.ndarray":  # type: ignore[valid-type]
 
 
 def nms(boxes: "np.ndarray", scores: "np.ndarray", iou_thres: float) -> List[int]:  # type: ignore[valid-type]
+    """Class-agnostic NMS as a list; see ``runners.nms`` for the array API."""
     if np is None:
         raise RuntimeError("numpy is required for detector execution")
-    if boxes.size == 0:
-        return []
-    x1, y1, x2, y2 = boxes.T
-    areas = (x2 - x1) * (y2 - y1)
-    order = scores.argsort()[::-1]
-    keep: List[int] = []
-    while order.size > 0:
-        i = order[0]
-        keep.append(int(i))
-        xx1 = np.maximum(x1[i], x1[order[1:]])
-        yy1 = np.maximum(y1[i], y1[order[1:]])
-        xx2 = np.minimum(x2[i], x2[order[1:]])
-        yy2 = np.minimum(y2[i], y2[order[1:]])
-        w = np.maximum(0.0, xx2 - xx1)
-        h = np.maximum(0.0, yy2 - yy1)
-        inter = w * h
-        ovr = inter / (areas[i] + areas[order[1:]] - inter + 1e-6)
-        inds = np.where(ovr <= iou_thres)[0]
-        order = order[inds + 1]
-    return keep
+    from .nms import nms as _nms
+
+    return _nms(boxes, scores, iou_thres).tolist()
 
 
 def normalise_object_output(out):
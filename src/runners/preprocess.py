@@ -0,0 +1,78 @@
+"""Allocation-free letterbox + blob preparation for fixed model inputs."""
+
+from __future__ import annotations
+
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+PAD_VALUE = 114
+
+
+class Preprocessor:
+    """Letterboxes frames into preallocated buffers for one ``(width, height)`` input.
+
+    ``cv2.resize`` writes straight into the canvas region, the padding border is
+    only repainted when the layout changes, and the CHW float32 blob (or a row
+    of a cached batch tensor) is filled in place, so steady-state calls allocate
+    no image-sized arrays.  Returned arrays are reused by the next call; the
+    object is not thread-safe, keep one per detector.
+    """
+
+    def __init__(self, width: int, height: int, *, pad_value: int = PAD_VALUE) -> None:
+        self.width = int(width)
+        self.height = int(height)
+        self.pad_value = pad_value
+        self.canvas = np.full((self.height, self.width, 3), pad_value, dtype=np.uint8)
+        self._chw = self.canvas.transpose(2, 0, 1)
+        self.blob = np.empty((1, 3, self.height, self.width), dtype=np.float32)
+        self._batches: Dict[int, np.ndarray] = {}
+        self._layout: Optional[Tuple[int, int, int, int]] = None
+
+    def letterbox(self, image: np.ndarray) -> Tuple[np.ndarray, float, Tuple[int, int]]:
+        """Same geometry as ``detectors.letterbox``; returns the shared canvas."""
+        height, width = image.shape[:2]
+        scale = min(self.width / width, self.height / height)
+        new_w = max(1, min(self.width, int(width * scale)))
+        new_h = max(1, min(self.height, int(height * scale)))
+        top = int((self.height - new_h) / 2)
+        left = int((self.width - new_w) / 2)
+        layout = (top, left, new_h, new_w)
+        if layout != self._layout:
+            self.canvas.fill(self.pad_value)
+            self._layout = layout
+        region = self.canvas[top : top + new_h, left : left + new_w]
+        if image.ndim == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        if (new_h, new_w) == (height, width):
+            region[...] = image
+        else:
+            cv2.resize(image, (new_w, new_h), dst=region, interpolation=cv2.INTER_LINEAR)
+        return self.canvas, scale, (left, top)
+
+    def to_blob(
+        self, image: np.ndarray, out: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, float, Tuple[int, int]]:
+        """Letterbox ``image`` and write it as normalised CHW float32.
+
+        ``out`` may be a ``(3, H, W)`` row of a batch tensor; by default the
+        shared ``(1, 3, H, W)`` blob is filled and returned.
+        """
+        _, scale, pad = self.letterbox(image)
+        target = self.blob[0] if out is None else out
+        np.copyto(target, self._chw)
+        target *= np.float32(1.0 / 255.0)
+        return (self.blob if out is None else target), scale, pad
+
+    def batch(self, rows: int, used: int = 0) -> np.ndarray:
+        """Cached ``(rows, 3, H, W)`` tensor with rows from ``used`` on zeroed."""
+        batch = self._batches.get(rows)
+        if batch is None:
+            batch = self._batches[rows] = np.zeros((rows, 3, self.height, self.width), dtype=np.float32)
+        elif used < rows:
+            batch[used:] = 0.0
+        return batch
+
+
+__all__ = ["PAD_VALUE", "Preprocessor"]
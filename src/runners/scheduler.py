@@ -0,0 +1,190 @@
+"""Adaptive frame scheduling for detector runners.
+
+The base interval comes from the profile's ``interval_overrides`` for the use
+cases a detector serves (the smallest one wins, since every use case must see
+frames at least that often), falling back to the detector's own ``interval``.
+``FrameScheduler`` then widens the interval when the runner cannot keep up and
+narrows it again once load falls::
+
+    usecases: [trespassing_on_track, unattended_baggage]
+    scheduler:
+      adaptive: true
+      max_interval: 8          # never skip more than 7 of 8 frames
+      max_lag_ms: 1500         # frames older than this are dropped, not queued
+      target_utilisation: 0.85 # busy fraction the runner aims for
+      backlog_limit: 32        # queued frame records treated as overload
+
+``PROFILE_CONFIG`` (or ``configs/profile_<PROFILE>.yaml``) selects the profile.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import yaml
+
+LOGGER = logging.getLogger(__name__)
+
+
+def profile_path() -> Path:
+    explicit = os.getenv("PROFILE_CONFIG")
+    if explicit:
+        return Path(explicit)
+    return Path("configs") / f"profile_{os.getenv('PROFILE', 'demo')}.yaml"
+
+
+def load_profile(path: Optional[Path] = None) -> Dict[str, Any]:
+    path = path or profile_path()
+    if not path.exists():
+        return {}
+    try:
+        return yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    except (OSError, yaml.YAMLError) as exc:
+        LOGGER.warning("Failed to read profile %s: %s", path, exc)
+        return {}
+
+
+def base_interval(config: Dict[str, Any], profile: Optional[Dict[str, Any]] = None) -> int:
+    """Frame interval for ``config`` under ``profile``'s ``interval_overrides``."""
+    default = max(1, int(config.get("interval", 1)))
+    profile = profile or {}
+    overrides = profile.get("interval_overrides") or {}
+    enabled = set(profile.get("usecases") or overrides)
+    intervals = [
+        int(overrides[usecase])
+        for usecase in config.get("usecases") or []
+        if usecase in enabled and usecase in overrides
+    ]
+    return max(1, min(intervals)) if intervals else default
+
+
+class FrameScheduler:
+    """Decides per camera which frames get processed.
+
+    ``admit()`` is asked once per incoming frame; ``record()`` reports the
+    seconds of work spent on processed frames.  Once per ``window`` the
+    scheduler compares the busy fraction with ``target_utilisation``: when
+    overloaded (too busy, frames older than ``max_lag`` or a reader backlog
+    above ``backlog_limit``) the interval grows, when the load would still fit
+    at a smaller interval it shrinks one step at a time.  Stale frames are
+    dropped outright so the runner skips rather than lags.
+    """
+
+    def __init__(
+        self,
+        base_interval: int = 1,
+        *,
+        max_interval: int = 8,
+        max_lag: Optional[float] = 1.5,
+        target_utilisation: float = 0.85,
+        backlog_limit: int = 32,
+        window: float = 1.0,
+        adaptive: bool = True,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if not 0.0 < target_utilisation <= 1.0:
+            raise ValueError("target_utilisation must be in (0, 1]")
+        self.base_interval = max(1, int(base_interval))
+        self.max_interval = max(self.base_interval, int(max_interval)) if adaptive else self.base_interval
+        self.max_lag = max_lag if adaptive and max_lag else None
+        self.target_utilisation = float(target_utilisation)
+        self.backlog_limit = int(backlog_limit)
+        self.window = float(window)
+        self.adaptive = adaptive
+        self._clock = clock
+        self.interval = self.base_interval
+        self.utilisation = 0.0
+        self.admitted = 0
+        self.skipped = 0
+        self.dropped = 0
+        self._counters: Dict[str, int] = {}
+        self._window_start = clock()
+        self._busy = 0.0
+        self._busy_lock = threading.Lock()
+        self._overloaded = False
+
+    def admit(self, camera_id: str, timestamp: Optional[float] = None, *, backlog: int = 0) -> bool:
+        """``True`` if this frame of ``camera_id`` should be processed."""
+        now = self._clock()
+        self._adapt(now)
+        if self.max_lag is not None and timestamp is not None and now - float(timestamp) > self.max_lag:
+            self.dropped += 1
+            self._overloaded = True
+            return False
+        if self.adaptive and backlog > self.backlog_limit:
+            self._overloaded = True
+        count = self._counters.get(camera_id, 0)
+        self._counters[camera_id] = count + 1
+        if count % self.interval:
+            self.skipped += 1
+            return False
+        self.admitted += 1
+        return True
+
+    def record(self, busy_seconds: float) -> None:
+        """Add work time; may be called from pipeline stage threads."""
+        with self._busy_lock:
+            self._busy += max(0.0, busy_seconds)
+
+    def _adapt(self, now: float) -> None:
+        elapsed = now - self._window_start
+        if not self.adaptive or elapsed < self.window:
+            return
+        with self._busy_lock:
+            busy, self._busy = self._busy, 0.0
+        self.utilisation = busy / elapsed
+        target = self.target_utilisation
+        interval = self.interval
+        if self._overloaded:
+            interval = interval * 2
+        elif self.utilisation > target:
+            interval = math.ceil(interval * self.utilisation / target)
+        elif interval > self.base_interval and self.utilisation * interval / (interval - 1) < 0.9 * target:
+            interval -= 1
+        interval = min(self.max_interval, max(self.base_interval, interval))
+        if interval != self.interval:
+            LOGGER.info(
+                "Frame interval %d -> %d (utilisation %.2f, dropped %d stale frames)",
+                self.interval,
+                interval,
+                self.utilisation,
+                self.dropped,
+            )
+            self.interval = interval
+        self._window_start = now
+        self._overloaded = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "interval": self.interval,
+            "base_interval": self.base_interval,
+            "utilisation": round(self.utilisation, 3),
+            "admitted": self.admitted,
+            "skipped": self.skipped,
+            "dropped": self.dropped,
+        }
+
+
+def build_scheduler(config: Dict[str, Any], profile: Optional[Dict[str, Any]] = None) -> FrameScheduler:
+    """``FrameScheduler`` for a detector config (profile loaded if not given)."""
+    if profile is None:
+        profile = load_profile()
+    cfg = config.get("scheduler") or {}
+    max_lag_ms = cfg.get("max_lag_ms", 1500)
+    return FrameScheduler(
+        base_interval(config, profile),
+        max_interval=int(cfg.get("max_interval", 8)),
+        max_lag=float(max_lag_ms) / 1000.0 if max_lag_ms else None,
+        target_utilisation=float(cfg.get("target_utilisation", 0.85)),
+        backlog_limit=int(cfg.get("backlog_limit", 32)),
+        adaptive=bool(cfg.get("adaptive", True)),
+    )
+
+
+__all__ = ["FrameScheduler", "base_interval", "build_scheduler", "load_profile", "profile_path"]
@@ -0,0 +1,316 @@
+"""ONNX Runtime session construction and tuning.
+
+Detector configs may carry a ``session`` block::
+
+    session:
+      intra_op_threads: 2          # 0 = let ORT use every core
+      inter_op_threads: 1
+      execution_mode: sequential   # or parallel
+      graph_optimization: all      # disable | basic | extended | all
+      optimized_model_path: artifacts/models/yolov11n.opt.onnx
+      enable_cpu_mem_arena: true
+      enable_mem_pattern: true
+      arena_extend_strategy: same_as_requested  # or next_power_of_two (CUDA)
+      io_binding: true
+
+The first load writes the optimised graph to ``optimized_model_path``; later
+loads read that file instead while it is newer than the source model.
+``ORT_INTRA_OP_THREADS`` / ``ORT_INTER_OP_THREADS`` override the thread counts
+so several runners on one host can split the cores between them.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+LOGGER = logging.getLogger(__name__)
+
+_ORT = None  # lazy-loaded onnxruntime module
+
+EXECUTION_MODES = {"sequential": "ORT_SEQUENTIAL", "parallel": "ORT_PARALLEL"}
+GRAPH_OPTIMIZATION_LEVELS = {
+    "disable": "ORT_DISABLE_ALL",
+    "basic": "ORT_ENABLE_BASIC",
+    "extended": "ORT_ENABLE_EXTENDED",
+    "all": "ORT_ENABLE_ALL",
+}
+ARENA_STRATEGIES = {"next_power_of_two": "kNextPowerOfTwo", "same_as_requested": "kSameAsRequested"}
+
+
+def _load_ort() -> Optional[Any]:
+    global _ORT
+    if _ORT is None:
+        try:  # pragma: no cover - optional dependency
+            import onnxruntime as ort_mod
+        except Exception:
+            ort_mod = None
+        _ORT = ort_mod
+    return _ORT
+
+
+def _thread_count(cfg: Dict[str, Any], key: str, env: str) -> Optional[int]:
+    value = os.getenv(env)
+    if value in (None, ""):
+        value = cfg.get(key)
+    return None if value is None else max(0, int(value))
+
+
+def _choice(cfg: Dict[str, Any], key: str, table: Dict[str, str], default: str) -> str:
+    value = str(cfg.get(key, default)).lower()
+    if value not in table:
+        raise ValueError(f"Unknown session {key} {value!r}; expected one of {sorted(table)}")
+    return table[value]
+
+
+def build_session_options(ort: Any, cfg: Optional[Dict[str, Any]] = None) -> Any:
+    """Translate a detector ``session`` block into ``ort.SessionOptions``."""
+    cfg = cfg or {}
+    options = ort.SessionOptions()
+    intra = _thread_count(cfg, "intra_op_threads", "ORT_INTRA_OP_THREADS")
+    inter = _thread_count(cfg, "inter_op_threads", "ORT_INTER_OP_THREADS")
+    if intra is not None:
+        options.intra_op_num_threads = intra
+    if inter is not None:
+        options.inter_op_num_threads = inter
+    options.execution_mode = getattr(ort.ExecutionMode, _choice(cfg, "execution_mode", EXECUTION_MODES, "sequential"))
+    options.graph_optimization_level = getattr(
+        ort.GraphOptimizationLevel, _choice(cfg, "graph_optimization", GRAPH_OPTIMIZATION_LEVELS, "all")
+    )
+    optimized = cfg.get("optimized_model_path")
+    if optimized:
+        Path(optimized).parent.mkdir(parents=True, exist_ok=True)
+        options.optimized_model_filepath = str(optimized)
+    options.enable_cpu_mem_arena = bool(cfg.get("enable_cpu_mem_arena", True))
+    options.enable_mem_pattern = bool(cfg.get("enable_mem_pattern", True))
+    return options
+
+
+def effective_options(cfg: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """The options of a ``session`` block that change the loaded session.
+
+    Defaults and env thread overrides are applied; ``optimized_model_path``
+    only names a cache file, so blocks differing in it load the same session.
+    """
+    cfg = cfg or {}
+    arena = None
+    if cfg.get("arena_extend_strategy"):
+        arena = _choice(cfg, "arena_extend_strategy", ARENA_STRATEGIES, "next_power_of_two")
+    return {
+        "intra_op_threads": _thread_count(cfg, "intra_op_threads", "ORT_INTRA_OP_THREADS"),
+        "inter_op_threads": _thread_count(cfg, "inter_op_threads", "ORT_INTER_OP_THREADS"),
+        "execution_mode": _choice(cfg, "execution_mode", EXECUTION_MODES, "sequential"),
+        "graph_optimization": _choice(cfg, "graph_optimization", GRAPH_OPTIMIZATION_LEVELS, "all"),
+        "enable_cpu_mem_arena": bool(cfg.get("enable_cpu_mem_arena", True)),
+        "enable_mem_pattern": bool(cfg.get("enable_mem_pattern", True)),
+        "arena_extend_strategy": arena,
+        "io_binding": bool(cfg.get("io_binding", False)),
+    }
+
+
+def _providers(ort: Any, cfg: Dict[str, Any]) -> List[Any]:
+    if "CUDAExecutionProvider" not in ort.get_available_providers():
+        return ["CPUExecutionProvider"]
+    cuda: Dict[str, Any] = {}
+    if cfg.get("arena_extend_strategy"):
+        cuda["arena_extend_strategy"] = _choice(cfg, "arena_extend_strategy", ARENA_STRATEGIES, "next_power_of_two")
+    return [("CUDAExecutionProvider", cuda), "CPUExecutionProvider"]
+
+
+class BoundSession:
+    """``InferenceSession`` wrapper whose ``run`` goes through IO binding.
+
+    Inputs are bound in place (no per-call feed-dict conversion) and outputs
+    are allocated on the session's device, then copied back once.
+    """
+
+    def __init__(self, session: Any) -> None:
+        self.session = session
+        self._binding = session.io_binding()
+        providers = session.get_providers() if hasattr(session, "get_providers") else []
+        self.device = "cuda" if providers and providers[0] == "CUDAExecutionProvider" else "cpu"
+        self._output_names = [output.name for output in session.get_outputs()]
+
+    def run(self, output_names: Optional[List[str]], feeds: Dict[str, Any]) -> List[np.ndarray]:
+        binding = self._binding
+        binding.clear_binding_inputs()
+        binding.clear_binding_outputs()
+        for name, value in feeds.items():
+            binding.bind_cpu_input(name, np.ascontiguousarray(value))
+        for name in output_names or self._output_names:
+            binding.bind_output(name, self.device)
+        self.session.run_with_iobinding(binding)
+        return binding.copy_outputs_to_cpu()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.session, name)
+
+
+def _optimized_cache(model_path: Path, cfg: Dict[str, Any]) -> Optional[Path]:
+    """``optimized_model_path`` if it exists and is newer than ``model_path``."""
+    optimized = cfg.get("optimized_model_path")
+    if not optimized:
+        return None
+    cached = Path(optimized)
+    if not cached.is_file() or cached.stat().st_mtime < model_path.stat().st_mtime:
+        return None
+    return cached
+
+
+def load_onnx_session(model_path: Path, session_cfg: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+    ort = _load_ort()
+    if ort is None:
+        LOGGER.warning(
+            "onnxruntime not available; falling back to heuristic detections."
+        )
+        return None
+    if not model_path.exists():
+        LOGGER.warning(
+            "ONNX model %s not found; falling back to heuristic detections.", model_path
+        )
+        return None
+    cfg = session_cfg or {}
+    providers = _providers(ort, cfg)
+    cached = _optimized_cache(model_path, cfg)
+    if cached is not None:
+        # The cache already holds the optimised graph: load it with only the
+        # basic (hardware-independent) passes and don't write it again.
+        options = build_session_options(
+            ort, {**cfg, "graph_optimization": "basic", "optimized_model_path": None}
+        )
+        try:
+            session = ort.InferenceSession(str(cached), sess_options=options, providers=providers)
+        except Exception as exc:  # pragma: no cover - runtime specific
+            LOGGER.warning("Ignoring optimized model cache %s (%s); rebuilding it.", cached, exc)
+        else:
+            LOGGER.info("Loaded optimized model cache %s for %s", cached, model_path)
+            return BoundSession(session) if cfg.get("io_binding") else session
+    options = build_session_options(ort, cfg)
+    try:
+        session = ort.InferenceSession(str(model_path), sess_options=options, providers=providers)
+    except Exception as exc:  # pragma: no cover - runtime specific
+        LOGGER.error(
+            "Failed to load ONNX model %s (%s); falling back to heuristic detections.",
+            model_path,
+            exc,
+        )
+        return None
+    if cfg.get("io_binding"):
+        return BoundSession(session)
+    return session
+
+
+class _Entry:
+    __slots__ = ("session", "lock", "refs")
+
+    def __init__(self, session: Any) -> None:
+        self.session = session
+        self.lock = threading.Lock()
+        self.refs = 0
+
+
+class SharedSession:
+    """One detector's handle on a registry session.
+
+    ``run`` is serialised per model (IO bindings are stateful and concurrent
+    runs would only fight over the same intra-op threads); everything else is
+    forwarded to the underlying session.  ``release()`` is idempotent.
+    """
+
+    def __init__(self, registry: "SessionRegistry", key: Tuple[str, str], entry: _Entry) -> None:
+        self._registry = registry
+        self._key = key
+        self._entry: Optional[_Entry] = entry
+        self.session = entry.session
+
+    def run(self, output_names: Optional[List[str]], feeds: Dict[str, Any]) -> List[np.ndarray]:
+        entry = self._entry
+        if entry is None:
+            raise RuntimeError("Session handle was released")
+        with entry.lock:
+            return entry.session.run(output_names, feeds)
+
+    def release(self) -> None:
+        if self._entry is not None:
+            self._entry = None
+            self._registry._release(self._key)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.session, name)
+
+
+class SessionRegistry:
+    """Process-wide cache of loaded models keyed by path and session options.
+
+    ``acquire`` returns a ``SharedSession`` handle and bumps the model's
+    reference count; the session is dropped once every handle is released.
+    """
+
+    def __init__(self, loader: Any = None) -> None:
+        self._loader = loader or load_onnx_session
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str], _Entry] = {}
+
+    @staticmethod
+    def key(model_path: Path, session_cfg: Optional[Dict[str, Any]] = None) -> Tuple[str, str]:
+        return str(Path(model_path).resolve()), json.dumps(effective_options(session_cfg), sort_keys=True)
+
+    def acquire(self, model_path: Path, session_cfg: Optional[Dict[str, Any]] = None) -> Optional[SharedSession]:
+        key = self.key(model_path, session_cfg)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                # Loading under the registry lock keeps two detectors from
+                # building the same model concurrently.
+                session = self._loader(Path(model_path), session_cfg)
+                if session is None:
+                    return None
+                entry = self._entries[key] = _Entry(session)
+            else:
+                LOGGER.info("Reusing loaded ONNX session for %s", model_path)
+            entry.refs += 1
+            return SharedSession(self, key, entry)
+
+    def _release(self, key: Tuple[str, str]) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.refs -= 1
+            if entry.refs <= 0:
+                del self._entries[key]
+
+    def refcount(self, model_path: Path, session_cfg: Optional[Dict[str, Any]] = None) -> int:
+        with self._lock:
+            entry = self._entries.get(self.key(model_path, session_cfg))
+            return entry.refs if entry is not None else 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+SESSIONS = SessionRegistry()
+
+
+def acquire_session(model_path: Path, session_cfg: Optional[Dict[str, Any]] = None) -> Optional[SharedSession]:
+    """Shared session for ``model_path`` from the process-wide registry."""
+    return SESSIONS.acquire(model_path, session_cfg)
+
+
+__all__ = [
+    "BoundSession",
+    "SESSIONS",
+    "SessionRegistry",
+    "SharedSession",
+    "acquire_session",
+    "build_session_options",
+    "effective_options",
+    "load_onnx_session",
+]
@@ -3,13 +3,25 @@
 from __future__ import annotations
 
 import os
-from typing import Dict, List
+import time
+from typing import Any, Dict, List, Mapping, Optional, Union
+
+import numpy as np
 
 from .bytetrack import ByteTrack, SimpleTracker, TrackState
 
+Tracker = Union[ByteTrack, SimpleTracker]
+
 
 class TrackerManager:
-    """Manages per-camera trackers (ByteTrack by default)."""
+    """Manages per-camera trackers (ByteTrack by default).
+
+    ``update()`` tracks one camera's frame; ``update_cameras()`` takes a
+    multi-camera batch (``camera_ids``, ``offsets``, ``segment(i)``, e.g. a
+    ``MultiCameraBatch`` built from one batched inference run) and tracks every
+    camera's rows in a single call, writing ``track_ids`` back into the shared
+    arrays.  ``stats()`` reports per-camera timings and tracker stage times.
+    """
 
     def __init__(
         self,
@@ -19,17 +31,22 @@ class TrackerManager:
         match_iou: float = 0.3,
         max_age: int = 30,
         reid_engine=None,
+        motion: bool = True,
+        embedding_momentum: float = 0.9,
     ) -> None:
         self.algorithm = algorithm.lower()
-        self.trackers: Dict[str, object] = {}
+        self.trackers: Dict[str, Tracker] = {}
         self.high_thresh = high_thresh
         self.low_thresh = low_thresh
         self.match_iou = match_iou
         self.max_age = max_age
         self.reid_engine = reid_engine
-        self._cache: Dict[str, List[Dict[str, object]]] = {}
+        self.motion = motion
+        self.embedding_momentum = embedding_momentum
+        self._cache: Dict[str, Any] = {}
+        self._timings: Dict[str, Dict[str, float]] = {}
 
-    def _build_tracker(self) -> object:
+    def _build_tracker(self) -> Tracker:
         if self.algorithm == "simple":
             return SimpleTracker(max_age=self.max_age, iou_thresh=self.match_iou)
         return ByteTrack(
@@ -38,29 +55,88 @@ class TrackerManager:
             match_iou=self.match_iou,
             max_age=self.max_age,
             reid_engine=self.reid_engine,
+            motion=self.motion,
+            embedding_momentum=self.embedding_momentum,
         )
 
-    def for_camera(self, camera_id: str) -> object:
+    def for_camera(self, camera_id: str) -> Tracker:
         if camera_id not in self.trackers:
             self.trackers[camera_id] = self._build_tracker()
         return self.trackers[camera_id]
 
-    def update(
-        self, camera_id: str, detections: List[Dict[str, object]]
-    ) -> List[Dict[str, object]]:
+    def _record(self, camera_id: str, seconds: float, detections: int) -> None:
+        timing = self._timings.setdefault(camera_id, {"updates": 0, "detections": 0, "busy_s": 0.0, "last_ms": 0.0})
+        timing["updates"] += 1
+        timing["detections"] += detections
+        timing["busy_s"] += seconds
+        timing["last_ms"] = seconds * 1000.0
+
+    def update(self, camera_id: str, detections: Any, steps: int = 1) -> Any:
+        """Track a ``DetectionBatch`` or a list of detection dicts in place.
+
+        ``steps`` is the number of frames since this camera's previous update.
+        """
+        start = time.perf_counter()
         tracker = self.for_camera(camera_id)
-        updated = tracker.update(detections)
+        updated = tracker.update(detections, steps=steps)
         self._cache[camera_id] = updated
+        self._record(camera_id, time.perf_counter() - start, len(detections))
         return updated
 
+    def update_cameras(self, detections: Any, steps: Optional[Mapping[str, int]] = None) -> Any:
+        """Track a multi-camera batch in one call; ``steps`` maps camera -> frame gap.
+
+        Each camera's rows go through that camera's tracker as a view of the
+        shared arrays; ``latest_detections()`` then returns those views.
+        """
+        steps = steps or {}
+        batch = detections.batch
+        track_ids = np.full(len(batch), -1, dtype=np.int64)
+        for index, camera_id in enumerate(detections.camera_ids):
+            start = time.perf_counter()
+            segment = detections.segment(index)
+            updated = self.for_camera(camera_id).update(segment, steps=steps.get(camera_id, 1))
+            track_ids[detections.offsets[index] : detections.offsets[index + 1]] = updated.track_ids
+            self._cache[camera_id] = updated
+            self._record(camera_id, time.perf_counter() - start, len(segment))
+        batch.track_ids = track_ids
+        return detections
+
+    def coast(self, camera_id: str, steps: int = 1) -> List[Dict[str, object]]:
+        """Advance a camera's tracks through frames that were not detected."""
+        tracker = self.trackers.get(camera_id)
+        if tracker is None:
+            return []
+        if isinstance(tracker, ByteTrack):
+            return tracker.coast(steps)
+        return tracker.get_active_tracks()
+
     def get_tracks(self, camera_id: str) -> List[Dict[str, object]]:
         tracker = self.trackers.get(camera_id)
         if tracker is None:
             return []
         return tracker.get_active_tracks()
 
-    def latest_detections(self, camera_id: str) -> List[Dict[str, object]]:
+    def latest_detections(self, camera_id: str) -> Any:
         return self._cache.get(camera_id, [])
 
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per camera: update count, detections, busy time and stage seconds."""
+        report: Dict[str, Dict[str, Any]] = {}
+        for camera_id, timing in self._timings.items():
+            updates = timing["updates"]
+            entry: Dict[str, Any] = {
+                "updates": updates,
+                "detections": timing["detections"],
+                "busy_s": round(timing["busy_s"], 4),
+                "mean_ms": round(timing["busy_s"] * 1000.0 / updates, 3) if updates else 0.0,
+                "last_ms": round(timing["last_ms"], 3),
+            }
+            stages = getattr(self.trackers.get(camera_id), "timings", None)
+            if stages:
+                entry["stages_s"] = {stage: round(seconds, 4) for stage, seconds in stages.items()}
+            report[camera_id] = entry
+        return report
+
 
 __all__ = ["ByteTrack", "SimpleTracker", "TrackerManager", "TrackState"]
@@ -1,20 +1,41 @@
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
 
-def _iou(box_a: Sequence[float], box_b: Sequence[float]) -> float:
-    ax1, ay1, ax2, ay2 = box_a
-    bx1, by1, bx2, by2 = box_b
-    inter_w = max(0.0, min(ax2, bx2) - max(ax1, bx1))
-    inter_h = max(0.0, min(ay2, by2) - max(ay1, by1))
-    inter = inter_w * inter_h
-    if inter <= 0:
-        return 0.0
-    area_a = max(0.0, ax2 - ax1) * max(0.0, ay2 - ay1)
-    area_b = max(0.0, bx2 - bx1) * max(0.0, by2 - by1)
-    return inter / (area_a + area_b - inter + 1e-6)
+from .kalman import KalmanBoxFilter, states_to_boxes
+from .matching import iou_matrix, linear_assignment
+from .track_table import TrackTable, TrackView, l2_normalize
+
+_NO_SLOTS = np.empty(0, dtype=np.int64)
+
+
+def _columns(detections: Any) -> Tuple[np.ndarray, np.ndarray, Optional[Sequence[Any]]]:
+    """Boxes, scores and embeddings of a ``DetectionBatch`` or a list of dicts."""
+    if hasattr(detections, "boxes"):
+        return detections.boxes, detections.scores, detections.embeddings
+    boxes = np.asarray([det["bbox"] for det in detections], dtype=np.float32).reshape(-1, 4)
+    scores = np.asarray([float(det.get("confidence", 0.0)) for det in detections], dtype=np.float32)
+    embeddings = [det.get("embedding") for det in detections]
+    return boxes, scores, embeddings
+
+
+def _features(embeddings: Optional[Sequence[Any]]) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """Unit-length ``(N, D)`` detection embeddings and a mask of rows that had one."""
+    if embeddings is None:
+        return None
+    if isinstance(embeddings, np.ndarray):
+        return l2_normalize(embeddings), np.ones(len(embeddings), dtype=bool)
+    present = np.asarray([embedding is not None for embedding in embeddings], dtype=bool)
+    if not present.any():
+        return None
+    vectors = np.stack([np.asarray(embeddings[int(row)], dtype=np.float32).ravel() for row in np.flatnonzero(present)])
+    matrix = np.zeros((len(embeddings), vectors.shape[1]), dtype=np.float32)
+    matrix[present] = l2_normalize(vectors)
+    return matrix, present
 
 
 @dataclass
@@ -28,7 +49,26 @@ class TrackState:
 
 
 class ByteTrack:
-    """Minimal ByteTrack-style tracker (greedy IoU matching with high/low thresholds)."""
+    """Minimal ByteTrack-style tracker (optimal IoU assignment with high/low thresholds).
+
+    Track state lives in a ``TrackTable`` (one array per attribute), so aging,
+    pruning and association run as array operations however many objects a
+    camera sees.  With ``motion`` enabled every track carries a
+    constant-velocity Kalman state and association uses the predicted boxes,
+    so IDs survive detection running only every few frames.  ``max_age``
+    counts frames: pass the number of frames since the previous call as
+    ``steps`` (or ``coast()`` through skipped frames).
+
+    With a ``reid_engine`` detections carrying embeddings are also compared
+    by appearance: track embeddings are kept L2-normalised in one matrix, a
+    single matrix product gives every detection x track cosine similarity,
+    pairs below ``reid_engine.threshold`` are vetoed and the rest score
+    ``max(IoU, cosine)``.  Matched tracks fold new embeddings in as an
+    exponential moving average weighted by ``embedding_momentum``.
+
+    ``timings`` accumulates the seconds spent per update stage (``predict``,
+    ``associate``, ``spawn``).
+    """
 
     def __init__(
         self,
@@ -37,127 +77,168 @@ class ByteTrack:
         match_iou: float = 0.3,
         max_age: int = 30,
         reid_engine=None,
+        motion: bool = True,
+        embedding_momentum: float = 0.9,
     ) -> None:
+        if not 0.0 <= embedding_momentum < 1.0:
+            raise ValueError("embedding_momentum must be in [0, 1)")
         self.high_thresh = high_thresh
         self.low_thresh = low_thresh
         self.match_iou = match_iou
         self.max_age = max_age
-        self._tracks: Dict[int, TrackState] = {}
+        self._table = TrackTable()
         self._next_id = 1
         self.reid_engine = reid_engine
+        self.embedding_momentum = embedding_momentum
+        self.kalman = KalmanBoxFilter() if motion else None
+        self.timings: Dict[str, float] = {"predict": 0.0, "associate": 0.0, "spawn": 0.0}
 
-    def _spawn_track(self, det: Dict[str, object]) -> TrackState:
-        tid = self._next_id
-        self._next_id += 1
-        track = TrackState(
-            track_id=tid,
-            bbox=list(det["bbox"]),
-            score=float(det.get("confidence", 0.0)),
-        )
-        self._tracks[tid] = track
-        det["track_id"] = tid
-        det["first_seen"] = det.get("timestamp")
-        return track
+    @property
+    def tracks(self) -> TrackView:
+        """Live tracks as parallel arrays."""
+        return self._table.view()
 
-    def _match(
-        self, tracks: Iterable[TrackState], detections: List[Dict[str, object]]
+    def _spawn_tracks(self, boxes: np.ndarray, scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """New tracks for ``boxes``; returns ``(track_ids, slots)``."""
+        ids = np.arange(self._next_id, self._next_id + len(boxes), dtype=np.int64)
+        self._next_id += len(boxes)
+        means, covariances = self.kalman.initiate(boxes) if self.kalman and len(boxes) else (None, None)
+        return ids, self._table.add(ids, boxes, scores, means, covariances)
+
+    def _predict(self, steps: int) -> None:
+        """Age tracks by ``steps`` frames, drop stale ones and move the rest."""
+        table = self._table
+        table.age(steps, self.max_age)
+        slots = table.slots
+        if self.kalman is None or not len(slots) or steps <= 0:
+            return
+        means, covariances = self.kalman.predict(table.means[slots], table.covariances[slots], steps)
+        table.means[slots] = means
+        table.covariances[slots] = covariances
+        table.boxes[slots] = states_to_boxes(means)
+
+    def coast(self, steps: int = 1) -> List[Dict[str, object]]:
+        """Advance tracks through ``steps`` frames without detections."""
+        self._predict(steps)
+        return self.get_active_tracks()
+
+    def _similarity(
+        self,
+        slots: np.ndarray,
+        rows: np.ndarray,
+        boxes: np.ndarray,
+        features: Optional[Tuple[np.ndarray, np.ndarray]],
+    ) -> np.ndarray:
+        """Detection x track similarity; ``-inf`` marks pairs ReID rules out."""
+        table = self._table
+        similarity = iou_matrix(boxes[rows], table.boxes[slots])
+        if not self.reid_engine or features is None or table.embeddings is None:
+            return similarity
+        matrix, present = features
+        if matrix.shape[1] != table.embeddings.shape[1]:
+            return similarity
+        usable = present[rows][:, None] & table.has_embedding[slots][None, :]
+        if not usable.any():
+            return similarity
+        # Both sides are unit length, so the product is the cosine similarity.
+        cosine = matrix[rows] @ table.embeddings[slots].T
+        fused = np.where(cosine < self.reid_engine.threshold, -np.inf, np.maximum(similarity, cosine))
+        return np.where(usable, fused, similarity)
+
+    def _store_embeddings(
+        self, slots: np.ndarray, rows: np.ndarray, features: Optional[Tuple[np.ndarray, np.ndarray]]
     ) -> None:
-        unmatched_tracks: Dict[int, TrackState] = {t.track_id: t for t in tracks}
-        for det in detections:
-            best_score, best_id = 0.0, None
-            for tid, state in list(unmatched_tracks.items()):
-                iou = _iou(state.bbox, det["bbox"])
-                score = iou
-                # If ReID engine is available and embeddings present, use ReID for matching
-                if (
-                    self.reid_engine
-                    and "embedding" in det
-                    and "embedding" in state.__dict__
-                ):
-                    reid_score = self.reid_engine.match(
-                        det["embedding"], state.__dict__["embedding"]
-                    )
-                    # Only match if similarity above threshold
-                    if reid_score < self.reid_engine.threshold:
-                        continue
-                    score = max(score, reid_score)
-                if score > best_score:
-                    best_score = score
-                    best_id = tid
-            if best_score >= self.match_iou and best_id is not None:
-                state = self._tracks[best_id]
-                state.bbox = list(det["bbox"])
-                state.score = float(det.get("confidence", state.score))
-                state.age = 0
-                state.hits += 1
-                if "embedding" in det:
-                    state.__dict__["embedding"] = det["embedding"]
-                det["track_id"] = best_id
-                unmatched_tracks.pop(best_id, None)
-            else:
-                det["track_id"] = None
+        if features is None:
+            return
+        matrix, present = features
+        keep = present[rows]
+        if keep.any():
+            self._table.set_embeddings(slots[keep], matrix[rows[keep]], self.embedding_momentum)
 
-    def update(self, detections: List[Dict[str, object]]) -> List[Dict[str, object]]:
-        # Age tracks and drop stale ones
-        for tid in list(self._tracks):
-            state = self._tracks[tid]
-            state.age += 1
-            if state.age > self.max_age:
-                del self._tracks[tid]
+    def _match(
+        self,
+        slots: np.ndarray,
+        rows: np.ndarray,
+        boxes: np.ndarray,
+        scores: np.ndarray,
+        features: Optional[Tuple[np.ndarray, np.ndarray]],
+        track_ids: np.ndarray,
+    ) -> np.ndarray:
+        """Assign ``rows`` to tracks in ``slots``; returns the matched slots."""
+        if not len(slots) or not len(rows):
+            return _NO_SLOTS
+        similarity = self._similarity(slots, rows, boxes, features)
+        cost = np.where(similarity > 0.0, 1.0 - similarity, np.inf)
+        pairs, _, _ = linear_assignment(cost, 1.0 - self.match_iou)
+        if not len(pairs):
+            return _NO_SLOTS
+        table = self._table
+        det_rows = rows[pairs[:, 0]]
+        matched = slots[pairs[:, 1]]
+        if self.kalman is not None:
+            means, covariances = self.kalman.update(table.means[matched], table.covariances[matched], boxes[det_rows])
+            table.means[matched] = means
+            table.covariances[matched] = covariances
+        table.boxes[matched] = boxes[det_rows]
+        table.scores[matched] = scores[det_rows]
+        table.ages[matched] = 0
+        table.hits[matched] += 1
+        self._store_embeddings(matched, det_rows, features)
+        track_ids[det_rows] = table.ids[matched]
+        return matched
 
-        high_conf = [
-            det
-            for det in detections
-            if float(det.get("confidence", 0.0)) >= self.high_thresh
-        ]
-        low_conf = [
-            det
-            for det in detections
-            if self.low_thresh <= float(det.get("confidence", 0.0)) < self.high_thresh
-        ]
+    def update(self, detections: Any, steps: int = 1) -> Any:
+        """Assign track ids to a ``DetectionBatch`` or a list of detection dicts.
+
+        ``steps`` is the number of frames since the previous update.  Batches
+        get ``track_ids`` (``-1`` = untracked) and ``first_seen`` for newly
+        spawned tracks; dicts get ``track_id``/``first_seen`` keys.
+        """
+        started = time.perf_counter()
+        boxes, scores, embeddings = _columns(detections)
+        features = _features(embeddings)
+        self._predict(steps)
+        predicted = time.perf_counter()
 
-        self._match(self._tracks.values(), high_conf)
+        track_ids = np.full(len(boxes), -1, dtype=np.int64)
+        high_conf = np.flatnonzero(scores >= self.high_thresh)
+        low_conf = np.flatnonzero((scores >= self.low_thresh) & (scores < self.high_thresh))
+
+        slots = self._table.slots
+        claimed = self._match(slots, high_conf, boxes, scores, features, track_ids)
+        matched = time.perf_counter()
 
         # Spawn tracks for unmatched high-confidence detections
-        for det in high_conf:
-            if not det.get("track_id"):
-                self._spawn_track(det)
+        spawned = high_conf[track_ids[high_conf] < 0]
+        track_ids[spawned], new_slots = self._spawn_tracks(boxes[spawned], scores[spawned])
+        self._store_embeddings(new_slots, spawned, features)
+        spawned_at = time.perf_counter()
 
         # Try to salvage low-confidence detections (keeps tracks alive)
-        self._match(
-            (
-                state
-                for state in self._tracks.values()
-                if state.track_id not in [det.get("track_id") for det in high_conf]
-            ),
-            low_conf,
-        )
-
-        for det in low_conf:
-            if not det.get("track_id"):
-                continue
-            state = self._tracks[det["track_id"]]
-            state.bbox = list(det["bbox"])
-            state.score = float(det.get("confidence", state.score))
-            state.age = 0
-
-        # Assign IDs back into detections if not already filled
-        for det in detections:
-            if det.get("track_id"):
-                continue
-            det["track_id"] = None
+        self._match(slots[~np.isin(slots, claimed)], low_conf, boxes, scores, features, track_ids)
+        self.timings["predict"] += predicted - started
+        self.timings["spawn"] += spawned_at - matched
+        self.timings["associate"] += (matched - predicted) + (time.perf_counter() - spawned_at)
+
+        if hasattr(detections, "boxes"):
+            detections.track_ids = track_ids
+            if detections.timestamp is not None:
+                detections.first_seen[spawned] = detections.timestamp
+            return detections
+        for det, tid in zip(detections, track_ids.tolist()):
+            det["track_id"] = tid if tid >= 0 else None
+        for row in spawned:
+            det = detections[row]
+            det["first_seen"] = det.get("timestamp")
         return detections
 
     def get_active_tracks(self) -> List[Dict[str, object]]:
+        view = self._table.view()
         return [
-            {
-                "track_id": state.track_id,
-                "bbox": state.bbox,
-                "confidence": state.score,
-                "age": state.age,
-                "hits": state.hits,
-            }
-            for state in self._tracks.values()
+            {"track_id": tid, "bbox": bbox, "confidence": score, "age": age, "hits": hits}
+            for tid, bbox, score, age, hits in zip(
+                view.ids.tolist(), view.boxes.tolist(), view.scores.tolist(), view.ages.tolist(), view.hits.tolist()
+            )
         ]
 
 
@@ -170,45 +251,51 @@ class SimpleTracker:
         self._tracks: Dict[int, TrackState] = {}
         self._next_id = 1
 
-    def update(self, detections: List[Dict[str, object]]) -> List[Dict[str, object]]:
+    def update(self, detections: Any, steps: int = 1) -> Any:
         for tid in list(self._tracks):
-            self._tracks[tid].age += 1
+            self._tracks[tid].age += steps
             if self._tracks[tid].age > self.max_age:
                 del self._tracks[tid]
 
-        for det in detections:
-            if det.get("track_id"):
-                tid = int(det["track_id"])
-                self._tracks[tid] = TrackState(
-                    track_id=tid,
-                    bbox=list(det["bbox"]),
-                    score=float(det.get("confidence", 0.0)),
-                )
+        boxes, scores, _ = _columns(detections)
+        if hasattr(detections, "boxes"):
+            given = detections.track_ids
+            track_ids = given.copy() if given is not None else np.full(len(boxes), -1, dtype=np.int64)
+        else:
+            track_ids = np.asarray(
+                [int(det["track_id"]) if det.get("track_id") else -1 for det in detections], dtype=np.int64
+            )
 
-        for det in detections:
-            if det.get("track_id"):
-                continue
-            best_iou, best_id = 0.0, None
-            for tid, state in self._tracks.items():
-                iou = _iou(state.bbox, det["bbox"])
-                if iou > best_iou:
-                    best_iou = iou
-                    best_id = tid
-            if best_iou >= self.iou_thresh and best_id is not None:
-                state = self._tracks[best_id]
-                state.bbox = list(det["bbox"])
-                state.score = float(det.get("confidence", state.score))
+        for row in np.flatnonzero(track_ids > 0):
+            tid = int(track_ids[row])
+            self._tracks[tid] = TrackState(track_id=tid, bbox=boxes[row].tolist(), score=float(scores[row]))
+
+        ids = list(self._tracks)
+        track_boxes = np.asarray([self._tracks[tid].bbox for tid in ids], dtype=np.float32).reshape(-1, 4)
+        for row in np.flatnonzero(track_ids <= 0):
+            iou = iou_matrix(boxes[row], track_boxes)[0] if ids else np.zeros(0)
+            best = int(np.argmax(iou)) if ids else -1
+            if best >= 0 and iou[best] > 0.0 and iou[best] >= self.iou_thresh:
+                state = self._tracks[ids[best]]
+                state.bbox = boxes[row].tolist()
+                state.score = float(scores[row])
                 state.age = 0
-                det["track_id"] = best_id
+                track_boxes[best] = boxes[row]
             else:
                 tid = self._next_id
                 self._next_id += 1
-                self._tracks[tid] = TrackState(
-                    track_id=tid,
-                    bbox=list(det["bbox"]),
-                    score=float(det.get("confidence", 0.0)),
+                state = self._tracks[tid] = TrackState(
+                    track_id=tid, bbox=boxes[row].tolist(), score=float(scores[row])
                 )
-                det["track_id"] = tid
+                ids.append(tid)
+                track_boxes = np.vstack([track_boxes, boxes[row][None]])
+            track_ids[row] = state.track_id
+
+        if hasattr(detections, "boxes"):
+            detections.track_ids = track_ids
+            return detections
+        for det, tid in zip(detections, track_ids.tolist()):
+            det["track_id"] = tid
         return detections
 
     def get_active_tracks(self) -> List[Dict[str, object]]:
@@ -0,0 +1,87 @@
+"""Constant-velocity Kalman filter for boxes, vectorised across tracks.
+
+The state of a track is ``(cx, cy, w, h, vcx, vcy, vw, vh)``; detections
+measure the first four.  Every method takes stacked arrays (``(N, 8)`` means,
+``(N, 8, 8)`` covariances) so a frame's worth of tracks is predicted or
+corrected in a handful of numpy calls.  Process and measurement noise scale
+with the box size, as in SORT/ByteTrack.
+"""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+_NDIM = 4
+
+
+def boxes_to_measurements(boxes: np.ndarray) -> np.ndarray:
+    """``(N, 4)`` xyxy boxes as ``(N, 4)`` ``(cx, cy, w, h)``."""
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    wh = boxes[:, 2:] - boxes[:, :2]
+    return np.concatenate([boxes[:, :2] + wh / 2.0, wh], axis=1)
+
+
+def states_to_boxes(mean: np.ndarray) -> np.ndarray:
+    """xyxy boxes for ``(N, 8)`` states (sizes clamped to at least one pixel)."""
+    mean = np.asarray(mean).reshape(-1, 2 * _NDIM)
+    half = np.maximum(mean[:, 2:4], 1.0) / 2.0
+    return np.concatenate([mean[:, :2] - half, mean[:, :2] + half], axis=1)
+
+
+class KalmanBoxFilter:
+    """Batched predict/update for constant-velocity box tracks."""
+
+    def __init__(self, std_weight_position: float = 1.0 / 20, std_weight_velocity: float = 1.0 / 160) -> None:
+        self.std_weight_position = std_weight_position
+        self.std_weight_velocity = std_weight_velocity
+        self._motion = np.eye(2 * _NDIM)
+        self._motion[:_NDIM, _NDIM:] = np.eye(_NDIM)
+
+    def _scale(self, wh: np.ndarray) -> np.ndarray:
+        """``(N, 4)`` per-coordinate size scale ``(w, h, w, h)``."""
+        wh = np.maximum(wh, 1.0)
+        return np.concatenate([wh, wh], axis=1)
+
+    def initiate(self, boxes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """New tracks at rest on ``(N, 4)`` xyxy ``boxes``."""
+        measurement = boxes_to_measurements(boxes)
+        mean = np.concatenate([measurement, np.zeros_like(measurement)], axis=1)
+        scale = self._scale(measurement[:, 2:])
+        std = np.concatenate(
+            [2 * self.std_weight_position * scale, 10 * self.std_weight_velocity * scale], axis=1
+        )
+        covariance = np.zeros((len(mean), 2 * _NDIM, 2 * _NDIM))
+        idx = np.arange(2 * _NDIM)
+        covariance[:, idx, idx] = std**2
+        return mean, covariance
+
+    def predict(self, mean: np.ndarray, covariance: np.ndarray, steps: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """Advance every track ``steps`` frames."""
+        idx = np.arange(2 * _NDIM)
+        for _ in range(max(0, int(steps))):
+            scale = self._scale(mean[:, 2:4])
+            std = np.concatenate([self.std_weight_position * scale, self.std_weight_velocity * scale], axis=1)
+            mean = mean @ self._motion.T
+            covariance = self._motion @ covariance @ self._motion.T
+            covariance[:, idx, idx] += std**2
+        return mean, covariance
+
+    def update(
+        self, mean: np.ndarray, covariance: np.ndarray, boxes: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Correct each track with its matched ``(N, 4)`` xyxy box."""
+        measurement = boxes_to_measurements(boxes)
+        idx = np.arange(_NDIM)
+        innovation_cov = covariance[:, :_NDIM, :_NDIM].copy()
+        innovation_cov[:, idx, idx] += (self.std_weight_position * self._scale(mean[:, 2:4])) ** 2
+        # K = P H^T S^-1, solved rather than inverted (S is symmetric).
+        gain = np.linalg.solve(innovation_cov, covariance[:, :_NDIM, :]).transpose(0, 2, 1)
+        innovation = measurement - mean[:, :_NDIM]
+        mean = mean + np.einsum("nij,nj->ni", gain, innovation)
+        covariance = covariance - gain @ innovation_cov @ gain.transpose(0, 2, 1)
+        return mean, covariance
+
+
+__all__ = ["KalmanBoxFilter", "boxes_to_measurements", "states_to_boxes"]
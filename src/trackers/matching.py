@@ -0,0 +1,122 @@
+"""Detection-to-track association on cost matrices.
+
+``iou_matrix`` scores every detection against every track in one numpy pass
+(the runners' NMS and pose-to-person association use it too) and
+``linear_assignment`` solves the resulting cost matrix optimally (minimum
+total cost) instead of greedily in detection order.  SciPy's
+``linear_sum_assignment`` is used when installed; otherwise a numpy
+implementation of the shortest-augmenting-path Hungarian algorithm (the same
+family as LAPJV) takes over, giving identical assignments.  Pairs costing more
+than ``cost_limit`` are gated out and never matched.
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+try:  # pragma: no cover - optional dependency
+    from scipy.optimize import linear_sum_assignment as _scipy_assignment
+except Exception:  # pragma: no cover - scipy missing
+    _scipy_assignment = None
+
+_EMPTY_PAIRS = np.empty((0, 2), dtype=np.int64)
+
+
+def iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU of ``(N, 4)`` and ``(M, 4)`` xyxy boxes as ``(N, M)``."""
+    a = np.asarray(a, dtype=np.float32).reshape(-1, 4)
+    b = np.asarray(b, dtype=np.float32).reshape(-1, 4)
+    area_a = np.clip(a[:, 2] - a[:, 0], 0.0, None) * np.clip(a[:, 3] - a[:, 1], 0.0, None)
+    area_b = np.clip(b[:, 2] - b[:, 0], 0.0, None) * np.clip(b[:, 3] - b[:, 1], 0.0, None)
+    # Width and height of the overlaps, built in place to keep temporaries to two (N, M) arrays.
+    inter = np.minimum(a[:, None, 2], b[None, :, 2])
+    inter -= np.maximum(a[:, None, 0], b[None, :, 0])
+    np.maximum(inter, 0.0, out=inter)
+    height = np.minimum(a[:, None, 3], b[None, :, 3])
+    height -= np.maximum(a[:, None, 1], b[None, :, 1])
+    np.maximum(height, 0.0, out=height)
+    inter *= height
+    union = area_a[:, None] + area_b[None, :]
+    union -= inter
+    union += 1e-6
+    return np.divide(inter, union, out=inter)
+
+
+def _hungarian(cost: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Minimum-cost assignment of every row of a ``rows <= cols`` matrix."""
+    rows, cols = cost.shape
+    u = np.zeros(rows + 1)
+    v = np.zeros(cols + 1)
+    owner = np.zeros(cols + 1, dtype=np.int64)  # 1-based row owning each column
+    way = np.zeros(cols + 1, dtype=np.int64)
+    for row in range(1, rows + 1):
+        owner[0] = row
+        col = 0
+        minv = np.full(cols + 1, np.inf)
+        used = np.zeros(cols + 1, dtype=bool)
+        while True:
+            used[col] = True
+            current = owner[col]
+            reduced = cost[current - 1] - u[current] - v[1:]
+            free = ~used[1:]
+            better = free & (reduced < minv[1:])
+            minv[1:][better] = reduced[better]
+            way[1:][better] = col
+            masked = np.where(free, minv[1:], np.inf)
+            nxt = int(np.argmin(masked)) + 1
+            delta = masked[nxt - 1]
+            u[owner[used]] += delta
+            v[used] -= delta
+            minv[1:][free] -= delta
+            col = nxt
+            if owner[col] == 0:
+                break
+        while col:
+            prev = way[col]
+            owner[col] = owner[prev]
+            col = prev
+    assigned = np.flatnonzero(owner[1:])
+    return owner[assigned + 1] - 1, assigned
+
+
+def linear_assignment(
+    cost: np.ndarray, cost_limit: float, *, use_scipy: Optional[bool] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Optimal matches of ``cost`` (rows x cols) with ``cost <= cost_limit``.
+
+    Returns ``(pairs, unmatched_rows, unmatched_cols)`` where ``pairs`` is a
+    ``(K, 2)`` int64 array of ``(row, col)`` sorted by row.  Non-finite costs
+    are treated as forbidden.  ``use_scipy=None`` picks SciPy when available.
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    rows, cols = cost.shape
+    if not rows or not cols:
+        return _EMPTY_PAIRS, np.arange(rows, dtype=np.int64), np.arange(cols, dtype=np.int64)
+    # Gated pairs get a cost no valid pair can reach; they are dropped after solving.
+    gated = ~np.isfinite(cost) | (cost > cost_limit)
+    finite = cost[~gated]
+    ceiling = (float(finite.max()) if finite.size else 0.0) + abs(cost_limit) + 1.0
+    solvable = np.where(gated, ceiling, cost)
+    if use_scipy is None:
+        use_scipy = _scipy_assignment is not None
+    if use_scipy:
+        if _scipy_assignment is None:
+            raise RuntimeError("scipy is not installed")
+        row_ind, col_ind = _scipy_assignment(solvable)
+    elif rows <= cols:
+        row_ind, col_ind = _hungarian(solvable)
+    else:
+        col_ind, row_ind = _hungarian(solvable.T)
+    row_ind = np.asarray(row_ind, dtype=np.int64)
+    col_ind = np.asarray(col_ind, dtype=np.int64)
+    keep = ~gated[row_ind, col_ind]
+    pairs = np.stack([row_ind[keep], col_ind[keep]], axis=1)
+    pairs = pairs[np.argsort(pairs[:, 0], kind="stable")]
+    unmatched_rows = np.setdiff1d(np.arange(rows), pairs[:, 0])
+    unmatched_cols = np.setdiff1d(np.arange(cols), pairs[:, 1])
+    return pairs, unmatched_rows, unmatched_cols
+
+
+__all__ = ["iou_matrix", "linear_assignment"]
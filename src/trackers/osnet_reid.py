@@ -2,7 +2,7 @@
 OSNet ReID embedding engine stub for ByteTrack integration.
 """
 
-from typing import List
+from typing import Sequence, Union
 import numpy as np
 
 
@@ -12,15 +12,19 @@ class OSNetReID:
         self.threshold = threshold
         # TODO: Load TensorRT engine here
 
-    def extract_embedding(self, image: np.ndarray) -> np.ndarray:
+    def extract_embedding(self, image: Union[np.ndarray, Sequence[np.ndarray]]) -> np.ndarray:
+        """Embedding of one crop, or ``(B, D)`` embeddings of a batch of crops.
+
+        A batch is a list of crops or a ``(B, H, W, C)`` array; the real engine
+        runs it as a single inference.
+        """
+        batched = isinstance(image, (list, tuple)) or np.ndim(image) == 4
+        crops = list(image) if batched else [image]
         # Deterministic, normalized embeddings for test
-        if np.all(image == 0):
-            emb = np.ones(256)
-        elif np.all(image == 1):
-            emb = np.full(256, 2.0)
-        else:
-            emb = np.full(256, 0.5)
-        return emb / np.linalg.norm(emb)
+        values = [1.0 if np.all(crop == 0) else 2.0 if np.all(crop == 1) else 0.5 for crop in crops]
+        emb = np.repeat(np.asarray(values, dtype=np.float64).reshape(-1, 1), 256, axis=1)
+        emb = emb / np.linalg.norm(emb, axis=1, keepdims=True)
+        return emb if batched else emb[0]
 
     def match(self, emb1: np.ndarray, emb2: np.ndarray) -> float:
         # Cosine similarity
@@ -0,0 +1,152 @@
+"""Structure-of-arrays storage for tracker state.
+
+Each per-track attribute lives in its own column indexed by slot: ``ids``,
+``boxes``, ``scores``, ``ages``, ``hits``, the Kalman ``means`` and
+``covariances`` and, once a detection carried one, ``embeddings``.  Aging and
+pruning are single masked array operations, expired slots are reused by
+later spawns and the columns double in size when every slot is live.
+Embeddings are stored L2-normalised in one contiguous ``(capacity, D)``
+matrix, so a single matrix product gives detection x track cosine similarity.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+
+def l2_normalize(vectors: np.ndarray) -> np.ndarray:
+    """Rows of ``vectors`` scaled to unit length (zero rows stay zero)."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=-1, keepdims=True), 1e-12)
+
+
+_COLUMNS = ("ids", "boxes", "scores", "ages", "hits", "alive", "means", "covariances", "has_embedding")
+
+
+@dataclass(frozen=True)
+class TrackView:
+    """Live tracks as parallel arrays, in track-creation order."""
+
+    ids: np.ndarray
+    boxes: np.ndarray
+    scores: np.ndarray
+    ages: np.ndarray
+    hits: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+class TrackTable:
+    """Slot-indexed track columns plus an ``alive`` mask."""
+
+    def __init__(self, capacity: int = 32, state_dim: int = 8) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.boxes = np.zeros((capacity, 4), dtype=np.float32)
+        self.scores = np.zeros(capacity, dtype=np.float32)
+        self.ages = np.zeros(capacity, dtype=np.int64)
+        self.hits = np.zeros(capacity, dtype=np.int64)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.means = np.zeros((capacity, state_dim))
+        self.covariances = np.zeros((capacity, state_dim, state_dim))
+        self.has_embedding = np.zeros(capacity, dtype=bool)
+        self.embeddings: Optional[np.ndarray] = None
+        self._slots: Optional[np.ndarray] = None
+
+    @property
+    def capacity(self) -> int:
+        return len(self.ids)
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    @property
+    def slots(self) -> np.ndarray:
+        """Live slots ordered by track id (cached until the next change)."""
+        if self._slots is None:
+            live = np.flatnonzero(self.alive)
+            self._slots = live[np.argsort(self.ids[live], kind="stable")]
+        return self._slots
+
+    def _grow(self, needed: int) -> None:
+        capacity = max(needed, 2 * self.capacity)
+        for name in _COLUMNS + (("embeddings",) if self.embeddings is not None else ()):
+            column = getattr(self, name)
+            grown = np.zeros((capacity,) + column.shape[1:], dtype=column.dtype)
+            grown[: len(column)] = column
+            setattr(self, name, grown)
+
+    def add(
+        self,
+        ids: np.ndarray,
+        boxes: np.ndarray,
+        scores: np.ndarray,
+        means: Optional[np.ndarray] = None,
+        covariances: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Store new tracks in free slots and return those slots."""
+        count = len(ids)
+        free = np.flatnonzero(~self.alive)
+        if len(free) < count:
+            self._grow(self.capacity - len(free) + count)
+            free = np.flatnonzero(~self.alive)
+        slots = free[:count]
+        self.ids[slots] = ids
+        self.boxes[slots] = boxes
+        self.scores[slots] = scores
+        self.ages[slots] = 0
+        self.hits[slots] = 1
+        self.alive[slots] = True
+        self.has_embedding[slots] = False
+        if means is not None:
+            self.means[slots] = means
+            self.covariances[slots] = covariances
+        self._slots = None
+        return slots
+
+    def age(self, steps: int, max_age: int) -> int:
+        """Age every live track by ``steps``; drop those past ``max_age``."""
+        self.ages[self.alive] += steps
+        expired = self.alive & (self.ages > max_age)
+        count = int(np.count_nonzero(expired))
+        if count:
+            self.alive &= ~expired
+            self._slots = None
+        return count
+
+    def set_embeddings(self, slots: np.ndarray, vectors: np.ndarray, momentum: float = 0.0) -> None:
+        """Store unit-length ``vectors`` for ``slots``.
+
+        With ``momentum`` a track that already has an embedding keeps the
+        moving average ``momentum * old + (1 - momentum) * new`` instead.
+        """
+        vectors = l2_normalize(np.asarray(vectors, dtype=np.float32).reshape(len(slots), -1))
+        if self.embeddings is None or self.embeddings.shape[1] != vectors.shape[1]:
+            # First embedding (or a model with another width): start the column afresh.
+            self.embeddings = np.zeros((self.capacity, vectors.shape[1]), dtype=np.float32)
+            self.has_embedding[:] = False
+        if momentum > 0.0:
+            known = self.has_embedding[slots]
+            if known.any():
+                blended = momentum * self.embeddings[slots[known]] + (1.0 - momentum) * vectors[known]
+                vectors[known] = l2_normalize(blended)
+        self.embeddings[slots] = vectors
+        self.has_embedding[slots] = True
+
+    def view(self) -> TrackView:
+        slots = self.slots
+        return TrackView(
+            ids=self.ids[slots],
+            boxes=self.boxes[slots],
+            scores=self.scores[slots],
+            ages=self.ages[slots],
+            hits=self.hits[slots],
+        )
+
+
+__all__ = ["TrackTable", "TrackView", "l2_normalize"]
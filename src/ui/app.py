@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse
 
+from common.tail import read_last_records
+
 app = FastAPI(title="Edge CCTV UI API")
 
 
@@ -13,9 +14,7 @@ def read_events(limit: int = 20) -> list[dict]:
     path = Path("artifacts/normalized/events.log")
     if not path.exists():
         return []
-    lines = path.read_text(encoding="utf-8").strip().splitlines()
-    events = [json.loads(line) for line in lines if line]
-    return events[-limit:]
+    return read_last_records(path, limit)
 
 
 @app.get("/healthz")
@@ -1,8 +1,9 @@
-import json
 from pathlib import Path
 
 import streamlit as st
 
+from common.tail import read_last_records
+
 st.set_page_config(page_title="Edge CCTV Dashboard", layout="wide")
 st.title("Edge CCTV Analytics")
 
@@ -11,8 +12,7 @@ with col1:
     st.subheader("Recent Events")
     path = Path("artifacts/normalized/events.log")
     if path.exists():
-        events = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line]
-        for event in events[-20:]:
+        for event in read_last_records(path, 20):
             st.json(event)
     else:
         st.info("No events yet")
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+import pytest
+
+from src.runners.batching import BatchInferenceServer
+from src.runners.detectors import ObjectDetector
+
+
+class _YoloSession:
+    """Fake YOLO export: one box per image whose class is the image's fill value."""
+
+    def __init__(self, batch_dim=None):
+        self.batch_dim = batch_dim
+        self.calls = []
+
+    def get_inputs(self):
+        return [type("Input", (), {"name": "images", "shape": [self.batch_dim, 3, 64, 64]})()]
+
+    def run(self, _outputs, feeds):
+        batch = feeds["images"]
+        self.calls.append(batch.shape[0])
+        out = np.zeros((batch.shape[0], 4 + 3, 16), dtype=np.float32)
+        for row in range(batch.shape[0]):
+            out[row, :4, 0] = [32.0, 32.0, 16.0, 16.0]
+            cls = int(round(float(batch[row, 0, 32, 32]) * 255.0))
+            if cls < 3:
+                out[row, 4 + cls, 0] = 0.9
+        return [out]
+
+
+def _detector(session):
+    det = ObjectDetector({"input": {"width": 64, "height": 64}, "classes": ["a", "b", "c"], "batch_size": 4})
+    det.session = session
+    det.input_name = "images"
+    det.session_batch = session.batch_dim
+    return det
+
+
+def _images(*classes):
+    return [np.full((64, 64, 3), cls, dtype=np.uint8) for cls in classes]
+
+
+def test_detect_batch_scatters_results_per_image():
+    session = _YoloSession()
+    det = _detector(session)
+    results = det.detect_batch(_images(0, 2, 1, 1, 0))
+    assert [[d["class"] for d in dets] for dets in results] == [["a"], ["c"], ["b"], ["b"], ["a"]]
+    assert session.calls == [4, 1]
+    assert results[0] == list(det.detect(_images(0)[0]))
+
+
+def test_detect_batch_pads_fixed_batch_models():
+    session = _YoloSession(batch_dim=4)
+    det = _detector(session)
+    results = det.detect_batch(_images(1, 2))
+    assert session.calls == [4]
+    assert [d["class"] for dets in results for d in dets] == ["b", "c"]
+
+
+def test_server_batches_concurrent_cameras():
+    session = _YoloSession()
+    det = _detector(session)
+    with BatchInferenceServer(det, max_batch=4, max_wait_ms=200) as server:
+        barrier = threading.Barrier(4)
+        results = {}
+
+        def camera(cls):
+            barrier.wait()
+            results[cls] = server.infer(_images(cls % 3)[0], timeout=5)
+
+        threads = [threading.Thread(target=camera, args=(cls,)) for cls in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert {cls: dets[0]["class"] for cls, dets in results.items()} == {0: "a", 1: "b", 2: "c", 3: "a"}
+    assert server.items == 4 and server.batches < 4
+
+
+def test_server_propagates_batch_errors():
+    class _Broken:
+        def detect_batch(self, images):
+            raise RuntimeError("boom")
+
+    with BatchInferenceServer(_Broken(), max_batch=8, max_wait_ms=1) as server:
+        with pytest.raises(RuntimeError, match="boom"):
+            server.infer(_images(0)[0], timeout=5)
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("msgpack")
+
+from src.common.codec import HEADER_SIZE, JsonCodec, MsgpackCodec, codec_from_header, get_codec
+from src.common.event_bus import Event, FileEventBus
+from src.common.segments import SegmentManifest
+from src.common.tail import LogTailer, read_last_records
+
+
+def _pose(n):
+    keypoints = [[412.0 + i * 13.371, 208.0 + i * 7.919, 0.8125] for i in range(17)]
+    return {"type": "pose", "n": n, "camera_id": "CAM01", "keypoints": keypoints, "bbox": [1, 2, 3, 4]}
+
+
+def test_msgpack_codec_packs_keypoints_as_float32():
+    codec = MsgpackCodec()
+    record = _pose(1)
+    frame = codec.encode(record)
+    assert len(frame) < len(JsonCodec().encode(record)) / 2
+    frames, consumed = codec.frames(frame + frame[:5])
+    assert consumed == len(frame) and len(frames) == 1
+    decoded = codec.decode(frames[0][1])
+    flat = [value for row in decoded["keypoints"] for value in row]
+    assert flat == pytest.approx([value for row in record["keypoints"] for value in row], rel=1e-6)
+    assert decoded["bbox"] == [1, 2, 3, 4]
+
+
+def test_codec_header_detection():
+    assert codec_from_header(b"") is None
+    assert codec_from_header(b"AIX") is None
+    assert codec_from_header(b'{"type"').name == "json"
+    assert codec_from_header(get_codec("msgpack").header).name == "msgpack"
+    assert len(get_codec("msgpack").header) == HEADER_SIZE
+    with pytest.raises(ValueError):
+        get_codec("protobuf")
+
+
+def test_binary_bus_round_trips_through_readers(tmp_path):
+    bus = FileEventBus(tmp_path, codec="msgpack", segment_bytes=2000, retention_bytes=0, write_last=False)
+    tailer = LogTailer(bus.path)
+    for n in range(3):
+        bus.publish(Event(type="pose", payload=_pose(n)))
+    assert [r["n"] for r in tailer.read_available()] == [0, 1, 2]
+    for n in range(3, 40):
+        bus.publish(Event(type="pose", payload=_pose(n)))
+    assert SegmentManifest.load(bus.path).segments
+    assert [r["n"] for r in tailer.read_available()] == list(range(3, 40))
+    assert [r["n"] for r in LogTailer(bus.path).read_available()] == list(range(40))
+    assert [r["n"] for r in read_last_records(bus.path, 25)] == list(range(15, 40))
+    assert bus.path.read_bytes()[:HEADER_SIZE] == bus.codec.header
+
+
+def test_codec_switch_rolls_or_refuses(tmp_path):
+    FileEventBus(tmp_path, write_last=False, segment_bytes=0).publish(Event(type="a", payload={"n": 0}))
+    with pytest.raises(RuntimeError):
+        FileEventBus(tmp_path, codec="msgpack", segment_bytes=0, write_last=False).publish(
+            Event(type="a", payload={"n": 1})
+        )
+    switched = FileEventBus(tmp_path, codec="msgpack", segment_bytes=10**6, write_last=False)
+    switched.publish(Event(type="a", payload={"n": 1}))
+    assert [r["n"] for r in LogTailer(switched.path).read_available()] == [0, 1]
+    assert SegmentManifest.load(switched.path).segments
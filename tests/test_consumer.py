@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from src.common.consumer import DurableConsumer, OffsetStore
+
+
+def _append(path, *records):
+    with path.open("a", encoding="utf-8") as fh:
+        for record in records:
+            fh.write(json.dumps(record) + "\n")
+
+
+def _take(consumer, count):
+    stream = iter(consumer)
+    return [next(stream)["n"] for _ in range(count)]
+
+
+def test_durable_consumer_resumes_from_checkpoint(tmp_path):
+    log = tmp_path / "events.log"
+    _append(log, *({"n": n} for n in range(5)))
+    first = DurableConsumer(log, "rules", commit_every=2, fsync="never")
+    assert _take(first, 3) == [0, 1, 2]
+    first.close()
+    second = DurableConsumer(log, "rules", fsync="never")
+    assert _take(second, 2) == [3, 4]
+    other = DurableConsumer(log, "recorder", fsync="never")
+    assert _take(other, 1) == [0]
+
+
+def test_durable_consumer_commits_when_caught_up(tmp_path):
+    log = tmp_path / "events.log"
+    _append(log, {"n": 1})
+    consumer = DurableConsumer(log, "events", commit_every=1000, commit_interval=3600, fsync="always")
+    assert consumer.read_available() == [{"n": 1}]
+    assert consumer.read_available() == []
+    checkpoint = OffsetStore(log, "events").load()
+    assert checkpoint["offset"] == log.stat().st_size
+
+
+def test_durable_consumer_restarts_when_log_replaced(tmp_path):
+    log = tmp_path / "events.log"
+    _append(log, {"n": 1}, {"n": 2})
+    consumer = DurableConsumer(log, "rules", fsync="never")
+    consumer.read_available()
+    consumer.close()
+    log.unlink()
+    _append(log, {"n": 3})
+    assert DurableConsumer(log, "rules").read_available() == [{"n": 3}]
+
+
+def test_durable_consumer_rejects_unknown_fsync_policy(tmp_path):
+    with pytest.raises(ValueError):
+        DurableConsumer(tmp_path / "events.log", "rules", fsync="sometimes")
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import numpy as np
+
+from src.common.detections import DetectionBatch
+from src.runners.pose_assoc import associate_pose_tracks
+from src.trackers import ByteTrack, SimpleTracker
+
+
+def _objects() -> DetectionBatch:
+    return DetectionBatch(
+        boxes=[[0, 0, 100, 100], [200, 200, 260, 300], [10, 10, 20, 20]],
+        scores=[0.9, 0.8, 0.3],
+        class_ids=[0, 1, 0],
+        class_names=("person", "bag"),
+        timestamp=5.0,
+    )
+
+
+def test_dict_roundtrip_keeps_layout_and_extras() -> None:
+    dicts = [
+        {"bbox": [1.0, 2.0, 3.0, 4.0], "confidence": 0.5, "class_id": 0, "class": "person", "zone": "A"},
+        {"bbox": [5.0, 6.0, 7.0, 8.0], "confidence": 0.25, "class_id": 1, "class": "bag"},
+    ]
+    batch = DetectionBatch.from_dicts(dicts, class_names=["person", "bag"])
+    assert batch.boxes.dtype == np.float32 and batch.boxes.shape == (2, 4)
+    assert batch.class_ids.tolist() == [0, 1]
+    assert batch.to_dicts() == dicts
+
+
+def test_take_and_concat_rekey_extras() -> None:
+    batch = _objects()
+    batch.row_extras(2)["note"] = "small"
+    people = batch.take(batch.class_mask({"PERSON"}))
+    assert people.boxes.tolist() == [[0, 0, 100, 100], [10, 10, 20, 20]]
+    assert people.extras == {1: {"note": "small"}}
+    joined = DetectionBatch.concat([people, batch.take([1])])
+    assert len(joined) == 3
+    assert [det["class"] for det in joined.to_dicts()] == ["person", "person", "bag"]
+    assert joined.to_dicts()[1]["note"] == "small"
+
+
+def test_bytetrack_tracks_batches_like_dicts() -> None:
+    tracker = ByteTrack(high_thresh=0.6, low_thresh=0.1, match_iou=0.3, max_age=3)
+    first = tracker.update(_objects())
+    assert first.track_ids.tolist() == [1, 2, -1]
+    assert first.first_seen.tolist()[:2] == [5.0, 5.0]
+
+    moved = _objects()
+    moved.boxes += 5
+    moved.timestamp = 6.0
+    second = tracker.update(moved)
+    assert second.track_ids.tolist()[:2] == [1, 2]
+    assert [det["first_seen"] for det in second.to_dicts()[:2]] == [6.0, 6.0]
+
+    reference = ByteTrack(high_thresh=0.6, low_thresh=0.1, match_iou=0.3, max_age=3)
+    reference.update(_objects().to_dicts())
+    assert [det["track_id"] for det in reference.update(moved.to_dicts())] == [1, 2, None]
+
+
+def test_simple_tracker_keeps_given_track_ids() -> None:
+    tracker = SimpleTracker(max_age=5, iou_thresh=0.3)
+    batch = DetectionBatch(boxes=[[0, 0, 10, 10], [50, 50, 60, 60]], scores=[0.9, 0.9], track_ids=[7, -1])
+    assert tracker.update(batch).track_ids.tolist() == [7, 1]
+    assert sorted(track["track_id"] for track in tracker.get_active_tracks()) == [1, 7]
+
+
+def test_pose_association_on_batches() -> None:
+    persons = _objects()
+    persons.track_ids = np.array([11, 12, -1])
+    persons.first_seen[:] = [1.0, 2.0, np.nan]
+    poses = DetectionBatch(
+        boxes=[[5, 5, 95, 95], [400, 400, 410, 410]],
+        scores=[0.7, 0.6],
+        keypoints=np.zeros((2, 17, 3)),
+    )
+    associate_pose_tracks(persons, poses)
+    assert poses.track_ids.tolist() == [11, -1]
+    assert poses.first_seen[0] == 1.0
+    dicts = poses.to_dicts()
+    assert dicts[0]["track_id"] == 11 and dicts[1]["track_id"] is None
+    assert len(dicts[0]["keypoints"]) == 17
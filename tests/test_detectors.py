@@ -2,8 +2,6 @@ from __future__ import annotations
 
 import os
 
-os.environ.setdefault("AIXAVIER_DISABLE_NUMPY", "1")
-
 import pytest
 
 if os.environ.get("AIXAVIER_ENABLE_NUMPY_TESTS") != "1":
@@ -11,10 +9,19 @@ if os.environ.get("AIXAVIER_ENABLE_NUMPY_TESTS") != "1":
 
 import numpy as np
 
+from src.runners import postprocess
 from src.runners.postprocess import normalise_object_output, normalise_pose_output
 from src.runners.detectors import PoseDetector
 
 
+@pytest.fixture(autouse=True)
+def _postprocess_fallback(monkeypatch):
+    # Run postprocess without numpy for these tests only; setting
+    # AIXAVIER_DISABLE_NUMPY at import leaked into every later module.
+    if os.environ.get("AIXAVIER_DISABLE_NUMPY", "1") == "1":
+        monkeypatch.setattr(postprocess, "np", None)
+
+
 def test_normalise_object_output_transpose() -> None:
     raw = np.random.rand(1, 84, 10).astype(np.float32)
     normalised = normalise_object_output(raw)
@@ -1,8 +1,14 @@
 from __future__ import annotations
 
 import json
+import time
 
+import pytest
+
+from src.common.consumer import DurableConsumer
 from src.common.event_bus import Event, FileEventBus
+from src.common.segments import SegmentManifest
+from src.common.tail import LogTailer, read_last_records
 
 
 def test_file_event_bus_persists_to_disk(tmp_path):
@@ -14,10 +20,117 @@ def test_file_event_bus_persists_to_disk(tmp_path):
 
 
 def test_file_event_bus_consume(tmp_path):
-    bus = FileEventBus(tmp_path)
+    bus = FileEventBus(tmp_path, fanout=True)
     evt = Event(type="object", payload={"camera_id": "CAM01"})
     bus.publish(evt)
     consumer = bus.consume()
     received = next(consumer)
     assert received.type == "object"
     assert received.payload["camera_id"] == "CAM01"
+
+
+def test_publish_only_bus_keeps_no_events(tmp_path):
+    bus = FileEventBus(tmp_path)
+    _publish(bus, 0, 50)
+    assert bus._subscribers == ()
+    with pytest.raises(RuntimeError):
+        bus.consume()
+
+
+def test_subscriptions_are_bounded_by_policy(tmp_path):
+    bus = FileEventBus(tmp_path, write_last=False)
+    oldest = bus.subscribe(maxsize=3)
+    newest = bus.subscribe(maxsize=3, policy="drop_newest")
+    blocking = bus.subscribe(maxsize=3, policy="block", block_timeout=0.01)
+    _publish(bus, 0, 5)
+    assert [oldest.get(timeout=0).payload["n"] for _ in range(3)] == [2, 3, 4]
+    assert [newest.get(timeout=0).payload["n"] for _ in range(3)] == [0, 1, 2]
+    assert blocking.qsize() == 3 and blocking.dropped == 2
+    assert oldest.dropped == newest.dropped == 2
+    oldest.close()
+    _publish(bus, 5, 6)
+    assert oldest.qsize() == 0
+    with pytest.raises(ValueError):
+        bus.subscribe(policy="unbounded")
+
+
+def _publish(bus, start, stop):
+    for n in range(start, stop):
+        bus.publish(Event(type="object", payload={"n": n, "pad": "x" * 40}))
+
+
+def test_file_event_bus_rolls_segments_and_applies_retention(tmp_path):
+    bus = FileEventBus(tmp_path, segment_bytes=300, retention_bytes=700, write_last=False)
+    _publish(bus, 0, 40)
+    manifest = SegmentManifest.load(bus.path)
+    assert manifest is not None and manifest.segments
+    assert sum(segment.bytes for segment in manifest.segments) <= 700
+    for segment in manifest.segments:
+        assert (tmp_path / segment.file).stat().st_size == segment.bytes
+    assert manifest.active_base == manifest.segments[-1].end_offset
+    assert bus.path.stat().st_size < 400
+    sealed = sorted(p.name for p in tmp_path.glob("events.log.0*"))
+    assert sealed == [segment.file for segment in manifest.segments]
+
+
+def test_readers_span_segments(tmp_path):
+    bus = FileEventBus(tmp_path, segment_bytes=300, retention_bytes=0, write_last=False)
+    tailer = LogTailer(bus.path)
+    _publish(bus, 0, 5)
+    assert [r["n"] for r in tailer.read_available()] == list(range(5))
+    _publish(bus, 5, 30)
+    assert [r["n"] for r in tailer.read_available()] == list(range(5, 30))
+    assert [r["n"] for r in LogTailer(bus.path).read_available()] == list(range(30))
+    assert [r["n"] for r in read_last_records(bus.path, 12)] == list(range(18, 30))
+
+    consumer = DurableConsumer(bus.path, "audit")
+    assert len(consumer.read_available()) == 30
+    consumer.read_available()
+    consumer.close()
+    _publish(bus, 30, 45)
+    resumed = DurableConsumer(bus.path, "audit")
+    assert [r["n"] for r in resumed.read_available()] == list(range(30, 45))
+    resumed.close()
+
+
+def test_tailer_skips_ahead_of_retention(tmp_path):
+    bus = FileEventBus(tmp_path, segment_bytes=300, retention_bytes=300, write_last=False)
+    _publish(bus, 0, 30)
+    records = LogTailer(bus.path).read_available()
+    manifest = SegmentManifest.load(bus.path)
+    assert records and records[0]["n"] > 0
+    assert records[-1]["n"] == 29
+    assert len(records) == len(read_last_records(bus.path, 100))
+    assert manifest.start_offset > 0
+
+
+def test_buffered_bus_flushes_on_size_time_and_close(tmp_path):
+    bus = FileEventBus(tmp_path, buffered=True, flush_bytes=10_000, flush_interval=60, last_interval=60)
+    _publish(bus, 0, 3)
+    assert not bus.path.exists() or bus.path.stat().st_size == 0
+    assert json.loads((tmp_path / "last.json").read_text())["n"] == 0
+    bus.flush()
+    assert [r["n"] for r in LogTailer(bus.path).read_available()] == [0, 1, 2]
+    assert json.loads((tmp_path / "last.json").read_text())["n"] == 2
+
+    bus.flush_bytes = 200
+    _publish(bus, 3, 6)
+    assert len(read_last_records(bus.path, 100)) >= 5
+    bus.close()
+    assert [r["n"] for r in read_last_records(bus.path, 100)] == list(range(6))
+
+    timed = FileEventBus(tmp_path / "timed", buffered=True, flush_interval=0.02, write_last=False)
+    _publish(timed, 0, 2)
+    deadline = time.monotonic() + 2.0
+    while time.monotonic() < deadline and len(read_last_records(timed.path, 10)) < 2:
+        time.sleep(0.01)
+    assert len(read_last_records(timed.path, 10)) == 2
+    timed.close()
+
+
+def test_buffered_bus_reopens_after_segment_roll(tmp_path):
+    with FileEventBus(tmp_path, buffered=True, flush_bytes=1, segment_bytes=300, write_last=False) as bus:
+        _publish(bus, 0, 30)
+    manifest = SegmentManifest.load(bus.path)
+    assert manifest.segments
+    assert [r["n"] for r in LogTailer(bus.path).read_available()] == list(range(30))
@@ -26,3 +26,20 @@ def test_count_events_handles_missing_file(tmp_path):
     missing = tmp_path / "missing.log"
     result = exporter_main.count_events(missing)
     assert result == {}
+
+
+def test_drop_counter_tracks_cumulative_ingest_totals(tmp_path):
+    log = tmp_path / "frames.log"
+    records = [
+        {"camera_id": "CAM01", "frame_index": 1, "dropped_frames": 3},
+        {"camera_id": "CAM02", "frame_index": 1, "dropped_frames": 1},
+        {"camera_id": "CAM01", "frame_index": 2, "dropped_frames": 5},
+    ]
+    log.write_text("\n".join(json.dumps(r) for r in records), encoding="utf-8")
+    totals = exporter_main.read_dropped_frames(log)
+    assert totals == {"CAM01": 5, "CAM02": 1}
+    before = exporter_main.DROP_FRAMES._value.get()
+    seen = {"CAM01": 4}
+    exporter_main.update_drop_counter(totals, seen)
+    assert exporter_main.DROP_FRAMES._value.get() - before == 2
+    assert seen == {"CAM01": 5, "CAM02": 1}
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import uuid
+
+import numpy as np
+
+from src.common.frame_ring import FrameRing, FrameRingReader
+from src.ingest_gst.pipeline import emit_frame
+
+
+def _ring(slots: int = 2) -> FrameRing:
+    return FrameRing.create(f"aixavier_test_{uuid.uuid4().hex[:8]}", slots=slots, max_shape=(8, 8, 3))
+
+
+def test_frame_ring_round_trip_across_attachments():
+    ring = _ring()
+    try:
+        image = np.arange(4 * 6 * 3, dtype=np.uint8).reshape(4, 6, 3)
+        record = ring.write(image, frame_index=7, timestamp=1.5)
+        reader = FrameRingReader()
+        restored = reader.read(record)
+        reader.close()
+        assert restored is not None
+        assert np.array_equal(restored, image)
+    finally:
+        ring.close()
+
+
+def test_frame_ring_reports_recycled_slots():
+    ring = _ring(slots=1)
+    try:
+        first = ring.write(np.zeros((2, 2, 3), dtype=np.uint8), frame_index=0, timestamp=0.0)
+        second = ring.write(np.ones((2, 2, 3), dtype=np.uint8), frame_index=1, timestamp=0.1)
+        assert ring.read(first["slot"], first["generation"]) is None
+        assert ring.read(second["slot"], second["generation"]).sum() == 12
+    finally:
+        ring.close()
+
+
+def test_emit_frame_falls_back_to_files_for_oversized_frames(tmp_path):
+    ring = _ring()
+    try:
+        small = emit_frame(np.zeros((4, 4, 3), dtype=np.uint8), 0, 0.0, tmp_path, ring=ring)
+        large = emit_frame(np.zeros((16, 16, 3), dtype=np.uint8), 1, 0.0, tmp_path, ring=ring)
+        assert small.ring is not None and small.path is None
+        assert large.ring is None and large.path is not None and large.path.exists()
+    finally:
+        ring.close()
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import queue
+import threading
+
+import numpy as np
+import pytest
+import yaml
+
+from src.ingest_gst import workers
+from src.ingest_gst.main import resolve_cameras
+from src.ingest_gst.pipeline import Frame, LatestFrameGrabber
+
+
+def test_resolve_cameras_returns_every_configured_camera(tmp_path):
+    cfg = tmp_path / "cameras.yaml"
+    cfg.write_text(
+        yaml.safe_dump(
+            {
+                "cameras": [
+                    {"id": "CAM01", "rtsp_url": "demo://synthetic", "fps_limit": 25},
+                    {"rtsp_url": "demo://synthetic", "fps_limit": 10},
+                ]
+            }
+        ),
+        encoding="utf-8",
+    )
+    cameras = resolve_cameras(cfg, None, camera_id="CAM01", camera_name=None, fps_limit=None)
+    assert [camera["id"] for camera in cameras] == ["CAM01", "CAM02"]
+    assert [camera["fps_limit"] for camera in cameras] == [25, 10]
+
+
+def test_camera_worker_reconnects_and_keeps_frame_numbering(tmp_path, monkeypatch):
+    attempts = []
+
+    def flaky_source(camera, output_dir, *, persist, ring, start_index):
+        attempts.append(start_index)
+        if len(attempts) == 1:
+            raise RuntimeError("connection refused")
+        for idx in range(start_index, start_index + 2):
+            yield Frame(index=idx, timestamp=0.0, path=output_dir / f"{idx}.jpg")
+        if len(attempts) == 2:
+            raise RuntimeError("stream lost")
+        stop.wait()
+
+    monkeypatch.setattr(workers, "open_source", flaky_source)
+    frames: "queue.Queue" = queue.Queue()
+    stop = threading.Event()
+    worker = workers.CameraWorker(
+        {"id": "CAM09"}, tmp_path, frames, stop, backoff_initial=0.01, backoff_max=0.02
+    )
+    worker.start()
+    received = [frames.get(timeout=2)[1].index for _ in range(4)]
+    stop.set()
+    worker.join(timeout=2)
+    assert received == [0, 1, 2, 3]
+    assert attempts[:3] == [0, 0, 2]
+    assert worker.reconnects == 2
+
+
+class _FakeCapture:
+    def __init__(self, frames: int) -> None:
+        self.remaining = frames
+        self.grabbed = 0
+        self.retrieved = 0
+        self.released = False
+
+    def grab(self) -> bool:
+        if self.remaining <= 0:
+            return False
+        self.remaining -= 1
+        self.grabbed += 1
+        return True
+
+    def retrieve(self):
+        self.retrieved += 1
+        return True, np.full((2, 2, 3), self.grabbed, dtype=np.uint8)
+
+    def release(self) -> None:
+        self.released = True
+
+
+def test_latest_frame_grabber_skips_decoding_and_counts_drops():
+    cap = _FakeCapture(frames=200)
+    grabber = LatestFrameGrabber(cap, label="fake", fps_limit=0, max_read_failures=1)
+    grabber.start()
+    grabber.join(timeout=2)
+    latest = grabber.get(timeout=0.1)
+    assert latest is not None and int(latest[0][0, 0, 0]) == 200
+    assert grabber.dropped == 199
+    assert cap.released
+    with pytest.raises(RuntimeError):
+        grabber.get(timeout=0.1)
+
+
+def test_latest_frame_grabber_only_retrieves_at_fps_limit():
+    cap = _FakeCapture(frames=50)
+    grabber = LatestFrameGrabber(cap, label="fake", fps_limit=1, max_read_failures=1)
+    grabber.start()
+    grabber.join(timeout=2)
+    assert cap.retrieved == 1
+    assert grabber.dropped == 49
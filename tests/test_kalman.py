@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.trackers import ByteTrack, TrackerManager
+from src.trackers.kalman import KalmanBoxFilter, states_to_boxes
+
+
+def _box(x: float) -> list:
+    return [x, 100.0, x + 60.0, 260.0]
+
+
+def test_filter_learns_velocity_for_all_tracks_at_once() -> None:
+    kf = KalmanBoxFilter()
+    speeds = np.array([5.0, -3.0, 0.0])
+    boxes = np.array([_box(200.0 + 0 * v) for v in speeds])
+    mean, cov = kf.initiate(boxes)
+    for frame in range(1, 15):
+        mean, cov = kf.predict(mean, cov)
+        mean, cov = kf.update(mean, cov, np.array([_box(200.0 + frame * v) for v in speeds]))
+    assert mean[:, 4] == pytest.approx(speeds, abs=0.3)
+    predicted, _ = kf.predict(mean, cov, steps=3)
+    expected = np.array([_box(200.0 + 17 * v) for v in speeds])
+    assert states_to_boxes(predicted) == pytest.approx(expected, abs=2.0)
+    assert np.all(np.linalg.eigvalsh(cov) > 0)
+
+
+@pytest.mark.parametrize("motion, stable", [(True, True), (False, False)])
+def test_prediction_keeps_ids_with_sparse_detection(motion: bool, stable: bool) -> None:
+    # 25 px/frame, detector runs every 3rd frame: consecutive boxes barely overlap.
+    tracker = ByteTrack(high_thresh=0.5, match_iou=0.3, max_age=10, motion=motion)
+    ids = set()
+    for frame in range(0, 45):
+        dets = [{"bbox": _box(25.0 * frame), "confidence": 0.9}]
+        if frame < 12:
+            # Early frames run at full rate so the filter can pick up velocity.
+            ids.add(tracker.update(dets)[0]["track_id"])
+        elif frame % 3 == 2:  # frames 14, 17, ...: three frames after the last update
+            ids.add(tracker.update(dets, steps=3)[0]["track_id"])
+    assert (len(ids) == 1) is stable
+
+
+def test_coasting_moves_and_expires_tracks() -> None:
+    manager = TrackerManager(high_thresh=0.5, max_age=4)
+    for frame in range(12):
+        manager.update("CAM01", [{"bbox": _box(10.0 * frame), "confidence": 0.9}])
+    before = manager.get_tracks("CAM01")[0]["bbox"][0]
+    coasted = manager.coast("CAM01", steps=2)
+    assert coasted[0]["bbox"][0] == pytest.approx(before + 20.0, abs=3.0)
+    assert coasted[0]["age"] == 2
+    assert manager.coast("CAM01", steps=3) == []
+    assert manager.coast("CAM_UNKNOWN") == []
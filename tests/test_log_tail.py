@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+
+from src.common.tail import LogTailer
+
+
+def _append(path, *records, newline=True):
+    with path.open("a", encoding="utf-8") as fh:
+        for record in records:
+            fh.write(json.dumps(record) + ("\n" if newline else ""))
+
+
+def test_log_tailer_reads_appends_and_tracks_offset(tmp_path):
+    log = tmp_path / "events.log"
+    tailer = LogTailer(log)
+    assert tailer.read_available() == []
+    _append(log, {"n": 1}, {"n": 2})
+    assert [r["n"] for r in tailer.read_available()] == [1, 2]
+    assert tailer.offset == log.stat().st_size
+    resumed = LogTailer(log, offset=tailer.offset)
+    _append(log, {"n": 3})
+    assert [r["n"] for r in resumed.read_available()] == [3]
+
+
+def test_log_tailer_waits_for_complete_lines(tmp_path):
+    log = tmp_path / "events.log"
+    log.write_text('{"n": 1}\n{"n": ', encoding="utf-8")
+    tailer = LogTailer(log)
+    assert [r["n"] for r in tailer.read_available()] == [1]
+    with log.open("a", encoding="utf-8") as fh:
+        fh.write("2}\nnot-json\n")
+    assert [r["n"] for r in tailer.read_available()] == [2]
+
+
+def test_log_tailer_follows_rotation_and_truncation(tmp_path):
+    log = tmp_path / "events.log"
+    _append(log, {"n": 1})
+    tailer = LogTailer(log)
+    assert [r["n"] for r in tailer.read_available()] == [1]
+    _append(log, {"n": 2})
+    log.rename(tmp_path / "events.log.1")
+    _append(log, {"n": 3})
+    assert [r["n"] for r in tailer.read_available()] == [2, 3]
+    log.write_text("", encoding="utf-8")
+    assert tailer.read_available() == []
+    _append(log, {"n": 4})
+    assert [r["n"] for r in tailer.read_available()] == [4]
+
+
+def test_log_tailer_wakes_on_write(tmp_path):
+    log = tmp_path / "events.log"
+    tailer = LogTailer(log, poll_interval=5.0)
+    tailer.read_available()
+    timer = threading.Timer(0.05, _append, args=(log, {"n": 1}))
+    start = time.monotonic()
+    timer.start()
+    record = next(iter(tailer))
+    elapsed = time.monotonic() - start
+    tailer.close()
+    assert record == {"n": 1}
+    assert elapsed < 2.0
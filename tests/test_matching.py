@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import itertools
+
+import numpy as np
+import pytest
+
+from src.trackers import ByteTrack
+from src.trackers import matching
+from src.trackers.matching import iou_matrix, linear_assignment
+
+
+def _brute_force(cost: np.ndarray) -> float:
+    rows, cols = cost.shape
+    if rows > cols:
+        return _brute_force(cost.T)
+    return min(sum(cost[r, c] for r, c in zip(range(rows), perm)) for perm in itertools.permutations(range(cols), rows))
+
+
+@pytest.mark.parametrize("use_scipy", [False, True])
+def test_assignment_is_optimal(use_scipy: bool) -> None:
+    if use_scipy and matching._scipy_assignment is None:
+        pytest.skip("scipy not installed")
+    rng = np.random.default_rng(7)
+    for _ in range(50):
+        rows, cols = rng.integers(1, 6, size=2)
+        cost = rng.random((rows, cols))
+        pairs, unmatched_rows, unmatched_cols = linear_assignment(cost, 2.0, use_scipy=use_scipy)
+        assert len(pairs) == min(rows, cols)
+        assert cost[pairs[:, 0], pairs[:, 1]].sum() == pytest.approx(_brute_force(cost))
+        assert len(pairs) + len(unmatched_rows) == rows
+        assert len(pairs) + len(unmatched_cols) == cols
+
+
+def test_gated_pairs_are_never_matched() -> None:
+    cost = np.array([[0.1, 0.9], [np.inf, 0.95]])
+    pairs, unmatched_rows, unmatched_cols = linear_assignment(cost, 0.5, use_scipy=False)
+    assert pairs.tolist() == [[0, 0]]
+    assert unmatched_rows.tolist() == [1] and unmatched_cols.tolist() == [1]
+    empty, rows, cols = linear_assignment(np.zeros((0, 3)), 0.5)
+    assert empty.shape == (0, 2) and rows.size == 0 and cols.tolist() == [0, 1, 2]
+
+
+def test_iou_matrix_matches_pairwise_iou() -> None:
+    a = np.array([[0, 0, 10, 10], [5, 5, 15, 15]])
+    b = np.array([[0, 0, 10, 10], [20, 20, 30, 30]])
+    iou = iou_matrix(a, b)
+    assert iou.shape == (2, 2)
+    assert iou[0, 0] == pytest.approx(1.0) and iou[0, 1] == 0.0
+    assert iou[1, 0] == pytest.approx(25 / 175)
+
+
+def test_bytetrack_assignment_does_not_depend_on_detection_order() -> None:
+    # Greedy matching would hand track 2 to the first detection and leave
+    # the second one with track 1; the optimal assignment keeps both.
+    tracks = [[0, 0, 100, 100], [40, 0, 140, 100]]
+    moved = [[25, 0, 125, 100], [45, 0, 145, 100]]
+    for order in ([0, 1], [1, 0]):
+        tracker = ByteTrack(high_thresh=0.5, match_iou=0.3)
+        tracker.update([{"bbox": box, "confidence": 0.9} for box in tracks])
+        dets = tracker.update([{"bbox": moved[i], "confidence": 0.9} for i in order])
+        assert {tuple(det["bbox"]): det["track_id"] for det in dets} == {
+            tuple(moved[0]): 1,
+            tuple(moved[1]): 2,
+        }
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.runners.nms import batched_nms, nms
+from src.trackers.matching import iou_matrix
+
+
+def _reference_nms(boxes, scores, iou_thres):
+    """The original per-box loop from postprocess.nms."""
+    x1, y1, x2, y2 = boxes.T
+    areas = (x2 - x1) * (y2 - y1)
+    order = scores.argsort()[::-1]
+    keep = []
+    while order.size > 0:
+        i = order[0]
+        keep.append(int(i))
+        xx1 = np.maximum(x1[i], x1[order[1:]])
+        yy1 = np.maximum(y1[i], y1[order[1:]])
+        xx2 = np.minimum(x2[i], x2[order[1:]])
+        yy2 = np.minimum(y2[i], y2[order[1:]])
+        inter = np.maximum(0.0, xx2 - xx1) * np.maximum(0.0, yy2 - yy1)
+        ovr = inter / (areas[i] + areas[order[1:]] - inter + 1e-6)
+        order = order[np.where(ovr <= iou_thres)[0] + 1]
+    return keep
+
+
+def _random_boxes(count, seed=0):
+    rng = np.random.default_rng(seed)
+    xy = rng.uniform(0, 600, (count, 2)).astype(np.float32)
+    wh = rng.uniform(10, 120, (count, 2)).astype(np.float32)
+    scores = rng.permutation(count).astype(np.float32) / count  # distinct scores
+    return np.hstack((xy, xy + wh)), scores
+
+
+def test_matrix_and_shrink_paths_match_reference():
+    boxes, scores = _random_boxes(800)
+    expected = _reference_nms(boxes, scores, 0.45)
+    for limit in (0, 10_000):
+        keep = nms(boxes, scores, 0.45, matrix_limit=limit)
+        assert keep.dtype == np.int64
+        assert keep.tolist() == expected
+    assert nms(boxes, scores, 0.45, max_det=5).tolist() == expected[:5]
+    top = nms(boxes, scores, 0.45, pre_top_k=50)
+    assert set(top.tolist()) <= set(np.argsort(-scores)[:50].tolist())
+    assert nms(np.empty((0, 4)), np.empty(0), 0.5).size == 0
+
+
+def test_class_aware_nms_keeps_overlapping_classes():
+    boxes = np.array([[0, 0, 10, 10], [1, 1, 10, 10], [0, 0, 10, 10]], dtype=np.float32)
+    scores = np.array([0.9, 0.8, 0.7], dtype=np.float32)
+    classes = np.array([0, 0, 1])
+    assert nms(boxes, scores, 0.5).tolist() == [0]
+    for mode in ("offset", "per_class"):
+        assert batched_nms(boxes, scores, classes, 0.5, mode=mode).tolist() == [0, 2]
+    with pytest.raises(ValueError):
+        batched_nms(boxes, scores, classes, 0.5, mode="soft")
+
+
+def test_batched_modes_agree_on_many_classes():
+    boxes, scores = _random_boxes(600, seed=3)
+    classes = np.random.default_rng(4).integers(0, 10, len(scores))
+    offset = batched_nms(boxes, scores, classes, 0.5, max_det=100)
+    per_class = batched_nms(boxes, scores, classes, 0.5, mode="per_class", max_det=100)
+    assert offset.tolist() == per_class.tolist()
+    assert len(offset) == 100
+    iou = iou_matrix(boxes[offset], boxes[offset])
+    same = classes[offset][:, None] == classes[offset][None, :]
+    np.fill_diagonal(same, False)
+    assert not (iou[same] > 0.5).any()
+
+
+def test_top_k_and_max_det_keep_reference_order_at_low_threshold():
+    boxes, scores = _random_boxes(3000, seed=7)
+    expected = _reference_nms(boxes, scores, 0.45)
+    keep = nms(boxes, scores, 0.45, pre_top_k=1000, max_det=300)
+    assert len(keep) == 300
+    assert keep.tolist()[:50] == expected[:50]
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from src.runners import main as runner
+
+
+def test_cached_object_detections_match_within_window(tmp_path, monkeypatch):
+    monkeypatch.setattr(runner, "CACHE_DIR", tmp_path)
+    people = [{"class": "person", "confidence": 0.8, "bbox": [1.0, 2.0, 3.0, 4.0]}]
+    runner.update_object_cache("CAM01", 100.0, people)
+
+    assert runner.cached_object_detections("CAM01", 100.0, 0.0) == people
+    assert runner.cached_object_detections("CAM01", 100.1, 0.15) == people
+    assert runner.cached_object_detections("CAM01", 100.5, 0.15) is None
+    assert runner.cached_object_detections("CAM01", 900.0, 0.15) is None
+    assert runner.cached_object_detections("CAM02", 100.0, 0.15) is None
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from src.runners.pipeline import StagePipeline
+
+
+def test_stages_preserve_order_and_drop_none() -> None:
+    seen = []
+    done = threading.Event()
+
+    def decode(item):
+        return None if item["frame"] == 3 else item
+
+    def infer(item):
+        time.sleep(0.001 * (item["frame"] % 3))  # uneven work must not reorder
+        return {**item, "n": item["frame"] * 10}
+
+    def publish(item):
+        seen.append((item["camera"], item["frame"]))
+        if item["frame"] == 9 and item["camera"] == "B":
+            done.set()
+
+    with StagePipeline([("decode", decode), ("infer", infer), ("publish", publish)], queue_depth=2) as pipeline:
+        for frame in range(10):
+            for camera in ("A", "B"):
+                pipeline.submit({"camera": camera, "frame": frame})
+        assert done.wait(2.0)
+    for camera in ("A", "B"):
+        frames = [frame for cam, frame in seen if cam == camera]
+        assert frames == [0, 1, 2, 4, 5, 6, 7, 8, 9]
+    assert pipeline.stats()["decode"]["processed"] == 20
+    assert pipeline.stats()["publish"]["processed"] == 18
+
+
+def test_bounded_queues_apply_backpressure() -> None:
+    release = threading.Event()
+    pipeline = StagePipeline([("slow", lambda item: release.wait(2.0)), ("sink", lambda item: None)], queue_depth=1)
+    pipeline.start()
+    accepted = []
+
+    def produce() -> None:
+        for item in range(5):
+            pipeline.submit(item)
+            accepted.append(item)
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    time.sleep(0.1)
+    # One item in the slow stage plus one queued; the producer is blocked.
+    assert len(accepted) == 2
+    release.set()
+    producer.join(2.0)
+    pipeline.close()
+    assert accepted == list(range(5))
+
+
+def test_stage_errors_surface_to_producer() -> None:
+    def boom(item):
+        raise RuntimeError("bad frame")
+
+    pipeline = StagePipeline([("boom", boom)], queue_depth=1).start()
+    pipeline.submit(1)
+    deadline = time.monotonic() + 2.0
+    while pipeline.error is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    with pytest.raises(RuntimeError, match="bad frame"):
+        pipeline.submit(2)
+    pipeline.close()
+    with pytest.raises(ValueError):
+        StagePipeline([("x", boom)], queue_depth=0)
+
+
+def test_batched_stage_takes_queued_items_together() -> None:
+    release = threading.Event()
+    sizes = []
+    out = []
+
+    def gate(item):
+        release.wait(2.0)
+        return item
+
+    def track(items):
+        sizes.append(len(items))
+        return [None if item == 2 else item * 10 for item in items]
+
+    pipeline = StagePipeline([("gate", gate), ("track", track, 4), ("sink", out.append)], queue_depth=8)
+    for item in range(6):
+        pipeline.submit(item)
+    time.sleep(0.05)
+    release.set()
+    pipeline.close()
+    assert out == [0, 10, 30, 40, 50]
+    assert sum(sizes) == 6 and max(sizes) <= 4
+    assert pipeline.stats()["track"]["processed"] == 6
+    with pytest.raises(ValueError):
+        StagePipeline([("x", track, 0)])
+
+
+def test_close_reports_stages_still_running() -> None:
+    release = threading.Event()
+    pipeline = StagePipeline([("stuck", lambda item: release.wait(5.0))]).start()
+    pipeline.submit(1)
+    time.sleep(0.05)
+    assert pipeline.close(timeout=0.1) is False
+    release.set()
+    assert pipeline.close() is True
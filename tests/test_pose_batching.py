@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.runners.detectors import PoseDetector
+
+
+class _SimccSession:
+    """Fake RTMPose: one peak per keypoint, derived from the crop's row index."""
+
+    def __init__(self, batch_dim=None):
+        self.batch_dim = batch_dim
+        self.calls = []
+
+    def get_inputs(self):
+        return [type("Input", (), {"name": "input", "shape": [self.batch_dim, 3, 48, 64]})()]
+
+    def run(self, _outputs, feeds):
+        batch = feeds["input"]
+        self.calls.append(batch.shape)
+        rows = batch.shape[0]
+        simcc_x = np.zeros((rows, 2, 8), dtype=np.float32)
+        simcc_y = np.zeros((rows, 2, 8), dtype=np.float32)
+        simcc_x[:, 0, 2] = simcc_x[:, 1, 6] = 0.9
+        simcc_y[:, 0, 1] = simcc_y[:, 1, 5] = 0.9
+        return [simcc_x, simcc_y]
+
+
+class _People:
+    def __init__(self, boxes):
+        self.boxes = boxes
+
+    def detect(self, _image):
+        return [{"class": "person", "confidence": 0.9, "bbox": box} for box in self.boxes]
+
+
+def _detector(session, boxes, **config):
+    det = PoseDetector({"input": {"width": 64, "height": 48}, **config})
+    det.session = session
+    det.input_name = "input"
+    det.session_batch = session.batch_dim
+    det.person_detector = _People(boxes)
+    det.person_class_filter = {"person"}
+    det.person_min_conf = 0.4
+    return det
+
+
+def _boxes(count):
+    return [[float(40 * i), 10.0, float(40 * i + 32), 58.0] for i in range(count)]
+
+
+def test_person_crops_share_one_padded_session_run():
+    session = _SimccSession()
+    image = np.zeros((120, 640, 3), dtype=np.uint8)
+    det = _detector(session, _boxes(5))
+    batched = det.detect(image)
+    assert session.calls == [(8, 3, 48, 64)]
+    assert len(batched) == 5
+
+    reference = []
+    for box in _boxes(5):
+        single = _detector(_SimccSession(), [box])
+        reference.extend(single.detect(image))
+    assert [d["keypoints"] for d in batched] == [d["keypoints"] for d in reference]
+    assert [d["bbox"] for d in batched] == [d["bbox"] for d in reference]
+    assert batched[3]["bbox"][0] > 100.0  # offsets are applied per crop
+
+
+def test_crop_batches_respect_limits_and_fixed_batch_models():
+    image = np.zeros((120, 640, 3), dtype=np.uint8)
+    dynamic = _SimccSession()
+    assert len(_detector(dynamic, _boxes(13), crop_batch_size=6).detect(image)) == 13
+    assert [shape[0] for shape in dynamic.calls] == [8, 8, 1]
+
+    fixed = _SimccSession(batch_dim=1)
+    assert len(_detector(fixed, _boxes(3)).detect(image)) == 3
+    assert [shape[0] for shape in fixed.calls] == [1, 1, 1]
+
+
+def test_object_pipeline_people_skip_the_person_detector():
+    session = _SimccSession()
+    image = np.zeros((120, 640, 3), dtype=np.uint8)
+    det = _detector(session, _boxes(1))
+    det.person_detector.detect = lambda _image: pytest.fail("person detector should not run")
+    cached = [{"class": "person", "confidence": 0.9, "bbox": box} for box in _boxes(3)]
+    cached.append({"class": "car", "confidence": 0.9, "bbox": [0.0, 0.0, 30.0, 30.0]})
+    assert len(det.detect(image, person_detections=cached)) == 3
+    assert det.person_cache_hits == 1 and det.person_detector_runs == 0
+
+
+def test_crop_below_threshold_keeps_keypoints_of_the_others():
+    class _OneWeakCrop(_SimccSession):
+        def run(self, _outputs, feeds):
+            simcc_x, simcc_y = super().run(_outputs, feeds)
+            simcc_x[1] *= 0.01
+            simcc_y[1] *= 0.01
+            return [simcc_x, simcc_y]
+
+    image = np.zeros((120, 640, 3), dtype=np.uint8)
+    batch = _detector(_OneWeakCrop(), _boxes(2)).detect_arrays(image)
+    assert len(batch) == 1
+    assert batch.keypoints is not None and batch.keypoints.shape == (1, 2, 3)
@@ -53,3 +53,20 @@ def test_pose_monitor_phone_usage_requires_speed() -> None:
     for _ in range(5):
         monitor.process("CAM01", [detection], fps_hint=15.0)
     assert monitor.event_counts["phone"] == 1
+
+
+def test_pose_monitor_writes_events_to_batch_rows() -> None:
+    from src.common.detections import DetectionBatch
+
+    monitor = PoseUseCaseMonitor(fps_hint=15.0, collapse_model=_StubCollapse())
+    batch = DetectionBatch(
+        boxes=[[0, 0, 10, 10], [20, 20, 30, 30]],
+        scores=[0.8, 0.8],
+        keypoints=[_keypoints_with_conf(), _keypoints_with_conf()],
+        track_ids=[-1, 4],
+    )
+    monitor.process("CAM01", batch, fps_hint=15.0)
+    assert monitor.event_counts["collapse"] == 1
+    dicts = batch.to_dicts()
+    assert "pose_events" not in dicts[0]
+    assert dicts[1]["pose_events"][0]["type"] == "pose.collapse"
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import tracemalloc
+
+import numpy as np
+
+from src.runners.detectors import letterbox
+from src.runners.preprocess import Preprocessor
+
+
+def _reference_blob(image, width, height):
+    img, scale, pad = letterbox(image, (width, height))
+    return np.expand_dims(img.transpose(2, 0, 1).astype(np.float32) / 255.0, 0), scale, pad
+
+
+def test_blob_matches_reference_letterbox():
+    rng = np.random.default_rng(0)
+    pre = Preprocessor(64, 48)
+    for shape in [(120, 80, 3), (30, 200, 3), (48, 64, 3), (120, 80, 3)]:
+        image = rng.integers(0, 255, shape, dtype=np.uint8)
+        expected, scale, pad = _reference_blob(image, 64, 48)
+        blob, got_scale, got_pad = pre.to_blob(image)
+        assert (got_scale, got_pad) == (scale, pad)
+        np.testing.assert_allclose(blob, expected, atol=1e-6)
+
+
+def test_batch_rows_are_written_in_place_and_padding_zeroed():
+    pre = Preprocessor(32, 32)
+    batch = pre.batch(4, used=4)
+    batch[:] = 1.0
+    again = pre.batch(4, used=2)
+    assert again is batch
+    assert not again[2:].any()
+    pre.to_blob(np.full((8, 16, 3), 255, dtype=np.uint8), out=again[0])
+    assert again[0].max() == 1.0 and again[0].min() < 1.0  # letterbox border stays at 114
+
+
+def test_steady_state_preprocessing_allocates_no_frames():
+    rng = np.random.default_rng(1)
+    frame = rng.integers(0, 255, (720, 1280, 3), dtype=np.uint8)
+    pre = Preprocessor(640, 640)
+    for _ in range(3):
+        pre.to_blob(frame)
+
+    def peak(fn, runs=3):
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        for _ in range(runs):
+            fn()
+        _, high = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return high - base
+
+    reused = peak(lambda: pre.to_blob(frame))
+    fresh = peak(lambda: _reference_blob(frame, 640, 640))
+    assert reused < 4096, reused
+    assert fresh > 640 * 640 * 3
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import pytest
+
+from src.runners.scheduler import FrameScheduler, base_interval, build_scheduler
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _run(scheduler: FrameScheduler, clock: _Clock, *, seconds: int, fps: int, cost: float) -> int:
+    """Feed ``fps`` fresh frames per second, each processed frame costing ``cost`` s."""
+    admitted = 0
+    for _ in range(seconds * fps):
+        clock.now += 1.0 / fps
+        if scheduler.admit("CAM01", clock.now):
+            admitted += 1
+            scheduler.record(cost)
+    return admitted
+
+
+def test_base_interval_uses_smallest_enabled_override() -> None:
+    profile = {
+        "usecases": ["a", "b"],
+        "interval_overrides": {"a": 3, "b": 2, "c": 1},
+    }
+    assert base_interval({"interval": 5, "usecases": ["a", "b", "c"]}, profile) == 2
+    assert base_interval({"interval": 5, "usecases": ["c"]}, profile) == 5
+    assert base_interval({"interval": 4}, {}) == 4
+
+
+def test_fixed_interval_is_per_camera() -> None:
+    scheduler = FrameScheduler(3, adaptive=False)
+    picks = [scheduler.admit(cam) for _ in range(6) for cam in ("CAM01", "CAM02")]
+    assert picks.count(True) == 4
+    assert scheduler.stats()["skipped"] == 8
+
+
+def test_overload_widens_interval_and_recovers() -> None:
+    clock = _Clock()
+    scheduler = FrameScheduler(1, max_interval=8, target_utilisation=0.8, clock=clock)
+    # 25 fps at 80 ms per frame needs twice the time available.
+    _run(scheduler, clock, seconds=5, fps=25, cost=0.08)
+    assert scheduler.interval >= 3
+    assert scheduler.utilisation <= 0.8
+    # Load falls to 10 ms per frame: the interval walks back to the base.
+    _run(scheduler, clock, seconds=10, fps=25, cost=0.01)
+    assert scheduler.interval == 1
+
+
+def test_stale_frames_are_dropped_and_count_as_overload() -> None:
+    clock = _Clock()
+    scheduler = FrameScheduler(1, max_lag=0.5, clock=clock)
+    assert not scheduler.admit("CAM01", clock.now - 2.0)
+    assert scheduler.admit("CAM01", clock.now)
+    clock.now += 1.0
+    scheduler.admit("CAM01", clock.now)
+    assert scheduler.dropped == 1
+    assert scheduler.interval == 2
+
+
+def test_build_scheduler_reads_config_block() -> None:
+    config = {"interval": 2, "scheduler": {"max_interval": 4, "max_lag_ms": 0, "adaptive": True}}
+    scheduler = build_scheduler(config, profile={})
+    assert (scheduler.base_interval, scheduler.max_interval, scheduler.max_lag) == (2, 4, None)
+    with pytest.raises(ValueError):
+        build_scheduler({"scheduler": {"target_utilisation": 0}}, profile={})
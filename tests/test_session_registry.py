@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from src.runners.sessions import SessionRegistry
+
+
+class _Session:
+    def __init__(self):
+        self.active = 0
+        self.overlap = False
+
+    def get_inputs(self):
+        return [type("Input", (), {"name": "images", "shape": [1, 3, 8, 8]})()]
+
+    def run(self, _outputs, feeds):
+        self.active += 1
+        self.overlap |= self.active > 1
+        threading.Event().wait(0.001)
+        self.active -= 1
+        return [feeds["images"]]
+
+
+def _registry(loads):
+    def loader(path, cfg):
+        loads.append((path.name, cfg))
+        return None if path.name == "missing.onnx" else _Session()
+
+    return SessionRegistry(loader)
+
+
+def test_same_model_and_options_share_one_session(tmp_path):
+    loads = []
+    registry = _registry(loads)
+    model = tmp_path / "yolo11n.onnx"
+    first = registry.acquire(model, {"intra_op_threads": 2})
+    second = registry.acquire(tmp_path / "." / "yolo11n.onnx", {"intra_op_threads": 2})
+    other = registry.acquire(model, {"intra_op_threads": 4})
+    assert first.session is second.session
+    assert other.session is not first.session
+    assert len(loads) == 2 and len(registry) == 2
+    assert registry.refcount(model, {"intra_op_threads": 2}) == 2
+    assert first.get_inputs()[0].name == "images"
+
+    first.release()
+    first.release()  # idempotent
+    assert registry.refcount(model, {"intra_op_threads": 2}) == 1
+    second.release()
+    assert registry.refcount(model, {"intra_op_threads": 2}) == 0
+    assert len(registry) == 1
+    with pytest.raises(RuntimeError):
+        second.run(None, {"images": 1})
+    assert registry.acquire(tmp_path / "missing.onnx") is None
+    assert len(registry) == 1
+
+
+def test_key_ignores_cache_path_and_defaults(tmp_path, monkeypatch):
+    monkeypatch.delenv("ORT_INTRA_OP_THREADS", raising=False)
+    registry = _registry([])
+    model = tmp_path / "yolov11n.onnx"
+    object_cfg = {"intra_op_threads": 4, "optimized_model_path": "a.opt.onnx", "io_binding": True}
+    person_cfg = {
+        "io_binding": True,
+        "intra_op_threads": "4",
+        "execution_mode": "sequential",
+        "enable_mem_pattern": True,
+        "optimized_model_path": "b.opt.onnx",
+    }
+    assert registry.acquire(model, object_cfg).session is registry.acquire(model, person_cfg).session
+    assert registry.key(model, object_cfg) != registry.key(model, {**object_cfg, "io_binding": False})
+    monkeypatch.setenv("ORT_INTRA_OP_THREADS", "2")
+    assert registry.key(model, {"intra_op_threads": 4}) == registry.key(model, {"intra_op_threads": 8})
+
+
+def test_shared_run_is_serialised(tmp_path):
+    registry = _registry([])
+    handles = [registry.acquire(tmp_path / "pose.onnx") for _ in range(4)]
+
+    def worker(handle):
+        for _ in range(20):
+            assert handle.run(None, {"images": 1}) == [1]
+
+    threads = [threading.Thread(target=worker, args=(handle,)) for handle in handles]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not handles[0].session.overlap
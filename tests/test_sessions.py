@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.runners import sessions
+from src.runners.sessions import BoundSession, build_session_options
+
+ort = pytest.importorskip("onnxruntime")
+
+
+def test_session_block_maps_to_session_options(tmp_path, monkeypatch):
+    monkeypatch.delenv("ORT_INTRA_OP_THREADS", raising=False)
+    monkeypatch.delenv("ORT_INTER_OP_THREADS", raising=False)
+    cache = tmp_path / "cache" / "model.opt.onnx"
+    options = build_session_options(
+        ort,
+        {
+            "intra_op_threads": 3,
+            "inter_op_threads": 2,
+            "execution_mode": "parallel",
+            "graph_optimization": "extended",
+            "optimized_model_path": str(cache),
+            "enable_cpu_mem_arena": False,
+            "enable_mem_pattern": False,
+        },
+    )
+    assert (options.intra_op_num_threads, options.inter_op_num_threads) == (3, 2)
+    assert options.execution_mode == ort.ExecutionMode.ORT_PARALLEL
+    assert options.graph_optimization_level == ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+    assert options.optimized_model_filepath == str(cache) and cache.parent.is_dir()
+    assert not options.enable_cpu_mem_arena and not options.enable_mem_pattern
+
+    defaults = build_session_options(ort, None)
+    assert defaults.graph_optimization_level == ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    assert defaults.execution_mode == ort.ExecutionMode.ORT_SEQUENTIAL
+
+
+def test_thread_env_overrides_config(monkeypatch):
+    monkeypatch.setenv("ORT_INTRA_OP_THREADS", "1")
+    options = build_session_options(ort, {"intra_op_threads": 8})
+    assert options.intra_op_num_threads == 1
+
+
+def test_unknown_session_values_are_rejected():
+    with pytest.raises(ValueError):
+        build_session_options(ort, {"graph_optimization": "max"})
+
+
+def test_optimized_model_cache_is_loaded_once_written(tmp_path, monkeypatch):
+    loads = []
+
+    class _Ort:
+        def __getattr__(self, name):
+            return getattr(ort, name)
+
+        def InferenceSession(self, path, sess_options, providers):
+            loads.append((path, sess_options.graph_optimization_level, sess_options.optimized_model_filepath))
+            return _Session()
+
+    monkeypatch.setattr(sessions, "_ORT", _Ort())
+    model = tmp_path / "model.onnx"
+    model.write_bytes(b"onnx")
+    cache = tmp_path / "cache" / "model.opt.onnx"
+    cfg = {"optimized_model_path": str(cache)}
+    sessions.load_onnx_session(model, cfg)
+    cache.write_bytes(b"optimized")
+    sessions.load_onnx_session(model, cfg)
+    assert loads == [
+        (str(model), ort.GraphOptimizationLevel.ORT_ENABLE_ALL, str(cache)),
+        (str(cache), ort.GraphOptimizationLevel.ORT_ENABLE_BASIC, ""),
+    ]
+
+
+class _Binding:
+    def __init__(self):
+        self.inputs, self.outputs = {}, []
+
+    def clear_binding_inputs(self):
+        self.inputs.clear()
+
+    def clear_binding_outputs(self):
+        self.outputs.clear()
+
+    def bind_cpu_input(self, name, value):
+        self.inputs[name] = value
+
+    def bind_output(self, name, device):
+        self.outputs.append((name, device))
+
+    def copy_outputs_to_cpu(self):
+        return [self.inputs["images"].sum(axis=(1, 2, 3))]
+
+
+class _Session:
+    def __init__(self):
+        self.binding = _Binding()
+        self.runs = 0
+
+    def io_binding(self):
+        return self.binding
+
+    def get_providers(self):
+        return ["CPUExecutionProvider"]
+
+    def get_outputs(self):
+        return [type("Output", (), {"name": "output0"})()]
+
+    def get_inputs(self):
+        return [type("Input", (), {"name": "images", "shape": [1, 3, 2, 2]})()]
+
+    def run_with_iobinding(self, binding):
+        assert binding is self.binding
+        self.runs += 1
+
+
+def test_bound_session_reuses_one_binding():
+    session = _Session()
+    bound = BoundSession(session)
+    for value in (1.0, 2.0):
+        out = bound.run(None, {"images": np.full((2, 3, 2, 2), value, dtype=np.float32)})
+        np.testing.assert_allclose(out[0], [12 * value, 12 * value])
+    assert session.runs == 2
+    assert session.binding.outputs == [("output0", "cpu")]
+    assert bound.get_inputs()[0].name == "images"
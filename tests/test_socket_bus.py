@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import socket
+
+import pytest
+
+from src.common.event_bus import Event, FileEventBus
+from src.common.socket_bus import SocketEventBus, SocketSubscriber
+from src.common.tail import read_last_records
+from src.common import transport
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix domain sockets")
+
+
+@pytest.fixture
+def bus_dir(tmp_path, monkeypatch):
+    # AF_UNIX paths are limited to ~108 bytes; keep socket paths relative.
+    monkeypatch.chdir(tmp_path)
+    return "bus"
+
+
+def test_socket_bus_delivers_per_topic(bus_dir):
+    detections = SocketEventBus("detections", directory=bus_dir)
+    tracker = SocketEventBus("tracker", directory=bus_dir)
+    first = SocketSubscriber("detections", "first", directory=bus_dir)
+    second = SocketSubscriber("detections", "second", directory=bus_dir)
+    other = SocketSubscriber("tracker", "other", directory=bus_dir)
+    for n in range(30):
+        detections.publish(Event(type="object", payload={"n": n}))
+    tracker.publish(Event(type="track", payload={"n": -1}))
+    for subscriber, expected in ((first, list(range(30))), (second, list(range(30))), (other, [-1])):
+        received = []
+        while len(received) < len(expected) and subscriber.wait(2.0):
+            received.extend(record["n"] for record in subscriber.read_available())
+        assert received == expected
+    assert detections.dropped == 0
+    for subscriber in (first, second, other):
+        subscriber.close()
+    detections.publish(Event(type="object", payload={"n": 99}))
+    assert detections._peers == []
+
+
+def test_socket_bus_consume_and_tee(bus_dir, tmp_path):
+    tee = FileEventBus(tmp_path / "logs", write_last=False)
+    bus = SocketEventBus("events", directory=bus_dir, codec="json", tee=tee)
+    subscriber = SocketSubscriber("events", "audit", directory=bus_dir)
+    bus.publish(Event(type="rule", payload={"camera_id": "CAM01"}))
+    assert subscriber.wait(2.0)
+    assert subscriber.next_record() == {"type": "rule", "camera_id": "CAM01"}
+    subscriber.close()
+    bus.close()
+    assert read_last_records(tee.path, 5) == [{"type": "rule", "camera_id": "CAM01"}]
+
+
+def test_stale_subscriber_socket_is_forgotten(bus_dir):
+    ghost = SocketSubscriber("topic", "ghost", directory=bus_dir)
+    ghost._closed.set()
+    ghost._sock.close()  # crashed without unlinking
+    bus = SocketEventBus("topic", directory=bus_dir)
+    bus.publish(Event(type="x", payload={}))
+    assert not ghost.path.exists()
+
+
+def test_transport_factory(bus_dir, monkeypatch, tmp_path):
+    monkeypatch.setenv("EVENT_BUS_SOCKET_DIR", bus_dir)
+    assert isinstance(transport.build_event_bus(tmp_path / "detections"), FileEventBus)
+    monkeypatch.setenv("EVENT_BUS_TRANSPORT", "socket")
+    monkeypatch.delenv("EVENT_BUS_TEE", raising=False)
+    bus = transport.build_event_bus(tmp_path / "detections")
+    consumer = transport.build_event_consumer(tmp_path / "detections" / "events.log", "tracker")
+    assert isinstance(bus, SocketEventBus) and bus.tee is not None
+    assert bus.topic == transport.log_topic(tmp_path / "detections" / "events.log")
+    bus.publish(Event(type="object", payload={"n": 1}))
+    assert consumer.wait(2.0) and consumer.read_available() == [{"type": "object", "n": 1}]
+    consumer.close()
+    bus.close()
+    monkeypatch.setenv("EVENT_BUS_TEE", "0")
+    untee = transport.build_event_bus(tmp_path / "tracks")
+    assert untee.tee is None
+    untee.close()
+    monkeypatch.setenv("EVENT_BUS_TRANSPORT", "carrier-pigeon")
+    with pytest.raises(ValueError):
+        transport.build_event_bus(tmp_path)
+
+
+def test_log_topic_is_per_log_file(tmp_path):
+    topics = {
+        transport.log_topic(tmp_path / "a" / "events" / "events.log"),
+        transport.log_topic(tmp_path / "b" / "events" / "events.log"),
+        transport.log_topic(tmp_path / "a" / "events" / "frames.log"),
+    }
+    assert len(topics) == 3
+    assert transport.log_topic(tmp_path / "a" / "events" / "events.log").startswith("events-events.log-")
+    assert transport.log_topic(tmp_path / "x" / ".." / "a" / "events" / "events.log") in topics
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.trackers import ByteTrack
+from src.trackers.track_table import TrackTable
+
+
+def _boxes(count: int, offset: float = 0.0) -> np.ndarray:
+    x = np.arange(count, dtype=np.float32) * 100.0 + offset
+    return np.stack([x, np.zeros_like(x), x + 50.0, np.full_like(x, 80.0)], axis=1)
+
+
+def test_aging_prunes_and_slots_are_reused() -> None:
+    table = TrackTable(capacity=4)
+    slots = table.add(np.array([1, 2, 3]), _boxes(3), np.full(3, 0.9))
+    table.ages[slots[1]] = 5
+    assert table.age(1, max_age=5) == 1
+    assert table.view().ids.tolist() == [1, 3]
+    assert table.view().ages.tolist() == [1, 1]
+    reused = table.add(np.array([4]), _boxes(1), np.array([0.8]))
+    assert reused.tolist() == [slots[1]]
+    assert table.hits[reused].tolist() == [1] and table.ages[reused].tolist() == [0]
+    assert table.view().ids.tolist() == [1, 3, 4]
+
+
+def test_table_grows_and_keeps_columns() -> None:
+    table = TrackTable(capacity=2)
+    table.add(np.array([1, 2]), _boxes(2), np.array([0.5, 0.6]))
+    table.set_embeddings(np.array([0]), np.ones((1, 8)))
+    table.add(np.array([3, 4, 5]), _boxes(3, 300.0), np.full(3, 0.7))
+    assert table.capacity >= 5 and len(table) == 5
+    assert table.view().scores.tolist() == pytest.approx([0.5, 0.6, 0.7, 0.7, 0.7])
+    assert table.embeddings.shape == (table.capacity, 8)
+    assert table.has_embedding.tolist().count(True) == 1
+    with pytest.raises(ValueError):
+        TrackTable(capacity=0)
+
+
+def test_bytetrack_keeps_ids_for_many_objects() -> None:
+    tracker = ByteTrack(high_thresh=0.5, max_age=2)
+    first = tracker.update([{"bbox": box, "confidence": 0.9} for box in _boxes(300).tolist()])
+    ids = [det["track_id"] for det in first]
+    second = tracker.update([{"bbox": box, "confidence": 0.9} for box in _boxes(300, 3.0).tolist()])
+    assert [det["track_id"] for det in second] == ids
+    assert tracker.tracks.ids.tolist() == ids
+    # Half the objects leave; their slots are recycled for newcomers.
+    for _ in range(3):
+        tracker.update([{"bbox": box, "confidence": 0.9} for box in _boxes(150, 3.0).tolist()])
+    assert len(tracker.tracks) == 150
+    capacity = tracker._table.capacity
+    tracker.update([{"bbox": box, "confidence": 0.9} for box in _boxes(300, 3.0).tolist()])
+    assert tracker._table.capacity == capacity
+    assert len(tracker.get_active_tracks()) == 300
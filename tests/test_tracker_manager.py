@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import numpy as np
+import pytest
+
+from src.common.detections import DetectionBatch, MultiCameraBatch
 from trackers import TrackerManager
 
 
@@ -24,3 +28,38 @@ def test_tracker_manager_simple_mode_persists_tracks() -> None:
     second = manager.update("CAM_SIMPLE", [{"bbox": [5, 5, 55, 55], "confidence": 0.85}])
     assert second[0]["track_id"] == tid
     assert manager.get_tracks("CAM_SIMPLE")[0]["track_id"] == tid
+
+
+def _frame(offset: float, timestamp: float) -> DetectionBatch:
+    boxes = np.array([[0, 0, 50, 50], [200, 0, 250, 50]], dtype=np.float32) + offset
+    return DetectionBatch(boxes=boxes, scores=[0.9, 0.8], class_ids=[0, 0], timestamp=timestamp)
+
+
+def test_update_cameras_matches_per_camera_updates() -> None:
+    batched = TrackerManager(high_thresh=0.5)
+    single = TrackerManager(high_thresh=0.5)
+    for step in range(3):
+        args = {"CAM_A": (3.0 * step, 10.0 + step), "CAM_B": (500.0 - 2.0 * step, 20.0 + step)}
+        frames = [_frame(*args[camera_id]) for camera_id in args]
+        frames[1].row_extras(1)["zone"] = "B1"
+        multi = batched.update_cameras(MultiCameraBatch.from_batches(list(args), frames), steps={"CAM_A": 1})
+        for camera_id in args:
+            expected = single.update(camera_id, _frame(*args[camera_id]))
+            assert batched.latest_detections(camera_id).track_ids.tolist() == expected.track_ids.tolist()
+    assert multi.batch.track_ids.tolist() == [1, 2, 1, 2]
+    assert multi.segment(1).to_dicts()[1]["zone"] == "B1"
+    stats = batched.stats()
+    assert stats["CAM_A"]["updates"] == 3 and stats["CAM_B"]["detections"] == 6
+    assert set(stats["CAM_A"]["stages_s"]) == {"predict", "associate", "spawn"}
+
+
+def test_multi_camera_batch_validates_segmentation() -> None:
+    first = _frame(0.0, 1.0)
+    assert first.first_seen.shape == (2,)
+    multi = MultiCameraBatch.from_batches(["CAM_A", "CAM_B"], [first, _frame(0.0, 2.0)])
+    multi.segment(1).first_seen[:] = 2.0  # segments are views of the shared arrays
+    assert multi.batch.first_seen.tolist()[2:] == [2.0, 2.0]
+    with pytest.raises(ValueError):
+        MultiCameraBatch.from_batches(["CAM_A", "CAM_A"], [first, first])
+    with pytest.raises(ValueError):
+        MultiCameraBatch(batch=first, camera_ids=["CAM_A"], offsets=[0, 1], timestamps=[1.0])
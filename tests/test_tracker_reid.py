@@ -1,6 +1,7 @@
 from src.trackers import ByteTrack
 from src.trackers.osnet_reid import OSNetReID
 import numpy as np
+import pytest
 
 
 def test_bytetrack_with_reid_assigns_ids() -> None:
@@ -26,3 +27,51 @@ def test_bytetrack_with_reid_assigns_ids() -> None:
         [{"bbox": [10, 10, 110, 110], "confidence": 0.95, "embedding": emb2}]
     )
     assert dets3[0]["track_id"] != tid
+
+
+def _unit(*values: float) -> np.ndarray:
+    emb = np.zeros(256)
+    emb[: len(values)] = values
+    return emb / np.linalg.norm(emb)
+
+
+def test_extract_embedding_accepts_batches() -> None:
+    reid = OSNetReID(engine_path="dummy")
+    crops = [np.zeros((256, 128, 3)), np.ones((256, 128, 3)), np.full((256, 128, 3), 7.0)]
+    batch = reid.extract_embedding(crops)
+    assert batch.shape == (3, 256)
+    for crop, emb in zip(crops, batch):
+        assert np.allclose(emb, reid.extract_embedding(crop))
+    assert reid.extract_embedding(np.stack(crops)).shape == (3, 256)
+
+
+def test_appearance_resolves_overlapping_tracks() -> None:
+    reid = OSNetReID(engine_path="dummy", threshold=0.4)
+    tracker = ByteTrack(high_thresh=0.5, match_iou=0.2, reid_engine=reid, motion=False)
+    emb_a, emb_b = _unit(1.0), _unit(0.0, 1.0)
+    first = tracker.update(
+        [
+            {"bbox": [0, 0, 100, 100], "confidence": 0.9, "embedding": emb_a},
+            {"bbox": [50, 0, 150, 100], "confidence": 0.9, "embedding": emb_b},
+        ]
+    )
+    # The objects swap places: boxes alone would keep the old pairing.
+    second = tracker.update(
+        [
+            {"bbox": [50, 0, 150, 100], "confidence": 0.9, "embedding": emb_a},
+            {"bbox": [0, 0, 100, 100], "confidence": 0.9, "embedding": emb_b},
+        ]
+    )
+    assert [det["track_id"] for det in second] == [det["track_id"] for det in first]
+
+
+def test_track_embeddings_are_unit_length_moving_averages() -> None:
+    reid = OSNetReID(engine_path="dummy", threshold=0.1)
+    tracker = ByteTrack(high_thresh=0.5, reid_engine=reid, embedding_momentum=0.5)
+    tracker.update([{"bbox": [0, 0, 100, 100], "confidence": 0.9, "embedding": 3.0 * _unit(1.0)}])
+    tracker.update([{"bbox": [2, 0, 102, 100], "confidence": 0.9, "embedding": _unit(1.0, 1.0)}])
+    slot = tracker._table.slots[0]
+    expected = 0.5 * _unit(1.0) + 0.5 * _unit(1.0, 1.0)
+    assert np.allclose(tracker._table.embeddings[slot], expected / np.linalg.norm(expected), atol=1e-6)
+    with pytest.raises(ValueError):
+        ByteTrack(embedding_momentum=1.0)
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Print event-log records (JSON or binary codecs, all segments) as JSON lines."""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from common.tail import LogTailer, read_last_records
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("log", help="Path to an events.log (segments are followed automatically)")
+    parser.add_argument("--tail", type=int, default=0, help="Only print the newest N records")
+    parser.add_argument("--follow", action="store_true", help="Keep printing records as they are appended")
+    parser.add_argument("--indent", type=int, default=None, help="Pretty-print with this indent")
+    args = parser.parse_args()
+
+    path = Path(args.log)
+
+    def emit(record: object) -> None:
+        sys.stdout.write(json.dumps(record, indent=args.indent) + "\n")
+
+    tailer = LogTailer(path)
+    if args.tail:
+        for record in read_last_records(path, args.tail):
+            emit(record)
+        tailer.read_available()  # skip what was just printed
+    try:
+        while True:
+            for record in tailer.read_available():
+                emit(record)
+            sys.stdout.flush()
+            if not args.follow:
+                break
+            tailer.wait()
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass
+    finally:
+        tailer.close()
+
+
+if __name__ == "__main__":
+    main()